@@ -0,0 +1,59 @@
+# benchmarks/bench_cartesian.py
+from __future__ import annotations
+
+#послідовний і паралельний декартів добуток на розмірах n x n
+#запуск з кореня проєкту:
+#  python -m benchmarks.bench_cartesian [--sizes 1000,5000,10000] [--workers 4] [--jsonl] [--materialize]
+#за замовчуванням блоки лише перебираються (без збирання таблиці - 10k x 10k = 100 млн рядків
+#не вміщується в пам'ять); --jsonl рахує ще й серіалізацію, як при записі на диск;
+#--materialize будує справжню таблицю через cartesian_product (лише для малих розмірів)
+
+import argparse
+import os
+import time
+
+import core  # noqa: F401 - реєструє типи
+from core.schema import Field, Schema
+from core.table import Table
+from core.ops_cartesian import cartesian_product, product_blocks
+
+
+def _table(name: str, n: int) -> Table:
+    t = Table(name, Schema([Field("id", "integer"), Field("x", "real"), Field("z", "complexInteger")]))
+    t.insert_many([{"id": i, "x": i * 0.5, "z": (i, -i)} for i in range(n)])
+    return t
+
+
+def _consume(a: Table, b: Table, workers: int, jsonl: bool, materialize: bool) -> float:
+    start = time.perf_counter()
+    if materialize:
+        cartesian_product(a, b, workers=workers)
+    else:
+        for _ in product_blocks(a, b, workers=workers, serialize=jsonl):
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,5000,10000")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--jsonl", action="store_true")
+    parser.add_argument("--materialize", action="store_true")
+    args = parser.parse_args()
+
+    mode = "таблиця" if args.materialize else ("jsonl" if args.jsonl else "кортежі")
+    print(f"режим: {mode}, воркерів: {args.workers}")
+    for n in (int(x) for x in args.sizes.split(",")):
+        a, b = _table("A", n), _table("B", n)
+        serial = _consume(a, b, 1, args.jsonl, args.materialize)
+        parallel = _consume(a, b, args.workers, args.jsonl, args.materialize)
+        rows = n * n
+        print(
+            f"{n} x {n}: послідовно {serial:7.2f} с ({rows / serial:,.0f} рядків/с), "
+            f"паралельно {parallel:7.2f} с ({rows / parallel:,.0f} рядків/с), x{serial / parallel:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_indexes.py
+from __future__ import annotations
+
+#порівняння: скільки коштує підтримка індексу при вставці і скільки він економить на запитах
+#запуск з кореня проєкту: python -m benchmarks.bench_indexes [кількість_рядків]
+
+import random
+import sys
+import time
+
+import core  # noqa: F401 - реєструє типи
+from core.schema import Field, Schema
+from core.table import Table
+
+
+def _schema() -> Schema:
+    return Schema([Field("id", "integer"), Field("x", "real"), Field("name", "string")])
+
+
+def _data(n: int, seed: int = 1) -> list[dict]:
+    rnd = random.Random(seed)
+    return [{"id": rnd.randrange(n), "x": rnd.uniform(0, 1000), "name": f"r{i}"} for i in range(n)]
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_insert(data: list[dict]) -> dict[str, float]:
+    #вставка по одному рядку без індексу, з хеш- і з впорядкованим індексом
+    result = {}
+    for kind in (None, "hash", "sorted"):
+        t = Table("B", _schema())
+        if kind is not None:
+            t.create_index("x", kind=kind)
+
+        def run() -> None:
+            for d in data:
+                t.insert(d)
+
+        result[kind or "none"] = _timed(run)
+    return result
+
+
+def bench_queries(data: list[dict], queries: int = 200) -> dict[str, float]:
+    rnd = random.Random(2)
+    plain = Table("B", _schema())
+    plain.insert_many(data)
+    indexed = Table("B", _schema())
+    indexed.insert_many(data)
+    indexed.create_index("x", kind="sorted")
+    indexed.create_index("id", kind="hash")
+
+    bounds = []
+    for _ in range(queries):
+        lo = rnd.uniform(0, 1000)
+        bounds.append((lo, lo + 10))
+    keys = [rnd.randrange(len(data)) for _ in range(queries)]
+
+    return {
+        "range_scan": _timed(lambda: [plain.range("x", lo, hi) for lo, hi in bounds]),
+        "range_sorted": _timed(lambda: [indexed.range("x", lo, hi) for lo, hi in bounds]),
+        "lookup_scan": _timed(lambda: [plain.lookup("id", k) for k in keys]),
+        "lookup_hash": _timed(lambda: [indexed.lookup("id", k) for k in keys]),
+    }
+
+
+def main(argv: list[str]) -> None:
+    n = int(argv[1]) if len(argv) > 1 else 20000
+    data = _data(n)
+    ins = bench_insert(data)
+    print(f"вставка {n} рядків:")
+    for kind, sec in ins.items():
+        overhead = (sec / ins["none"] - 1) * 100
+        print(f"  індекс {kind:<7} {sec:8.3f} с  ({overhead:+.0f}%)")
+    q = bench_queries(data)
+    print("200 запитів:")
+    print(f"  діапазон: перебір {q['range_scan']:.3f} с, sorted {q['range_sorted']:.4f} с"
+          f"  (x{q['range_scan'] / q['range_sorted']:.0f})")
+    print(f"  рівність:  перебір {q['lookup_scan']:.3f} с, hash {q['lookup_hash']:.4f} с"
+          f"  (x{q['lookup_scan'] / q['lookup_hash']:.0f})")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,70 @@
+# benchmarks/bench_scan.py
+from __future__ import annotations
+
+#скільки пам'яті коштує get_rows() (копія списку рядків) проти scan() (представлення)
+#у вкладеному циклі на кшталт декартового добутку, де B перебирається для кожного рядка A
+#запуск з кореня проєкту: python -m benchmarks.bench_scan [рядків_B] [рядків_A]
+
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import core  # noqa: F401 - реєструє типи
+from core.schema import Field, Schema
+from core.table import Table
+
+
+def _table(name: str, n: int, engine: str) -> Table:
+    t = Table(name, Schema([Field("id", "integer"), Field("z", "complexInteger")]), engine=engine)
+    t.insert_many([{"id": i, "z": (i, -i)} for i in range(n)])
+    return t
+
+
+def _measure(fn: Callable[[], int]) -> tuple[float, int]:
+    #час і пік виділеної пам'яті (tracemalloc) за один запуск
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench(n_b: int, n_a: int, engine: str) -> dict[str, tuple[float, int]]:
+    a = _table("A", n_a, engine)
+    b = _table("B", n_b, engine)
+
+    def with_copies() -> int:
+        pairs = 0
+        for _ in a.get_rows():
+            for _ in b.get_rows():
+                pairs += 1
+        return pairs
+
+    def with_scan() -> int:
+        pairs = 0
+        for _ in a.scan():
+            for _ in b.scan():
+                pairs += 1
+        return pairs
+
+    return {"get_rows": _measure(with_copies), "scan": _measure(with_scan)}
+
+
+def main(argv: list[str]) -> None:
+    n_b = int(argv[1]) if len(argv) > 1 else 100_000
+    n_a = int(argv[2]) if len(argv) > 2 else 10
+    print(f"перебір |A| x |B| = {n_a} x {n_b}:")
+    for engine in ("rows", "columnar"):
+        result = bench(n_b, n_a, engine)
+        copy_t, copy_peak = result["get_rows"]
+        scan_t, scan_peak = result["scan"]
+        print(f"  {engine:<8} get_rows: {copy_t:6.3f} с, пік {copy_peak / 1024:9.1f} КіБ")
+        print(f"  {engine:<8} scan:     {scan_t:6.3f} с, пік {scan_peak / 1024:9.1f} КіБ"
+              f"  (пам'яті в {copy_peak / max(scan_peak, 1):.0f} раз менше)")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
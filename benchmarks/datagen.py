@@ -0,0 +1,113 @@
+# benchmarks/datagen.py
+from __future__ import annotations
+
+#відтворюваний генератор синтетичних даних для бенчмарків
+#одне поле на кожен зареєстрований тип; сирі значення - у всіх вхідних формах,
+#які приймають типи (для комплексних - усі формати з README: "2+3i", "4-5i", "3i",
+#"7", кома як десятковий роздільник, кортеж, список, {"real", "imag"})
+#однаковий seed - однакові дані, тож результати різних запусків можна порівнювати
+
+import random
+from typing import Any, Callable
+
+import core  # noqa: F401 - реєструє типи
+from core.schema import Field, Schema
+from core.table import Table
+from core.types_base import global_type_registry
+
+
+_LETTERS = "abcdefghijklmnopqrstuvwxyzабвгґдеєжзиіїйклмнопрстуфхцчшщьюя"
+
+
+def _integer(rnd: random.Random) -> Any:
+    value = rnd.randrange(-1_000_000, 1_000_000)
+    return f" {value} " if rnd.random() < 0.25 else value
+
+
+def _real(rnd: random.Random) -> Any:
+    value = round(rnd.uniform(-1e4, 1e4), 3)
+    kind = rnd.randrange(3)
+    if kind == 0:
+        return value
+    if kind == 1:
+        return str(value)
+    return str(value).replace(".", ",")
+
+
+def _char(rnd: random.Random) -> Any:
+    return rnd.choice(_LETTERS)
+
+
+def _string(rnd: random.Random) -> Any:
+    return "".join(rnd.choices(_LETTERS + " ", k=rnd.randrange(0, 24)))
+
+
+def _complex_text(re: Any, im: Any, rnd: random.Random) -> str:
+    #рядкові форми з README: a+bi, a-bi, bi, a, a+i, з комою замість крапки
+    kind = rnd.randrange(6)
+    if kind == 0:
+        return f"{re}{'+' if im >= 0 else '-'}{abs(im)}i"
+    if kind == 1:
+        return f"{re} {'+' if im >= 0 else '-'} {abs(im)}i"
+    if kind == 2:
+        return f"{im}i"
+    if kind == 3:
+        return f"{re}"
+    if kind == 4:
+        return f"{re}{'+' if im >= 0 else '-'}i"
+    return f"{re}{'+' if im >= 0 else '-'}{abs(im)}i".replace(".", ",")
+
+
+def _complex(integer: bool) -> Callable[[random.Random], Any]:
+    def make(rnd: random.Random) -> Any:
+        if integer:
+            re, im = rnd.randrange(-1000, 1000), rnd.randrange(-1000, 1000)
+        else:
+            re, im = round(rnd.uniform(-100, 100), 2), round(rnd.uniform(-100, 100), 2)
+        kind = rnd.randrange(4)
+        if kind == 0:
+            return _complex_text(re, im, rnd)
+        if kind == 1:
+            return (re, im)
+        if kind == 2:
+            return [re, im]
+        return {"real": re, "imag": im}
+    return make
+
+
+#генератор сирого значення для кожного типу
+GENERATORS: dict[str, Callable[[random.Random], Any]] = {
+    "integer": _integer,
+    "real": _real,
+    "char": _char,
+    "string": _string,
+    "complexInteger": _complex(True),
+    "complexReal": _complex(False),
+}
+
+
+def make_schema() -> Schema:
+    #по одному полю кожного зареєстрованого типу: f_integer, f_real, ...
+    fields = []
+    for type_name in global_type_registry.available_types():
+        if type_name not in GENERATORS:
+            raise KeyError(f"no benchmark data generator for type {type_name!r}")
+        fields.append(Field(f"f_{type_name}", type_name))
+    return Schema(fields)
+
+
+def raw_rows(schema: Schema, n: int, seed: int = 42) -> list[dict[str, Any]]:
+    #n сирих рядків (ще не провалідованих) для схеми
+    rnd = random.Random(seed)
+    makers = [(f.name, GENERATORS[f.type_name]) for f in schema.fields]
+    return [{name: make(rnd) for name, make in makers} for _ in range(n)]
+
+
+def make_table(name: str, n: int, seed: int = 42, engine: str = "rows") -> Table:
+    schema = make_schema()
+    table = Table(name, schema, engine=engine)
+    report = table.insert_many(raw_rows(schema, n, seed))
+    if report.rejected:
+        i, reason = report.rejected[0]
+        raise ValueError(f"generated row {i} is invalid: {reason}")
+    return table
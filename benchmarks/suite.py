@@ -0,0 +1,294 @@
+# benchmarks/suite.py
+from __future__ import annotations
+
+#набір бенчмарків основних шляхів: валідація, вставка, збереження, завантаження, декартів добуток
+#запуск з кореня проєкту:
+#  python -m benchmarks.suite [--tier small|medium|large] [--cases validate,save_jsonl,...]
+#                             [--repeat 3] [--seed 42] [--no-alloc] [--out results.json]
+#  python -m benchmarks.suite --tier small --compare baseline.json [--threshold 0.15]
+#  python -m benchmarks.suite --compare baseline.json --results new.json   (без запуску)
+#кожен випадок виконується в окремому процесі, тож пік RSS - саме цього випадку;
+#час - найкращий з --repeat запусків, виділення пам'яті (tracemalloc) - окремим запуском,
+#бо трасування сповільнює код. з --compare код виходу 1, якщо є регресії
+
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks.datagen import make_schema, make_table, raw_rows
+from core.ops_cartesian import cartesian_product, product_blocks
+from storage import load_table, load_table_binary, save_table, save_table_binary
+
+try:
+    import resource
+except ImportError: #windows
+    resource = None
+
+
+#рівні масштабу: рядків у таблиці і розміри таблиць для добутку (|A| x |B|)
+TIERS: dict[str, dict[str, Any]] = {
+    "small": {"rows": 10_000, "product": (100, 1_000)},
+    "medium": {"rows": 100_000, "product": (1_000, 1_000)},
+    "large": {"rows": 1_000_000, "product": (1_000, 10_000)},
+}
+
+#матеріалізувати добуток у таблицю лише до такого розміру, більший лише перебирається
+MATERIALIZE_LIMIT = 1_000_000
+
+
+#випадок: setup(params) -> run; run() виконує вимірювану роботу і повертає кількість рядків
+def _validate(p: dict[str, Any]) -> Callable[[], int]:
+    schema = make_schema()
+    raw = raw_rows(schema, p["rows"], p["seed"])
+
+    def run() -> int:
+        validate = schema.validate_row
+        for data in raw:
+            validate(data)
+        return len(raw)
+    return run
+
+
+def _insert(engine: str) -> Callable[[dict[str, Any]], Callable[[], int]]:
+    def setup(p: dict[str, Any]) -> Callable[[], int]:
+        raw = raw_rows(make_schema(), p["rows"], p["seed"])
+
+        def run() -> int:
+            from core.table import Table
+            table = Table("T", make_schema(), engine=engine)
+            table.insert_many(raw)
+            return table.row_count()
+        return run
+    return setup
+
+
+def _save(binary: bool) -> Callable[[dict[str, Any]], Callable[[], int]]:
+    def setup(p: dict[str, Any]) -> Callable[[], int]:
+        table = make_table("T", p["rows"], p["seed"])
+        base = Path(p["tmp"])
+
+        def run() -> int:
+            if binary:
+                save_table_binary(table, base)
+            else:
+                save_table(table, base, full=True)
+            return table.row_count()
+        return run
+    return setup
+
+
+def _load(binary: bool) -> Callable[[dict[str, Any]], Callable[[], int]]:
+    def setup(p: dict[str, Any]) -> Callable[[], int]:
+        base = Path(p["tmp"])
+        table = make_table("T", p["rows"], p["seed"])
+        if binary:
+            save_table_binary(table, base)
+        else:
+            save_table(table, base, full=True)
+        del table
+
+        def run() -> int:
+            if binary:
+                #рядки відображені з файлу і декодуються на вимогу - перебираємо всі
+                loaded = load_table_binary("T", base)
+                count = sum(1 for _ in loaded.scan())
+                loaded.rows.close()
+                return count
+            return load_table("T", base).row_count()
+        return run
+    return setup
+
+
+def _cartesian(materialize: bool) -> Callable[[dict[str, Any]], Callable[[], int] | None]:
+    def setup(p: dict[str, Any]) -> Callable[[], int] | None:
+        n_a, n_b = p["product"]
+        if materialize and n_a * n_b > MATERIALIZE_LIMIT:
+            return None
+        a = make_table("A", n_a, p["seed"])
+        b = make_table("B", n_b, p["seed"] + 1)
+
+        def run() -> int:
+            if materialize:
+                return cartesian_product(a, b).row_count()
+            return sum(len(block) for block in product_blocks(a, b))
+        return run
+    return setup
+
+
+CASES: dict[str, Callable[[dict[str, Any]], Callable[[], int] | None]] = {
+    "validate": _validate,
+    "insert_rows": _insert("rows"),
+    "insert_columnar": _insert("columnar"),
+    "save_jsonl": _save(False),
+    "save_binary": _save(True),
+    "load_jsonl": _load(False),
+    "load_binary": _load(True),
+    "cartesian_blocks": _cartesian(False),
+    "cartesian_table": _cartesian(True),
+}
+
+
+def _peak_rss_kib() -> int | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    #linux - КіБ, macos - байти
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_case(name: str, params: dict[str, Any], repeat: int, alloc: bool) -> dict[str, Any] | None:
+    #один випадок у поточному процесі; None - випадок не має сенсу на цьому рівні
+    with tempfile.TemporaryDirectory() as tmp:
+        params = dict(params, tmp=tmp)
+        best = None
+        rows = 0
+        for _ in range(repeat):
+            #кожен повтор з нуля, щоб попередній запуск не впливав (напр. вставка в ту саму таблицю)
+            run = CASES[name](params)
+            if run is None:
+                return None
+            start = time.perf_counter()
+            rows = run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        result: dict[str, Any] = {
+            "rows": rows,
+            "seconds": round(best, 6),
+            "rows_per_s": round(rows / best) if best else None,
+            "peak_alloc_kib": None,
+        }
+        if alloc:
+            run = CASES[name](params)
+            tracemalloc.start()
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result["peak_alloc_kib"] = peak // 1024
+    result["peak_rss_kib"] = _peak_rss_kib()
+    return result
+
+
+def run_suite(
+    tier: str,
+    cases: list[str],
+    repeat: int = 3,
+    seed: int = 42,
+    alloc: bool = True,
+    isolate: bool = True,
+) -> dict[str, Any]:
+    if tier not in TIERS:
+        raise ValueError(f"unknown tier {tier!r}, expected one of {list(TIERS)}")
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        raise KeyError(f"unknown benchmark cases: {unknown}")
+    params = dict(TIERS[tier], seed=seed)
+    results: dict[str, Any] = {}
+    for name in cases:
+        if isolate:
+            #свіжий процес на кожен випадок: пік RSS не успадковується від попередніх
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                result = pool.submit(run_case, name, params, repeat, alloc).result()
+        else:
+            result = run_case(name, params, repeat, alloc)
+        if result is not None:
+            results[name] = result
+    return {
+        "meta": {
+            "tier": tier,
+            "seed": seed,
+            "repeat": repeat,
+            "rows": params["rows"],
+            "product": list(params["product"]),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.15) -> list[str]:
+    #регресії поточних результатів відносно базових: час або пік виділень
+    #більші ніж у (1 + threshold) разів; порівнюються лише випадки, що є в обох
+    regressions = []
+    if baseline["meta"].get("tier") != current["meta"].get("tier"):
+        raise ValueError(
+            f"cannot compare tier {current['meta'].get('tier')!r} with baseline tier {baseline['meta'].get('tier')!r}"
+        )
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        for key in ("seconds", "peak_alloc_kib"):
+            if base.get(key) and cur.get(key) is not None and cur[key] > base[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {base[key]} -> {cur[key]} (x{cur[key] / base[key]:.2f})")
+    return regressions
+
+
+def _print_results(data: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    meta = data["meta"]
+    print(f"рівень {meta['tier']}: {meta['rows']} рядків, добуток {meta['product'][0]} x {meta['product'][1]}")
+    for name, r in data["results"].items():
+        line = f"  {name:<17} {r['seconds']:9.3f} с  {r['rows_per_s'] or 0:>12,} рядків/с"
+        if r.get("peak_alloc_kib") is not None:
+            line += f"  виділено {r['peak_alloc_kib'] / 1024:8.1f} МіБ"
+        if r.get("peak_rss_kib") is not None:
+            line += f"  RSS {r['peak_rss_kib'] / 1024:8.1f} МіБ"
+        base = (baseline or {}).get("results", {}).get(name)
+        if base and base.get("seconds"):
+            line += f"  (x{r['seconds'] / base['seconds']:.2f} до базового)"
+        print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--tier", default="small", choices=list(TIERS))
+    parser.add_argument("--cases", default=",".join(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-alloc", action="store_true", help="не вимірювати виділення (tracemalloc)")
+    parser.add_argument("--out", help="записати результати в json")
+    parser.add_argument("--compare", help="базові результати (json) для пошуку регресій")
+    parser.add_argument("--results", help="з --compare: порівняти готовий файл замість запуску")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    if args.results:
+        with open(args.results, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+        data = run_suite(args.tier, cases, repeat=args.repeat, seed=args.seed, alloc=not args.no_alloc)
+    _print_results(data, baseline)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        print(f"результати записано в {args.out}")
+
+    if baseline is not None:
+        regressions = compare(baseline, data, args.threshold)
+        if regressions:
+            print(f"регресії (поріг {args.threshold:.0%}):")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("регресій немає")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
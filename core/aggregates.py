@@ -0,0 +1,225 @@
+# core/aggregates.py
+from __future__ import annotations
+
+import math
+import re
+from operator import itemgetter
+from typing import Any, Iterable
+
+from .columnar import ColumnarRows
+from .complex_columns import COMPLEX_TYPES, ComplexColumn
+from .index import SORTED_TYPES, index_key
+from .table import Table
+
+
+AGGREGATES = ("count", "sum", "avg", "min", "max")
+
+#для яких типів полів має сенс кожна функція (count - для будь-якого поля)
+_NUMERIC = ("integer", "real")
+_ALLOWED = {
+    "sum": _NUMERIC + COMPLEX_TYPES,
+    "avg": _NUMERIC + COMPLEX_TYPES,
+    "min": SORTED_TYPES,
+    "max": SORTED_TYPES,
+}
+
+
+class Aggregate:
+    #одна агрегатна функція: Aggregate("sum", "x"), Aggregate("count") - кількість рядків
+    #для complexInteger/complexReal sum і avg рахуються покомпонентно і дають пару (re, im)
+
+    def __init__(self, func: str, field_name: str | None = None) -> None:
+        func = func.lower()
+        if func not in AGGREGATES:
+            raise ValueError(f"unknown aggregate {func!r}, expected one of {AGGREGATES}")
+        if field_name is None and func != "count":
+            raise ValueError(f"{func} needs a field")
+        self.func = func
+        self.field_name = field_name
+
+    @property
+    def label(self) -> str:
+        #назва колонки результату: count, sum(x), ...
+        if self.field_name is None:
+            return self.func
+        return f"{self.func}({self.field_name})"
+
+    def check(self, table: Any) -> str | None:
+        #перевіряє поле за схемою таблиці і повертає його тип
+        if self.field_name is None:
+            return None
+        if self.field_name not in table.schema.field_index:
+            raise KeyError(f"unknown field {self.field_name!r}")
+        type_name = table.schema.fields[table.schema.field_index[self.field_name]].type_name
+        allowed = _ALLOWED.get(self.func)
+        if allowed is not None and type_name not in allowed:
+            raise TypeError(f"{self.func} is not defined for field {self.field_name!r} of type {type_name}")
+        return type_name
+
+    def __repr__(self) -> str:
+        return f"Aggregate({self.label})"
+
+
+_AGG_RE = re.compile(r"^\s*(?P<func>\w+)\s*(?:\(\s*(?P<field>\*|\w+)\s*\))?\s*$")
+
+
+def parse_aggregates(text: str) -> list[Aggregate]:
+    #"count, sum(x), avg(z)" -> список Aggregate; count(*) - те саме, що count
+    result = []
+    for part in text.split(","):
+        m = _AGG_RE.match(part)
+        if m is None:
+            raise ValueError(f"cannot parse aggregate {part.strip()!r}")
+        field_name = m.group("field")
+        result.append(Aggregate(m.group("func"), None if field_name in (None, "*") else field_name))
+    return result
+
+
+def _as_aggregates(aggregates: Iterable[Aggregate | str]) -> list[Aggregate]:
+    result = []
+    for agg in aggregates:
+        result.extend(parse_aggregates(agg) if isinstance(agg, str) else [agg])
+    if not result:
+        raise ValueError("no aggregates given")
+    return result
+
+
+def _column_values(table: Any, field_name: str) -> Iterable[Any]:
+    #значення поля по невидалених рядках; позиція поля береться один раз,
+    #а не пошуком за ім'ям у кожному рядку
+    rows = table.rows
+    if isinstance(rows, ColumnarRows) and not table.dead_count():
+        #колонковий рушій: сам масив (integer/real) без копіювання
+        return rows.column(field_name)
+    pos = table.schema.field_index[field_name]
+    return map(itemgetter(pos), map(table.schema.row_values, table.scan()))
+
+
+def _complex_column(table: Any, field_name: str, type_name: str) -> ComplexColumn:
+    #complexInteger - завжди цілі python: масив int64 переповнився б на сумі або
+    #і зовсім не вмістив би значення від 2**63 (як і group_by, що рахує цілими python)
+    integer = type_name == "complexInteger"
+    use_numpy = False if integer else None
+    if isinstance(table, Table):
+        return table.complex_column(field_name, use_numpy=use_numpy)
+    return ComplexColumn.from_pairs(_column_values(table, field_name), integer, use_numpy)
+
+
+def _not_nan(values: Iterable[Any]) -> Iterable[Any]:
+    #NaN не порівнюється ні з чим, тому в min/max не бере участі (як і в sorted-індексі)
+    return (v for v in values if v == v)
+
+
+def _total(table: Any, agg: Aggregate, type_name: str | None) -> Any:
+    func = agg.func
+    if func == "count":
+        return table.row_count()
+    field_name = agg.field_name
+    if type_name in COMPLEX_TYPES:
+        col = _complex_column(table, field_name, type_name)
+        if func == "sum":
+            return col.sum()
+        return col.mean() if len(col) else None
+    if func in ("min", "max"):
+        index_for = getattr(table, "index_for", None)
+        idx = index_for(field_name, kind="sorted") if index_for is not None else None
+        if idx is not None:
+            return idx.min() if func == "min" else idx.max()
+        values = _column_values(table, field_name)
+        if type_name == "real":
+            values = _not_nan(values)
+        return (min if func == "min" else max)(values, default=None)
+    values = _column_values(table, field_name)
+    total = math.fsum(values) if type_name == "real" else sum(values)
+    if func == "sum":
+        return total
+    count = table.row_count()
+    return total / count if count else None
+
+
+def aggregate(table: Any, aggregates: Iterable[Aggregate | str]) -> dict[str, Any]:
+    #агрегати по всій таблиці: aggregate(t, ["count", "sum(x)", "avg(z)"]) ->
+    #{"count": ..., "sum(x)": ..., "avg(z)": ...}; для порожньої таблиці avg/min/max - None
+    #кожна функція - один прохід по колонці поля вбудованими sum/min/max,
+    #комплексні - через ComplexColumn (numpy, якщо встановлений)
+    aggs = _as_aggregates(aggregates)
+    types = [agg.check(table) for agg in aggs]
+    return {agg.label: _total(table, agg, type_name) for agg, type_name in zip(aggs, types)}
+
+
+def _group_values(
+    func: str,
+    type_name: str | None,
+    group_ids: list[int],
+    counts: list[int],
+    values: Iterable[Any],
+) -> list[Any]:
+    #значення однієї функції для кожної групи: group_ids[i] - група i-го рядка
+    n = len(counts)
+    if func == "count":
+        return list(counts)
+    if type_name in COMPLEX_TYPES:
+        zero = 0 if type_name == "complexInteger" else 0.0
+        re = [zero] * n
+        im = [zero] * n
+        for g, (a, b) in zip(group_ids, values):
+            re[g] += a
+            im[g] += b
+        if func == "sum":
+            return list(zip(re, im))
+        return [(re[g] / counts[g], im[g] / counts[g]) for g in range(n)]
+    if func in ("min", "max"):
+        best: list[Any] = [None] * n
+        smaller = func == "min"
+        for g, v in zip(group_ids, values):
+            if v != v:
+                continue
+            b = best[g]
+            if b is None or (v < b if smaller else v > b):
+                best[g] = v
+        return best
+    sums = [0.0 if type_name == "real" else 0] * n
+    for g, v in zip(group_ids, values):
+        sums[g] += v
+    if func == "sum":
+        return sums
+    return [sums[g] / counts[g] for g in range(n)]
+
+
+def group_by(table: Any, field_name: str, aggregates: Iterable[Aggregate | str]) -> list[dict[str, Any]]:
+    #GROUP BY по будь-якому полю: один рядок результату на кожне значення поля,
+    #у порядку першої появи значення в таблиці
+    #group_by(t, "dept", ["count", "avg(salary)"]) -> [{"dept": ..., "count": ..., "avg(salary)": ...}, ...]
+    #значення ключа хешуються один раз (один пошук у словнику на рядок), далі кожен рядок
+    #має номер групи, а функції накопичують по колонках у списки, індексовані номером групи
+    if field_name not in table.schema.field_index:
+        raise KeyError(f"unknown field {field_name!r}")
+    aggs = _as_aggregates(aggregates)
+    types = [agg.check(table) for agg in aggs]
+
+    slots: dict[Any, int] = {}
+    keys: list[Any] = []
+    group_ids: list[int] = []
+    for value in _column_values(table, field_name):
+        key = index_key(value)
+        g = slots.get(key)
+        if g is None:
+            g = slots[key] = len(keys)
+            keys.append(value)
+        group_ids.append(g)
+    counts = [0] * len(keys)
+    for g in group_ids:
+        counts[g] += 1
+
+    columns = []
+    for agg, type_name in zip(aggs, types):
+        values = _column_values(table, agg.field_name) if agg.field_name is not None else ()
+        columns.append(_group_values(agg.func, type_name, group_ids, counts, values))
+
+    result = []
+    for g, key in enumerate(keys):
+        row = {field_name: key}
+        for agg, column in zip(aggs, columns):
+            row[agg.label] = column[g]
+        result.append(row)
+    return result
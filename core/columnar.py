@@ -0,0 +1,283 @@
+# core/columnar.py
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import MutableSequence
+from typing import Any, Iterator
+
+from .schema import Schema
+from .row import Row
+from .memory import DEFAULT_SAMPLE, deep_size, sample_positions
+
+
+class _NumberColumn:
+    #одна числова колонка у суцільному масиві: 'q' для integer, 'd' для real
+
+    def __init__(self, typecode: str) -> None:
+        self.data = array(typecode)
+
+    def get(self, i: int) -> Any:
+        return self.data[i]
+
+    def check(self, value: Any) -> None:
+        _checked(value)
+
+    def set(self, i: int, value: Any) -> None:
+        self.data[i] = _checked(value)
+
+    def insert(self, i: int, value: Any) -> None:
+        self.data.insert(i, _checked(value))
+
+    def delete(self, i: int) -> None:
+        del self.data[i]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.data)
+
+    def nbytes(self, sample: int | None = DEFAULT_SAMPLE) -> int:
+        return sys.getsizeof(self.data)
+
+
+class _PairColumn:
+    #комплексна колонка як два паралельні масиви (дійсна та уявна частини)
+
+    def __init__(self, typecode: str) -> None:
+        self.re = array(typecode)
+        self.im = array(typecode)
+
+    def get(self, i: int) -> tuple:
+        return self.re[i], self.im[i]
+
+    def check(self, value: tuple) -> None:
+        re, im = value
+        _checked(re)
+        _checked(im)
+
+    def set(self, i: int, value: tuple) -> None:
+        re, im = value
+        self.re[i], self.im[i] = _checked(re), _checked(im)
+
+    def insert(self, i: int, value: tuple) -> None:
+        re, im = value
+        self.re.insert(i, _checked(re))
+        try:
+            self.im.insert(i, _checked(im))
+        except ValueError:
+            del self.re[i]
+            raise
+
+    def delete(self, i: int) -> None:
+        del self.re[i]
+        del self.im[i]
+
+    def __iter__(self) -> Iterator[tuple]:
+        return zip(self.re, self.im)
+
+    def nbytes(self, sample: int | None = DEFAULT_SAMPLE) -> int:
+        return sys.getsizeof(self.re) + sys.getsizeof(self.im)
+
+
+class _StringColumn:
+    #рядкова колонка: utf-8 байти в одному буфері + зміщення і довжини
+    #при update/delete старі байти лишаються у буфері до compact()
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+        self.starts = array("q")
+        self.lengths = array("q")
+
+    def _put(self, value: str) -> tuple[int, int]:
+        data = value.encode("utf-8")
+        start = len(self.buf)
+        self.buf += data
+        return start, len(data)
+
+    def get(self, i: int) -> str:
+        start = self.starts[i]
+        return self.buf[start:start + self.lengths[i]].decode("utf-8")
+
+    def check(self, value: str) -> None:
+        #напр. самотній сурогат "\ud800" в utf-8 не кодується
+        value.encode("utf-8")
+
+    def set(self, i: int, value: str) -> None:
+        self.starts[i], self.lengths[i] = self._put(value)
+
+    def insert(self, i: int, value: str) -> None:
+        start, length = self._put(value)
+        self.starts.insert(i, start)
+        self.lengths.insert(i, length)
+
+    def delete(self, i: int) -> None:
+        del self.starts[i]
+        del self.lengths[i]
+
+    def compact(self) -> None:
+        #переписує буфер без "мертвих" байтів
+        new_buf = bytearray()
+        for i, (start, length) in enumerate(zip(self.starts, self.lengths)):
+            self.starts[i] = len(new_buf)
+            new_buf += self.buf[start:start + length]
+        self.buf = new_buf
+
+    def __iter__(self) -> Iterator[str]:
+        buf = self.buf
+        for start, length in zip(self.starts, self.lengths):
+            yield buf[start:start + length].decode("utf-8")
+
+    def nbytes(self, sample: int | None = DEFAULT_SAMPLE) -> int:
+        #разом з "мертвими" байтами, які ще не прибрав compact()
+        return sys.getsizeof(self.buf) + sys.getsizeof(self.starts) + sys.getsizeof(self.lengths)
+
+
+class _ObjectColumn:
+    #запасний варіант для типів без компактного представлення (зареєстровані ззовні)
+
+    def __init__(self) -> None:
+        self.data: list[Any] = []
+
+    def get(self, i: int) -> Any:
+        return self.data[i]
+
+    def check(self, value: Any) -> None:
+        pass
+
+    def set(self, i: int, value: Any) -> None:
+        self.data[i] = value
+
+    def insert(self, i: int, value: Any) -> None:
+        self.data.insert(i, value)
+
+    def delete(self, i: int) -> None:
+        del self.data[i]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.data)
+
+    def nbytes(self, sample: int | None = DEFAULT_SAMPLE) -> int:
+        #значення - окремі об'єкти, їх розмір оцінюється за вибіркою
+        data = self.data
+        positions = sample_positions(len(data), sample)
+        if not positions:
+            return sys.getsizeof(data)
+        average = sum(deep_size(data[i]) for i in positions) / len(positions)
+        return sys.getsizeof(data) + round(average * len(data))
+
+
+def _checked(value: Any) -> Any:
+    #array кидає OverflowError/TypeError, а таблиця очікує ValueError
+    if isinstance(value, int) and not -(2 ** 63) <= value < 2 ** 63:
+        raise ValueError(f"value {value!r} does not fit into 64-bit columnar storage")
+    return value
+
+
+def _make_column(type_name: str) -> Any:
+    #вибір представлення колонки за типом поля
+    if type_name == "integer":
+        return _NumberColumn("q")
+    if type_name == "real":
+        return _NumberColumn("d")
+    if type_name == "complexInteger":
+        return _PairColumn("q")
+    if type_name == "complexReal":
+        return _PairColumn("d")
+    if type_name in ("char", "string"):
+        return _StringColumn()
+    return _ObjectColumn()
+
+
+class ColumnarRows(MutableSequence):
+    #колонкове сховище рядків таблиці
+    #поводиться як список Row, але всередині тримає по одній типізованій колонці на поле
+    #рядки, які повертаються, - це знімки: зміна row[...] не потрапляє назад у колонки,
+    #для змін треба використовувати Table.update
+
+    def __init__(self, schema: Schema) -> None:
+        self._names = schema.field_names()
+        self._values_of = schema.row_values
+        self._columns = [_make_column(f.type_name) for f in schema.fields]
+        self._by_name = dict(zip(self._names, self._columns))
+        self._build = schema.row_builder()
+        self._count = 0
+
+    def column(self, field_name: str) -> Any:
+        #повертає внутрішню колонку поля (масив для integer/real)
+        col = self._by_name[field_name]
+        if isinstance(col, _NumberColumn):
+            return col.data
+        return list(col)
+
+    def pair_arrays(self, field_name: str) -> tuple[array, array]:
+        #масиви дійсних і уявних частин комплексної колонки (без копіювання)
+        col = self._by_name[field_name]
+        if not isinstance(col, _PairColumn):
+            raise TypeError(f"field {field_name!r} is not a complex column")
+        return col.re, col.im
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not (0 <= index < self._count):
+            raise IndexError("row index out of range")
+        return index
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        i = self._index(index)
+        return self._build(tuple(col.get(i) for col in self._columns))
+
+    def __setitem__(self, index: int, row: Row) -> None:
+        i = self._index(index)
+        values = self._values_of(row)
+        #спершу перевіряємо всі значення: помилка в одній колонці не повинна
+        #лишити рядок наполовину зміненим
+        for col, value in zip(self._columns, values):
+            col.check(value)
+        for col, value in zip(self._columns, values):
+            col.set(i, value)
+
+    def __delitem__(self, index: int) -> None:
+        i = self._index(index)
+        for col in self._columns:
+            col.delete(i)
+        self._count -= 1
+
+    def insert(self, index: int, row: Row) -> None:
+        i = max(0, min(index if index >= 0 else index + self._count, self._count))
+        done = []
+        try:
+            for col, value in zip(self._columns, self._values_of(row)):
+                col.insert(i, value)
+                done.append(col)
+        except ValueError:
+            #відкочуємо вже вставлені колонки, щоб таблиця лишилась узгодженою
+            for col in done:
+                col.delete(i)
+            raise
+        self._count += 1
+
+    def append(self, row: Row) -> None:
+        self.insert(self._count, row)
+
+    def __iter__(self) -> Iterator[Row]:
+        build = self._build
+        for values in zip(*self._columns):
+            yield build(values)
+
+    def memory_usage(self, sample: int | None = DEFAULT_SAMPLE) -> dict[str, int]:
+        #байти кожної колонки: числові і рядкові - точно, інші - за вибіркою
+        return {name: col.nbytes(sample) for name, col in zip(self._names, self._columns)}
+
+    def compact(self) -> None:
+        #звільняє місце, що лишилось після update/delete рядкових значень
+        for col in self._columns:
+            if isinstance(col, _StringColumn):
+                col.compact()
+
+    def __repr__(self) -> str:
+        return f"ColumnarRows(fields={self._names}, rows={self._count})"
@@ -0,0 +1,174 @@
+# core/complex_columns.py
+from __future__ import annotations
+
+import math
+from itertools import repeat
+from typing import Any, Iterable
+
+try:
+    import numpy as np
+except ImportError: #numpy необов'язковий, без нього працює чистий python
+    np = None
+
+HAS_NUMPY = np is not None
+
+COMPLEX_TYPES = ("complexInteger", "complexReal")
+
+
+class ComplexColumn:
+    #колонка комплексних значень з векторними операціями
+    #з numpy: complexReal - масив complex128, complexInteger - пара масивів int64
+    #без numpy: два списки (дійсні і уявні частини), операції - цикли python
+    #для complexInteger у numpy-режимі add/multiply/conj переповнюють int64, у python - ні;
+    #sum в обох режимах рахує точно (цілі python)
+
+    def __init__(self, re: Iterable[Any], im: Iterable[Any], integer: bool, use_numpy: bool | None = None) -> None:
+        if use_numpy is None:
+            use_numpy = HAS_NUMPY
+        if use_numpy and not HAS_NUMPY:
+            raise ImportError("numpy is not installed")
+        self.integer = integer
+        self.use_numpy = use_numpy
+        self._z = None
+        if not use_numpy:
+            self._re = list(re)
+            self._im = list(im)
+        elif integer:
+            self._re = np.array(re, dtype=np.int64)
+            self._im = np.array(im, dtype=np.int64)
+        else:
+            re_arr = np.array(re, dtype=np.float64)
+            z = np.empty(len(re_arr), dtype=np.complex128)
+            z.real = re_arr
+            z.imag = np.array(im, dtype=np.float64)
+            self._z = z
+
+    @staticmethod
+    def from_pairs(pairs: Iterable[tuple], integer: bool, use_numpy: bool | None = None) -> "ComplexColumn":
+        #з послідовності кортежів (re, im), як вони лежать у рядках
+        pairs = list(pairs)
+        return ComplexColumn([p[0] for p in pairs], [p[1] for p in pairs], integer, use_numpy)
+
+    def _like(self, re: Any, im: Any) -> "ComplexColumn":
+        return ComplexColumn(re, im, self.integer, self.use_numpy)
+
+    def _like_z(self, z: Any) -> "ComplexColumn":
+        #результат операції над complex128 без повторного копіювання
+        col = ComplexColumn.__new__(ComplexColumn)
+        col.integer = False
+        col.use_numpy = True
+        col._z = z
+        return col
+
+    @property
+    def real(self) -> Any:
+        return self._z.real if self._z is not None else self._re
+
+    @property
+    def imag(self) -> Any:
+        return self._z.imag if self._z is not None else self._im
+
+    def __len__(self) -> int:
+        return len(self._z) if self._z is not None else len(self._re)
+
+    def _operand(self, other: Any) -> tuple[Any, Any]:
+        #інша колонка того ж розміру або скаляр: кортеж (re, im), complex чи число
+        if isinstance(other, ComplexColumn):
+            if other.integer != self.integer:
+                raise TypeError("cannot combine complexInteger and complexReal columns")
+            if len(other) != len(self):
+                raise ValueError("complex columns have different lengths")
+            return other.real, other.imag
+        if isinstance(other, tuple) and len(other) == 2:
+            re, im = other
+        elif isinstance(other, complex):
+            re, im = other.real, other.imag
+        elif isinstance(other, (int, float)) and not isinstance(other, bool):
+            re, im = other, 0
+        else:
+            raise TypeError(f"unsupported operand {other!r}")
+        if self.integer and not (type(re) is int and type(im) is int):
+            raise TypeError(f"complexInteger column needs integer operand, got {other!r}")
+        if self.use_numpy:
+            return re, im
+        return repeat(re), repeat(im)
+
+    def add(self, other: Any) -> "ComplexColumn":
+        ore, oim = self._operand(other)
+        if self._z is not None:
+            return self._like_z(self._z + (ore + 1j * oim))
+        if self.use_numpy:
+            return self._like(self._re + ore, self._im + oim)
+        return self._like(
+            [a + b for a, b in zip(self._re, ore)],
+            [a + b for a, b in zip(self._im, oim)],
+        )
+
+    def multiply(self, other: Any) -> "ComplexColumn":
+        #(a + bi)(c + di) = (ac - bd) + (ad + bc)i
+        ore, oim = self._operand(other)
+        if self._z is not None:
+            return self._like_z(self._z * (ore + 1j * oim))
+        if self.use_numpy:
+            a, b = self._re, self._im
+            return self._like(a * ore - b * oim, a * oim + b * ore)
+        re: list[Any] = []
+        im: list[Any] = []
+        for a, b, c, d in zip(self._re, self._im, ore, oim):
+            re.append(a * c - b * d)
+            im.append(a * d + b * c)
+        return self._like(re, im)
+
+    def conj(self) -> "ComplexColumn":
+        if self._z is not None:
+            return self._like_z(np.conj(self._z))
+        if self.use_numpy:
+            return self._like(self.real, -self.imag)
+        return self._like(self._re, [-b for b in self._im])
+
+    def abs(self) -> Any:
+        #модулі значень: масив float64 з numpy або список float
+        if self._z is not None:
+            return np.abs(self._z)
+        if self.use_numpy:
+            return np.hypot(self._re, self._im)
+        return [math.hypot(a, b) for a, b in zip(self._re, self._im)]
+
+    def sum(self) -> tuple:
+        #покомпонентна сума; для complexInteger - цілі частини
+        if self._z is not None:
+            total = self._z.sum()
+            return float(total.real), float(total.imag)
+        if self.use_numpy:
+            return _int_sum(self._re), _int_sum(self._im)
+        if self.integer:
+            return sum(self._re), sum(self._im)
+        return math.fsum(self._re), math.fsum(self._im)
+
+    def mean(self) -> tuple[float, float]:
+        n = len(self)
+        if n == 0:
+            raise ValueError("mean of empty complex column")
+        re, im = self.sum()
+        return re / n, im / n
+
+    def to_list(self) -> list[tuple]:
+        #назад у кортежі (re, im) у форматі значень таблиці
+        cast = int if self.integer else float
+        return [(cast(a), cast(b)) for a, b in zip(self.real, self.imag)]
+
+    def __repr__(self) -> str:
+        kind = "complexInteger" if self.integer else "complexReal"
+        backend = "numpy" if self.use_numpy else "python"
+        return f"ComplexColumn({kind}, {backend}, len={len(self)})"
+
+
+def _int_sum(arr: Any) -> int:
+    #сума масиву int64 без переповнення: у numpy, лише якщо межа n * max|x| вміщається
+    #в int64, інакше - цілими python
+    if len(arr) == 0:
+        return 0
+    bound = max(-int(arr.min()), int(arr.max())) * len(arr)
+    if bound < 2**63:
+        return int(arr.sum())
+    return sum(arr.tolist())
@@ -2,23 +2,71 @@
 from __future__ import annotations
 
 import json
+import time
+import warnings
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
 from .table import Table
 from .schema import Schema
 from .row import Row
-from storage.file_storage import save_table, load_table
+from .stats import timed
+from .memory import DEFAULT_SAMPLE, estimate_product_bytes, estimate_row_bytes
+from .table_cache import TableCache
+from .ops_cartesian import CartesianView, _result_schema, cartesian_product, product_blocks
+from .ops_join import hash_join
+from storage.file_storage import save_table, load_table, load_tables_parallel, save_rows_stream, unload_table
+from storage.binary_storage import save_table_binary, load_table_binary, unload_table_binary
+
+
+#формати зберігання рядків на диску
+STORAGE_FORMATS = ("jsonl", "binary")
+
+#бюджет пам'яті за замовчуванням для декартового добутку з записом на диск
+DEFAULT_SPILL_BUDGET = 64 * 1024 * 1024
+
+#що робити, коли операція не вміщується в memory_budget бази
+BUDGET_POLICIES = ("warn", "refuse")
 
 
 class Database:
     #базовий клас для роботи з табличною базою даних
 
 
-    def __init__(self, name: str, base_dir: str = "db_data") -> None:
+    def __init__(
+        self,
+        name: str,
+        base_dir: str = "db_data",
+        engine: str = "rows",
+        storage_format: str = "jsonl",
+        memory_budget: int | None = None,
+        budget_policy: str = "warn",
+        cache_bytes: int | None = None,
+        cache_tables: int | None = None,
+    ) -> None:
+        if storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"unknown storage format {storage_format!r}, expected one of {STORAGE_FORMATS}")
+        if budget_policy not in BUDGET_POLICIES:
+            raise ValueError(f"unknown budget policy {budget_policy!r}, expected one of {BUDGET_POLICIES}")
         self.name = name
         self.base_path = Path(base_dir) / name
+        self.engine = engine #рушій зберігання рядків для нових і завантажених таблиць
+        #формат файлів рядків: "jsonl" або "binary" (mmap); для існуючої бази
+        #береться з db_meta.json, змінити його можна через convert_format
+        self.storage_format = storage_format
         self.tables: dict[str, Table] = {}
+        self._saved_table_list: list[str] | None = None #перелік таблиць у db_meta.json
+        self._saved_format: str | None = None
+        self.load_errors: dict[str, Exception] = {} #помилки паралельного завантаження
+        #скільки байтів можуть займати таблиці бази в пам'яті (None - без обмеження);
+        #операції, що створюють великі таблиці, перевіряють прогноз через check_memory:
+        #"warn" - RuntimeWarning і операція виконується, "refuse" - MemoryError до її початку
+        self.memory_budget = memory_budget
+        self.budget_policy = budget_policy
+        #кеш таблиць: get_table тримає в пам'яті не більше cache_bytes байтів і/або
+        #cache_tables таблиць, давно не потрібні витісняються (змінені - після збереження)
+        #і дочитуються з tables/ при наступному зверненні; None - без обмеження
+        self.cache = TableCache(self.tables, self._evict, max_bytes=cache_bytes, max_tables=cache_tables)
 
         #створюємо папку якщо її немає
         self.base_path.mkdir(parents=True, exist_ok=True)
@@ -27,7 +75,7 @@ class Database:
         #створює нову таблицю і додає її до бази
         if name in self.tables:
             raise ValueError(f"table {name!r} already exists")
-        table = Table(name=name, schema=schema)
+        table = Table(name=name, schema=schema, engine=self.engine)
         self.tables[name] = table
         return table
 
@@ -36,41 +84,319 @@ class Database:
         if name not in self.tables:
             raise KeyError(f"table {name!r} not found")
         del self.tables[name]
+        self.cache.forget(name)
 
     def get_table(self, name: str) -> Table:
-        #повертає таблицю за ім'ям
+        #повертає таблицю за ім'ям; з обмеженим кешем таблиця дочитується, якщо її
+        #витіснили, а найдавніші інші - витісняються
         if name not in self.tables:
             raise KeyError(f"table {name!r} not found")
+        self.cache.touch(name)
         return self.tables[name]
 
+    def cache_stats(self) -> dict[str, Any]:
+        #влучання, промахи, витіснення кешу таблиць і скільки зараз у пам'яті
+        return self.cache.stats()
+
+    def _evict(self, table: Table) -> None:
+        #витіснення з кешу: змінену таблицю спершу зберігаємо, потім звільняємо рядки
+        if table.is_dirty or table.persisted_rows is None:
+            self._save_table(table)
+            if table.name not in (self._saved_table_list or []):
+                #файли нової таблиці вже на диску - вносимо її в db_meta.json, щоб вона
+                #не загубилась, якщо до save_all справа не дійде (як у cartesian_to_disk)
+                self._write_meta((self._saved_table_list or []) + [table.name])
+        if self.storage_format == "binary":
+            unload_table_binary(table, base_path=self.base_path)
+        else:
+            unload_table(table, base_path=self.base_path)
+
     def list_tables(self) -> list[str]:
         #повертає список назв таблиць
         return sorted(self.tables.keys())
 
-    def save_all(self) -> None:
-        #зберігає усі таблиці в сховище
+    def memory_usage(self, sample: int | None = DEFAULT_SAMPLE) -> dict[str, Any]:
+        #оцінка пам'яті всіх таблиць: {"tables": {ім'я: Table.memory_usage()}, "total": байти}
+        #ще не прочитані ліниві таблиці займають 0 і не завантажуються
+        tables = {name: table.memory_usage(sample) for name, table in self.tables.items()}
+        return {"tables": tables, "total": sum(u["total"] for u in tables.values())}
+
+    def exceeds_budget(self, projected: int) -> bool:
+        #чи не вмістяться ще projected байтів у бюджет разом з наявними таблицями
+        if self.memory_budget is None:
+            return False
+        return self.memory_usage()["total"] + projected > self.memory_budget
+
+    def check_memory(self, projected: int, operation: str) -> bool:
+        #перевірка перед операцією, що займе близько projected байтів
+        #True - вміщується; інакше за budget_policy: попередження і False або MemoryError
+        if not self.exceeds_budget(projected):
+            return True
+        used = self.memory_usage()["total"]
+        message = (
+            f"{operation} needs about {projected} bytes, tables already use {used}, "
+            f"memory budget is {self.memory_budget}"
+        )
+        if self.budget_policy == "refuse":
+            raise MemoryError(message)
+        warnings.warn(message, RuntimeWarning, stacklevel=2)
+        return False
+
+    def cartesian_product(
+        self,
+        name_a: str,
+        name_b: str,
+        result_name: str | None = None,
+        lazy: bool = False,
+        workers: int | None = None,
+        replace: bool = False,
+    ) -> Table | CartesianView:
+        #декартів добуток двох таблиць бази; матеріалізований результат додається в базу
+        #таблицю з тим самим ім'ям результат заміняє лише при replace=True, інакше ValueError
+        #перед матеріалізацією прогноз |A| * |B| * розмір рядка звіряється з memory_budget
+        #lazy=True повертає CartesianView без реєстрації в базі: він лише читає поточні
+        #рядки A і B, тож збережений файл розійшовся б з ним після змін у вхідних
+        #таблицях; щоб додати його в базу - to_table() або cartesian_to_disk
+        #(ліниве представлення рядків не тримає, тому бюджетом не перевіряється)
+        table_a = self.get_table(name_a)
+        table_b = self.get_table(name_b)
+        if result_name is None:
+            result_name = f"{table_a.name}_x_{table_b.name}"
+        if result_name in self.tables and not replace:
+            raise ValueError(f"table {result_name!r} already exists")
+        if not lazy:
+            #послідовний добуток ділить об'єкти значень з A і B, паралельний - ні (вони
+            #повертаються з процесів копіями)
+            serial = workers is None or workers <= 1
+            projected = estimate_product_bytes(table_a, table_b, engine=table_a.engine, shared_values=serial)
+            self.check_memory(projected, f"cartesian product {table_a.name} x {table_b.name}")
+        result = cartesian_product(table_a, table_b, result_name, lazy=lazy, workers=workers)
+        if lazy:
+            return result
+        if result_name in self.tables:
+            self.drop_table(result_name)
+        self.tables[result_name] = result
+        self.cache.touch(result_name)
+        return result
+
+    def join(
+        self,
+        name_a: str,
+        name_b: str,
+        on_a: str,
+        on_b: str,
+        how: str = "inner",
+        result_name: str | None = None,
+    ) -> Table:
+        #хеш-з'єднання A.on_a = B.on_b, матеріалізоване в таблицю бази (рушій бази)
+        #прогноз: кількість рядків результату (рахується без їх побудови) * розмір рядка
+        #left join з рядками без пари таблицею стати не може - TypeError від to_table
+        table_a = self.get_table(name_a)
+        table_b = self.get_table(name_b)
+        view = hash_join(table_a, table_b, on_a, on_b, how=how, result_name=result_name)
+        if view.name in self.tables:
+            raise ValueError(f"table {view.name!r} already exists")
+        rows = view.row_count()
+        if rows:
+            #рядки результату посилаються на об'єкти значень з A і B
+            per_row = estimate_row_bytes((table_a, table_b), engine=self.engine, shared_values=True)
+            self.check_memory(round(rows * per_row), f"join {table_a.name} x {table_b.name}")
+        result = view.to_table(engine=self.engine)
+        self.tables[view.name] = result
+        self.cache.touch(view.name)
+        return result
+
+    @timed("db.save_all")
+    def save_all(self, full: bool = False) -> None:
+        #зберігає змінені таблиці в сховище, чисті таблиці пропускаються
+        #full=True примусово перезаписує всі файли (компактизація)
         for table in self.tables.values():
-            save_table(table, base_path=self.base_path)
-            table.mark_saved()
+            if not full and not table.is_dirty and (not table.loaded or table.persisted_rows is not None):
+                #чисті та ще не прочитані ліниві таблиці не чіпаємо
+                continue
+            self._save_table(table, full=full)
+            if self.cache.enabled:
+                #full=True дочитує всі таблиці - не даємо їм накопичитись у пам'яті
+                self.cache.enforce(keep=table.name)
+
+        #записуємо мета-файл з переліком таблиць, якщо перелік змінився
+        #таблиці, які не вдалося завантажити, лишаються в переліку, щоб не загубити їх файли
+        table_list = list(self.tables.keys())
+        table_list += [n for n in self.load_errors if n not in self.tables]
+        changed = table_list != self._saved_table_list or self.storage_format != self._saved_format
+        if full or changed:
+            self._write_meta(table_list)
 
-        #записуємо мета-файл з переліком таблиць
-        meta = {"tables": list(self.tables.keys())}
+    def _write_meta(self, table_list: list[str]) -> None:
+        meta = {"tables": table_list, "format": self.storage_format}
         meta_path = self.base_path / "db_meta.json"
         with open(meta_path, "w", encoding="utf-8") as f:
             json.dump(meta, f, indent=2, ensure_ascii=False)
+        self._saved_table_list = table_list
+        self._saved_format = self.storage_format
 
-    def load_all(self) -> None:
+    def _save_table(self, table: Table, full: bool = False) -> None:
+        #зберігає одну таблицю у поточному форматі бази
+        #якщо видалених рядків забагато (Table.compact_threshold), таблиця спершу
+        #компактизується, і файл переписується вже без них
+        if table.needs_compaction():
+            table.compact()
+        if self.storage_format == "binary":
+            save_table_binary(table, base_path=self.base_path)
+        else:
+            save_table(table, base_path=self.base_path, full=full)
+        table.mark_saved()
+
+    def compact(self, name: str) -> None:
+        #явна компактизація: прибирає видалені рядки і повністю перезаписує файли таблиці
+        table = self.get_table(name)
+        table.compact()
+        self._save_table(table, full=True)
+
+    def convert_format(self, storage_format: str) -> None:
+        #переводить усю базу в інший формат: кожна таблиця записується заново,
+        #файли старого формату лишаються на місці
+        if storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"unknown storage format {storage_format!r}, expected one of {STORAGE_FORMATS}")
+        self.storage_format = storage_format
+        self.save_all(full=True)
+
+    @timed("db.cartesian_to_disk")
+    def cartesian_to_disk(
+        self,
+        name_a: str,
+        name_b: str,
+        result_name: str | None = None,
+        memory_budget: int = DEFAULT_SPILL_BUDGET,
+        workers: int | None = None,
+        progress: Callable[[int, int, float], None] | None = None,
+        replace: bool = False,
+    ) -> Table:
+        #декартів добуток, який пишеться одразу у файли результату блоками,
+        #тож |A| * |B| може бути більшим за оперативну пам'ять
+        #memory_budget - скільки байтів можуть займати блоки, що будуються і пишуться
+        #одночасно (оцінка; мінімальний блок - один рядок A з усією B)
+        #progress(записано, всього, рядків/с) викликається після кожного блоку
+        #результат реєструється в базі як лінива таблиця і в db_meta.json
+        #replace=True - як у cartesian_product
+        if self.storage_format != "jsonl":
+            raise ValueError("cartesian_to_disk writes jsonl files, convert the database to jsonl first")
+        table_a = self.get_table(name_a)
+        table_b = self.get_table(name_b)
+        if result_name is None:
+            result_name = f"{table_a.name}_x_{table_b.name}"
+        if result_name in self.tables:
+            if not replace:
+                raise ValueError(f"table {result_name!r} already exists")
+            if self.tables[result_name] in (table_a, table_b):
+                raise ValueError(f"cannot overwrite input table {result_name!r} while reading it")
+            #стара таблиця могла б ліниво дочитати вже новий файл рядків
+            self.drop_table(result_name)
+
+        schema = _result_schema(table_a, table_b)
+        block_size = self._spill_block_size(table_a, table_b, schema, memory_budget, workers)
+        blocks = product_blocks(table_a, table_b, workers=workers, block_size=block_size, serialize=True)
+        total = table_a.row_count() * table_b.row_count()
+        save_rows_stream(result_name, schema, self._report(blocks, total, progress), self.base_path)
+
+        table = load_table(result_name, base_path=self.base_path, engine=self.engine, lazy=True)
+        self.cache.watch(table)
+        self.tables[result_name] = table
+        #у db_meta.json додаємо лише результат: інші нові таблиці потраплять туди з save_all
+        saved = [n for n in self._saved_table_list or [] if n != result_name]
+        self._write_meta(saved + [result_name])
+        return table
+
+    @staticmethod
+    def _spill_block_size(
+        table_a: Table,
+        table_b: Table,
+        schema: Schema,
+        memory_budget: int,
+        workers: int | None,
+    ) -> int:
+        #скільки рядків A брати в один блок, щоб блоки в роботі вміщались у бюджет
+        count_b = table_b.row_count()
+        if table_a.row_count() == 0 or count_b == 0:
+            return 1
+        sample = table_a.schema.row_values(table_a.scan()[0]) + table_b.schema.row_values(table_b.scan()[0])
+        line = len(json.dumps(schema.serialize_values(sample), ensure_ascii=False)) + 1
+        #рядок тексту + кортеж пари і список, з якого текст збирається
+        per_row = 2 * line + 64 + 8 * len(sample)
+        in_flight = 2 * workers + 1 if workers is not None and workers > 1 else 1
+        return max(1, memory_budget // (in_flight * per_row * count_b))
+
+    @staticmethod
+    def _report(
+        blocks: Iterator[str],
+        total: int,
+        progress: Callable[[int, int, float], None] | None,
+    ) -> Iterator[str]:
+        #пропускає блоки далі і рахує швидкість запису
+        start = time.perf_counter()
+        done = 0
+        for text in blocks:
+            yield text
+            done += text.count("\n")
+            if progress is not None:
+                elapsed = time.perf_counter() - start
+                progress(done, total, done / elapsed if elapsed > 0 else 0.0)
+
+    @timed("db.load_all")
+    def load_all(
+        self,
+        lazy: bool = False,
+        workers: int | None = None,
+        verify: bool = False,
+    ) -> dict[str, Exception]:
         #завантажує всі таблиці з диску (якщо є)
+        #lazy=True читає лише db_meta.json і схеми, рядки - при першому зверненні
+        #workers > 1 парсить таблиці (і шматки великих файлів) пулом процесів;
+        #у цьому режимі помилки окремих таблиць не переривають завантаження інших,
+        #а повертаються (і зберігаються в self.load_errors)
+        #verify=True повністю валідує значення з файлів (за замовчуванням їм довіряємо)
+        #з обмеженим кешем (cache_bytes/cache_tables) таблиці завжди ліниві: дочитуються
+        #через get_table, щоб уся база не опинилась у пам'яті одразу
+        self.load_errors = {}
+        if self.cache.enabled:
+            lazy = True
         meta_path = self.base_path / "db_meta.json"
         if not meta_path.exists():
-            return
+            return self.load_errors
 
         with open(meta_path, "r", encoding="utf-8") as f:
             meta = json.load(f)
+        self.storage_format = self._saved_format = meta.get("format", "jsonl")
+
+        if self.storage_format == "binary":
+            #бінарні таблиці вже ліниві: читається заголовок, рядки - через mmap
+            for tname in meta.get("tables", []):
+                table = load_table_binary(tname, base_path=self.base_path, engine=self.engine)
+                if self.cache.enabled:
+                    #рядки відобразяться знову при першому зверненні через get_table
+                    unload_table_binary(table, base_path=self.base_path)
+                    self.cache.watch(table)
+                self.tables[tname] = table
+            self._saved_table_list = list(meta.get("tables", []))
+            return self.load_errors
+
+        if workers is not None and workers > 1 and not lazy:
+            names = list(meta.get("tables", []))
+            tables, self.load_errors = load_tables_parallel(
+                names, base_path=self.base_path, workers=workers, engine=self.engine, verify=verify
+            )
+            self.tables.update(tables)
+            self._saved_table_list = names
+            return self.load_errors
 
         for tname in meta.get("tables", []):
-            table = load_table(tname, base_path=self.base_path)
+            table = load_table(
+                tname, base_path=self.base_path, engine=self.engine, lazy=lazy, verify=verify
+            )
+            self.cache.watch(table)
             self.tables[tname] = table
+        self._saved_table_list = list(meta.get("tables", []))
+        return self.load_errors
 
     def __repr__(self) -> str:
         return f"Database(name={self.name!r}, tables={list(self.tables.keys())})"
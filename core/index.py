@@ -0,0 +1,231 @@
+# core/index.py
+from __future__ import annotations
+
+import sys
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Iterable
+
+
+#розмір об'єкта int для позицій рядків (малі int спільні, тож це оцінка зверху)
+_INT_SIZE = sys.getsizeof(1 << 20)
+
+
+def index_key(value: Any) -> Any:
+    #ключ для словника індексу: значення більшості типів (int, float, str,
+    #кортежі комплексних) хешуються як є; незмінні копії - для зовнішніх типів,
+    #що тримають значення у списках чи словниках
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    if isinstance(value, (list, tuple)):
+        return tuple(index_key(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, index_key(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(index_key(v) for v in value)
+    return repr(value)
+
+
+class HashIndex:
+    #хеш-індекс по одному полю: значення -> відсортований список позицій рядків
+    #будується ліниво (при першому пошуку), поки не побудований - зміни таблиці
+    #його не стосуються; Table підтримує побудований індекс при insert/update/delete,
+    #видалені рядки в індекс не потрапляють, а компактизація скидає індекс
+
+    kind = "hash"
+
+    def __init__(self, field_name: str, position: int) -> None:
+        self.field_name = field_name
+        self.position = position #позиція поля в кортежі значень рядка
+        self._map: dict[Any, list[int]] | None = None
+
+    @property
+    def built(self) -> bool:
+        return self._map is not None
+
+    def reset(self) -> None:
+        #скидає побудований індекс (напр. коли таблиці підмінили всі рядки)
+        self._map = None
+
+    def build(self, items: Iterable[tuple[int, tuple]]) -> None:
+        #будує індекс з пар (позиція рядка, кортеж значень) за зростанням позицій
+        mapping: dict[Any, list[int]] = {}
+        pos = self.position
+        for i, vals in items:
+            key = index_key(vals[pos])
+            positions = mapping.get(key)
+            if positions is None:
+                mapping[key] = [i]
+            else:
+                positions.append(i)
+        self._map = mapping
+
+    def add(self, values: tuple, row_pos: int) -> None:
+        key = index_key(values[self.position])
+        positions = self._map.get(key)
+        if positions is None:
+            self._map[key] = [row_pos]
+        elif positions[-1] < row_pos:
+            positions.append(row_pos)
+        else:
+            insort(positions, row_pos)
+
+    def remove(self, values: tuple, row_pos: int) -> None:
+        key = index_key(values[self.position])
+        positions = self._map[key]
+        positions.remove(row_pos)
+        if not positions:
+            del self._map[key]
+
+    def find(self, value: Any) -> list[int]:
+        #позиції рядків з таким значенням (вже провалідованим типом поля)
+        return list(self._map.get(index_key(value), ()))
+
+    def memory_usage(self) -> int:
+        #байти словника і списків позицій; ключі - ті самі об'єкти, що й у рядках
+        if self._map is None:
+            return 0
+        lists = self._map.values()
+        return sys.getsizeof(self._map) + sum(sys.getsizeof(p) + _INT_SIZE * len(p) for p in lists)
+
+    def __len__(self) -> int:
+        #кількість різних значень
+        return len(self._map) if self._map is not None else 0
+
+    def __repr__(self) -> str:
+        state = f"keys={len(self)}" if self.built else "not built"
+        return f"{type(self).__name__}({self.field_name!r}, {state})"
+
+
+#типи, значення яких мають природний порядок
+SORTED_TYPES = ("integer", "real", "char", "string")
+
+
+def _is_nan(value: Any) -> bool:
+    return value != value
+
+
+class SortedIndex:
+    #впорядкований індекс по одному полю: відсортовані масиви ключів і позицій,
+    #пошук через bisect; для рівних ключів позиції теж ідуть за зростанням
+    #підтримує рівність, діапазони, min/max і перебір у порядку ключів
+    #вставка/видалення - O(n) зсуву списку (memmove), зате діапазон - O(log n + k)
+    #NaN не порівнюється ні з чим, тому такі рядки тримаються окремо і в діапазони не потрапляють
+
+    kind = "sorted"
+
+    def __init__(self, field_name: str, position: int) -> None:
+        self.field_name = field_name
+        self.position = position
+        self._keys: list[Any] | None = None
+        self._positions: list[int] = []
+        self._nan: list[int] = []
+
+    @property
+    def built(self) -> bool:
+        return self._keys is not None
+
+    def reset(self) -> None:
+        self._keys = None
+        self._positions = []
+        self._nan = []
+
+    def build(self, items: Iterable[tuple[int, tuple]]) -> None:
+        pos = self.position
+        pairs = []
+        nan = []
+        for i, vals in items:
+            value = vals[pos]
+            if _is_nan(value):
+                nan.append(i)
+            else:
+                pairs.append((value, i))
+        pairs.sort()
+        self._keys = [k for k, _ in pairs]
+        self._positions = [i for _, i in pairs]
+        self._nan = nan
+
+    def _run(self, key: Any) -> tuple[int, int]:
+        #межі відрізку з ключем key у відсортованих масивах
+        return bisect_left(self._keys, key), bisect_right(self._keys, key)
+
+    def add(self, values: tuple, row_pos: int) -> None:
+        key = values[self.position]
+        if _is_nan(key):
+            insort(self._nan, row_pos)
+            return
+        lo, hi = self._run(key)
+        j = bisect_left(self._positions, row_pos, lo, hi)
+        self._keys.insert(j, key)
+        self._positions.insert(j, row_pos)
+
+    def remove(self, values: tuple, row_pos: int) -> None:
+        key = values[self.position]
+        if _is_nan(key):
+            self._nan.remove(row_pos)
+            return
+        lo, hi = self._run(key)
+        j = bisect_left(self._positions, row_pos, lo, hi)
+        if j == hi or self._positions[j] != row_pos:
+            raise KeyError(f"row {row_pos} is not in index on {self.field_name!r}")
+        del self._keys[j]
+        del self._positions[j]
+
+    def find(self, value: Any) -> list[int]:
+        if _is_nan(value):
+            return []
+        lo, hi = self._run(value)
+        return self._positions[lo:hi]
+
+    def range(
+        self,
+        lo: Any = None,
+        hi: Any = None,
+        inclusive: bool | tuple[bool, bool] = True,
+    ) -> list[int]:
+        #позиції рядків з lo <= значення <= hi у порядку значень
+        #None - межа відсутня; inclusive=(False, True) задає межі окремо
+        if isinstance(inclusive, bool):
+            inclusive = (inclusive, inclusive)
+        keys = self._keys
+        if lo is None:
+            start = 0
+        else:
+            start = bisect_left(keys, lo) if inclusive[0] else bisect_right(keys, lo)
+        if hi is None:
+            stop = len(keys)
+        else:
+            stop = bisect_right(keys, hi) if inclusive[1] else bisect_left(keys, hi)
+        return self._positions[start:stop]
+
+    def min(self) -> Any:
+        return self._keys[0] if self._keys else None
+
+    def max(self) -> Any:
+        return self._keys[-1] if self._keys else None
+
+    def ordered_positions(self, reverse: bool = False) -> list[int]:
+        #усі позиції у порядку значень (рядки з NaN - в кінці)
+        if reverse:
+            return self._positions[::-1] + self._nan
+        return self._positions + self._nan
+
+    def memory_usage(self) -> int:
+        if self._keys is None:
+            return 0
+        entries = len(self._positions) + len(self._nan)
+        arrays = sys.getsizeof(self._keys) + sys.getsizeof(self._positions) + sys.getsizeof(self._nan)
+        return arrays + _INT_SIZE * entries
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._nan) if self._keys is not None else 0
+
+    def __repr__(self) -> str:
+        state = f"entries={len(self)}" if self.built else "not built"
+        return f"{type(self).__name__}({self.field_name!r}, {state})"
+
+
+#доступні види індексів: назва (як у <name>.indexes.json) -> клас
+INDEX_KINDS = {"hash": HashIndex, "sorted": SortedIndex}
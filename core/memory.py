@@ -0,0 +1,116 @@
+# core/memory.py
+from __future__ import annotations
+
+import sys
+from array import array
+from typing import Any, Callable, Iterable, Sequence
+
+from .row import Row
+
+
+#оцінка оперативної пам'яті рядків: розміри об'єктів через sys.getsizeof, для великих
+#таблиць - за вибіркою рядків з екстраполяцією на всю таблицю
+#малі int та інтерновані рядки python ділить між об'єктами, а тут вони рахуються
+#при кожній появі, тож оцінка радше зверху
+
+#скільки рядків таблиці рахувати поштучно (None - усі)
+DEFAULT_SAMPLE = 1000
+
+POINTER_SIZE = sys.getsizeof([None]) - sys.getsizeof([])
+ROW_SIZE = sys.getsizeof(Row.__new__(Row))
+_EMPTY_TUPLE = sys.getsizeof(())
+_WORD = array("q").itemsize
+
+
+def deep_size(value: Any) -> int:
+    #розмір значення разом з вкладеними (пари комплексних, списки, словники)
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(deep_size(v) for v in value)
+    elif isinstance(value, dict):
+        size += sum(deep_size(k) + deep_size(v) for k, v in value.items())
+    return size
+
+
+def tuple_size(length: int) -> int:
+    return _EMPTY_TUPLE + length * POINTER_SIZE
+
+
+def sample_positions(count: int, sample: int | None) -> range:
+    #рівномірно розкидані позиції для вибірки (не більше sample)
+    if sample is None or count <= sample:
+        return range(count)
+    return range(0, count, -(-count // sample))
+
+
+def value_sizes(
+    rows: Sequence[Any],
+    values_of: Callable[[Any], tuple],
+    field_count: int,
+    sample: int | None = DEFAULT_SAMPLE,
+) -> tuple[list[float], list[float]]:
+    #середній розмір значення кожного поля в байтах (глибокий) і середня довжина
+    #в utf-8 для рядкових значень - за вибіркою рядків
+    positions = sample_positions(len(rows), sample)
+    sizes = [0] * field_count
+    texts = [0] * field_count
+    for i in positions:
+        for j, value in enumerate(values_of(rows[i])):
+            sizes[j] += deep_size(value)
+            if isinstance(value, str):
+                texts[j] += len(value.encode("utf-8"))
+    taken = len(positions) or 1
+    return [s / taken for s in sizes], [t / taken for t in texts]
+
+
+def columnar_width(type_name: str, value_size: float, text_size: float) -> float:
+    #скільки байтів на рядок займає значення поля в колонковому рушії
+    if type_name in ("integer", "real"):
+        return _WORD
+    if type_name in ("complexInteger", "complexReal"):
+        return 2 * _WORD
+    if type_name in ("char", "string"):
+        #байти utf-8 у буфері + зміщення і довжина
+        return text_size + 2 * _WORD
+    return value_size + POINTER_SIZE
+
+
+def estimate_row_bytes(
+    tables: Iterable[Any],
+    engine: str = "rows",
+    sample: int | None = DEFAULT_SAMPLE,
+    shared_values: bool = False,
+) -> float:
+    #оцінка розміру рядка, що складається з полів усіх tables (як у декартовому добутку),
+    #у рушії engine; shared_values=True - рядки рушія rows посилаються на ті самі об'єкти
+    #значень, що й вхідні таблиці (послідовний добуток), тож нові - лише Row і кортеж
+    per_row = 0.0
+    field_count = 0
+    for table in tables:
+        fields = table.schema.fields
+        field_count += len(fields)
+        if engine == "rows" and shared_values:
+            continue
+        sizes, texts = value_sizes(table.scan(include_deleted=True), table.schema.row_values, len(fields), sample)
+        if engine == "rows":
+            per_row += sum(sizes)
+        else:
+            per_row += sum(columnar_width(f.type_name, s, t) for f, s, t in zip(fields, sizes, texts))
+    if engine == "rows":
+        #об'єкт Row, кортеж значень і вказівник у списку рядків
+        per_row += ROW_SIZE + tuple_size(field_count) + POINTER_SIZE
+    return per_row
+
+
+def estimate_product_bytes(
+    table_a: Any,
+    table_b: Any,
+    engine: str = "rows",
+    sample: int | None = DEFAULT_SAMPLE,
+    shared_values: bool = False,
+) -> int:
+    #прогноз пам'яті матеріалізованого декартового добутку: |A| * |B| * розмір рядка результату
+    rows = table_a.row_count() * table_b.row_count()
+    if rows == 0:
+        return 0
+    return round(rows * estimate_row_bytes((table_a, table_b), engine, sample, shared_values))
@@ -1,11 +1,16 @@
 # core/ops_cartesian.py
 from __future__ import annotations
 
-from typing import Any
+import json
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterator
 
 from .table import Table
 from .schema import Schema, Field
 from .row import Row
+from .stats import timed
 
 
 def _prefixed_fields(schema: Schema, prefix: str) -> list[Field]:
@@ -18,39 +23,248 @@ def _prefixed_fields(schema: Schema, prefix: str) -> list[Field]:
     return new_fields
 
 
-def cartesian_product(table_a: Table, table_b: Table, result_name: str | None = None) -> Table:
+def _result_schema(table_a: Table, table_b: Table) -> Schema:
+    #схема результату: поля A_* для таблиці A, поля B_* для таблиці B
+    fields_a = _prefixed_fields(table_a.schema, "A_")
+    fields_b = _prefixed_fields(table_b.schema, "B_")
+    return Schema(fields=fields_a + fields_b)
+
+
+class _ProductRows(Sequence):
+    #лінива послідовність рядків добутку
+    #рядок (a, b) будується лише в момент звернення, нічого не зберігаємо
+
+    def __init__(self, table_a: Table, table_b: Table, schema: Schema) -> None:
+        self._a = table_a
+        self._b = table_b
+        self._values_a = table_a.schema.row_values
+        self._values_b = table_b.schema.row_values
+        self._build = schema.row_builder()
+
+    def _combine(self, row_a: Row, row_b: Row) -> Row:
+        return self._build(self._values_a(row_a) + self._values_b(row_b))
+
+    def __len__(self) -> int:
+        #|A| * |B| без перебору пар
+        return self._a.row_count() * self._b.row_count()
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not (0 <= index < n):
+            raise IndexError("row index out of range")
+        #порядок як у вкладеному циклі: спочатку по A, потім по B
+        ia, ib = divmod(index, self._b.row_count())
+        return self._combine(self._a.scan()[ia], self._b.scan()[ib])
+
+    def __iter__(self) -> Iterator[Row]:
+        build = self._build
+        values_of_a = self._values_a
+        values_b = [self._values_b(r) for r in self._b.scan()]
+        for row_a in self._a.scan():
+            values_a = values_of_a(row_a)
+            for vb in values_b:
+                yield build(values_a + vb)
+
+
+class CartesianView:
+    #таблиця-представлення декартового добутку без матеріалізації рядків
+    #має той самий інтерфейс читання що й Table (name, schema, rows, row_count)
+    #рядки будуються на льоту, тому зміни у вхідних таблицях одразу видно тут
+
+    def __init__(self, table_a: Table, table_b: Table, name: str) -> None:
+        self.name = name
+        self.schema = _result_schema(table_a, table_b)
+        self.rows = _ProductRows(table_a, table_b, self.schema)
+        self.is_dirty: bool = True #ще не збережено на диск
+        self.loaded: bool = True
+        self.persisted_rows: int | None = None
+        self.needs_rewrite: bool = True
+
+    def __iter__(self) -> Iterator[Row]:
+        return iter(self.rows)
+
+    def scan(self, include_deleted: bool = False) -> Sequence:
+        #як у Table: послідовність рядків без копіювання (видалених рядків немає)
+        return self.rows
+
+    def get_rows(self) -> list[Row]:
+        #матеріалізує всі рядки у список
+        return list(self.rows)
+
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    def memory_usage(self, sample: int | None = None) -> dict[str, Any]:
+        #як у Table: представлення рядків не тримає, вони будуються на льоту
+        names = self.schema.field_names()
+        return {"columns": dict.fromkeys(names, 0), "overhead": 0, "indexes": 0, "total": 0}
+
+    def insert(self, data: dict[str, Any]) -> Row:
+        raise TypeError(f"{self.name!r} is a read-only product view, call to_table() first")
+
+    def update(self, index: int, new_data: dict[str, Any]) -> None:
+        raise TypeError(f"{self.name!r} is a read-only product view, call to_table() first")
+
+    def delete(self, index: int) -> None:
+        raise TypeError(f"{self.name!r} is a read-only product view, call to_table() first")
+
+    def as_serializable(self) -> list[dict[str, Any]]:
+        schema = self.schema
+        return [schema.serialize_values(schema.row_values(r)) for r in self.rows]
+
+    def mark_saved(self) -> None:
+        self.is_dirty = False
+        self.needs_rewrite = False
+        self.persisted_rows = self.row_count()
+
+    def to_table(self, engine: str = "rows") -> Table:
+        #явна матеріалізація у звичайну таблицю
+        table = Table(name=self.name, schema=self.schema, engine=engine)
+        table.rows.extend(self.rows)
+        table.is_dirty = True
+        return table
+
+    def __repr__(self) -> str:
+        return f"CartesianView(name={self.name!r}, rows={self.row_count()})"
+
+
+#скільки рядків результату припадає на один блок паралельного добутку за замовчуванням
+DEFAULT_BLOCK_ROWS = 50_000
+
+
+def _combine_block(
+    block_a: list[tuple],
+    values_b: list[tuple],
+    serialize: Callable[[tuple], dict[str, Any]] | None,
+) -> list[tuple] | str:
+    #усі пари блоку рядків A з усіма рядками B у порядку A-major
+    #serialize задано - одразу текст jsonl (так його дешевше передати і записати)
+    combined = [va + vb for va in block_a for vb in values_b]
+    if serialize is None:
+        return combined
+    dumps = json.dumps
+    return "".join([dumps(serialize(v), ensure_ascii=False) + "\n" for v in combined])
+
+
+#стан процесу-воркера: значення обох таблиць передаються один раз при його старті,
+#а завдання - це лише межі блоку рядків A
+_worker_state: dict[str, Any] = {}
+
+
+def _init_product_worker(values_a: list[tuple], values_b: list[tuple], schema_data: dict[str, Any] | None) -> None:
+    _worker_state["a"] = values_a
+    _worker_state["b"] = values_b
+    _worker_state["serialize"] = Schema.from_dict(schema_data).serialize_values if schema_data else None
+
+
+def _product_block(start: int, stop: int) -> list[tuple] | str:
+    #виконується у воркері
+    state = _worker_state
+    return _combine_block(state["a"][start:stop], state["b"], state["serialize"])
+
+
+def product_blocks(
+    table_a: Table,
+    table_b: Table,
+    workers: int | None = None,
+    block_size: int | None = None,
+    serialize: bool = False,
+) -> Iterator[list[tuple] | str]:
+    #декартів добуток блоками: кожен блок - block_size рядків A, поєднаних з усією B
+    #блоки видаються строго у порядку A-major, як у послідовному cartesian_product
+    #workers > 1 - блоки будуються пулом процесів (одночасно в роботі до 2 * workers
+    #блоків, тож пам'ять обмежена); workers=None або 1 - у цьому процесі
+    #serialize=True - блоки як текст jsonl за схемою результату замість кортежів значень
+    values_of_a = table_a.schema.row_values
+    values_of_b = table_b.schema.row_values
+    values_a = [values_of_a(r) for r in table_a.scan()]
+    values_b = [values_of_b(r) for r in table_b.scan()]
+    if not values_a or not values_b:
+        return
+    if block_size is None:
+        block_size = max(1, DEFAULT_BLOCK_ROWS // len(values_b))
+    if block_size < 1:
+        raise ValueError("block_size must be positive")
+    ranges = [(start, min(start + block_size, len(values_a))) for start in range(0, len(values_a), block_size)]
+    schema = _result_schema(table_a, table_b) if serialize else None
+
+    if workers is None or workers <= 1:
+        convert = schema.serialize_values if schema is not None else None
+        for start, stop in ranges:
+            yield _combine_block(values_a[start:stop], values_b, convert)
+        return
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_product_worker,
+        initargs=(values_a, values_b, schema.as_dict() if schema is not None else None),
+    )
+    try:
+        pending: deque = deque()
+        for start, stop in ranges:
+            pending.append(pool.submit(_product_block, start, stop))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        #якщо перебір зупинили раніше - решту блоків не рахуємо
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+@timed("ops.cartesian_product")
+def cartesian_product(
+    table_a: Table,
+    table_b: Table,
+    result_name: str | None = None,
+    lazy: bool = False,
+    workers: int | None = None,
+    block_size: int | None = None,
+) -> Table | CartesianView:
     #виконує декартів добуток двох таблиць:
     #результат містить усі комбінації рядків (a, b), де a з A, b з B
     #схема результату: поля A_* для таблиці A, поля B_* для таблиці B
+    #lazy=True повертає CartesianView, який будує рядки на вимогу
+    #workers > 1 будує пари блоками рядків A у пулі процесів (див. product_blocks),
+    #порядок рядків той самий
+
+    if result_name is None:
+        result_name = f"{table_a.name}_x_{table_b.name}"
+
+    if lazy:
+        return CartesianView(table_a, table_b, result_name)
 
     if table_a.row_count() == 0 or table_b.row_count() == 0:
         #результат порожній, але схема все одно є важливою
         pass
 
     #будуємо схему результату
-    fields_a = _prefixed_fields(table_a.schema, "A_")
-    fields_b = _prefixed_fields(table_b.schema, "B_")
-    result_schema = Schema(fields=fields_a + fields_b)
+    result_schema = _result_schema(table_a, table_b)
 
-    if result_name is None:
-        result_name = f"{table_a.name}_x_{table_b.name}"
+    #результат зберігається тим самим рушієм, що й таблиця A
+    result_table = Table(name=result_name, schema=result_schema, engine=table_a.engine)
+
+    build = result_schema.row_builder()
+    if workers is not None and workers > 1:
+        for block in product_blocks(table_a, table_b, workers=workers, block_size=block_size):
+            result_table.extend_trusted(map(build, block))
+        result_table.is_dirty = True
+        return result_table
 
-    result_table = Table(name=result_name, schema=result_schema)
+    #значення обох таблиць уже провалідовані їхніми типами, тому повторно не парсимо:
+    #витягуємо кортежі значень один раз, а кожна пара - це конкатенація кортежів
+    values_of_a = table_a.schema.row_values
+    values_of_b = table_b.schema.row_values
+    values_b = [values_of_b(r) for r in table_b.scan()]
 
     #обходимо всі пари рядків
-    for row_a in table_a.get_rows():
-        for row_b in table_b.get_rows():
-            data: dict[str, Any] = {}
-            #додаємо значення з таблиці A
-            for field in table_a.schema.fields:
-                data[f"A_{field.name}"] = row_a.get(field.name)
-            #додаємо значення з таблиці B
-            for field in table_b.schema.fields:
-                data[f"B_{field.name}"] = row_b.get(field.name)
-
-            #вставляємо рядок без додаткової валідації, бо ми вже узгодили схему
-            normalized = result_schema.validate_row(data)
-            result_table.rows.append(Row(normalized))
+    for row_a in table_a.scan():
+        values_a = values_of_a(row_a)
+        result_table.extend_trusted(build(values_a + vb) for vb in values_b)
 
     #результат вважаємо новою таблицею у пам'яті, поки що позначимо як dirty
     result_table.is_dirty = True
@@ -0,0 +1,174 @@
+# core/ops_join.py
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from .index import index_key
+from .ops_cartesian import _result_schema
+from .row import Row
+from .table import Table
+
+
+JOIN_KINDS = ("inner", "left")
+
+#типи, значення яких можна порівнювати між собою при з'єднанні
+_COMPATIBLE = [
+    {"integer", "real"},
+    {"complexInteger", "complexReal"},
+    {"char", "string"},
+]
+
+
+def _join_position(table: Table, field_name: str) -> int:
+    if field_name not in table.schema.field_index:
+        raise KeyError(f"unknown field {field_name!r} in table {table.name!r}")
+    return table.schema.field_index[field_name]
+
+
+def _check_types(table_a: Table, on_a: str, table_b: Table, on_b: str) -> None:
+    type_a = table_a.schema.fields[table_a.schema.field_index[on_a]].type_name
+    type_b = table_b.schema.fields[table_b.schema.field_index[on_b]].type_name
+    if type_a == type_b or any(type_a in group and type_b in group for group in _COMPATIBLE):
+        return
+    raise TypeError(f"cannot join {type_a} field {on_a!r} with {type_b} field {on_b!r}")
+
+
+class JoinView:
+    #результат хеш-з'єднання A.on_a = B.on_b без матеріалізації
+    #хеш-таблиця будується по меншій таблиці, більша перебирається потоком,
+    #рядки результату з'являються по одному під час перебору
+    #схема як у декартового добутку: A_* і B_*
+    #how="left": рядки A без пари отримують None у всіх полях B
+
+    def __init__(
+        self,
+        table_a: Table,
+        table_b: Table,
+        on_a: str,
+        on_b: str,
+        how: str = "inner",
+        name: str | None = None,
+    ) -> None:
+        if how not in JOIN_KINDS:
+            raise ValueError(f"unknown join kind {how!r}, expected one of {JOIN_KINDS}")
+        self._pos_a = _join_position(table_a, on_a)
+        self._pos_b = _join_position(table_b, on_b)
+        _check_types(table_a, on_a, table_b, on_b)
+        self.name = name or f"{table_a.name}_join_{table_b.name}"
+        self.schema = _result_schema(table_a, table_b)
+        self.how = how
+        self._a = table_a
+        self._b = table_b
+
+    def _build_on_a(self) -> bool:
+        #будуємо хеш по меншій таблиці
+        return self._a.row_count() < self._b.row_count()
+
+    @staticmethod
+    def _hash(table: Table, pos: int) -> dict[Any, list[tuple]]:
+        #ключ з'єднання -> кортежі значень рядків у порядку таблиці
+        buckets: dict[Any, list[tuple]] = {}
+        values_of = table.schema.row_values
+        for row in table.scan():
+            values = values_of(row)
+            buckets.setdefault(index_key(values[pos]), []).append(values)
+        return buckets
+
+    def __iter__(self) -> Iterator[Row]:
+        build = self.schema.row_builder()
+        values_of_a = self._a.schema.row_values
+        values_of_b = self._b.schema.row_values
+        pos_a, pos_b = self._pos_a, self._pos_b
+
+        if not self._build_on_a():
+            #хеш по B, потік по A: результат у порядку A
+            buckets = self._hash(self._b, pos_b)
+            nulls = (None,) * len(self._b.schema.fields)
+            left = self.how == "left"
+            for row_a in self._a.scan():
+                va = values_of_a(row_a)
+                matches = buckets.get(index_key(va[pos_a]))
+                if matches:
+                    for vb in matches:
+                        yield build(va + vb)
+                elif left:
+                    yield build(va + nulls)
+            return
+
+        #хеш по A, потік по B; для left join запам'ятовуємо ключі, що знайшли пару,
+        #а рядки A з рештою ключів видаємо наприкінці
+        buckets = self._hash(self._a, pos_a)
+        matched: set[Any] = set()
+        for row_b in self._b.scan():
+            vb = values_of_b(row_b)
+            key = index_key(vb[pos_b])
+            matches = buckets.get(key)
+            if matches:
+                matched.add(key)
+                for va in matches:
+                    yield build(va + vb)
+        if self.how == "left":
+            nulls = (None,) * len(self._b.schema.fields)
+            for key, bucket in buckets.items():
+                if key not in matched:
+                    for va in bucket:
+                        yield build(va + nulls)
+
+    def row_count(self) -> int:
+        #кількість рядків з розмірів кошиків, без побудови рядків результату
+        small, pos_small, large, pos_large = self._a, self._pos_a, self._b, self._pos_b
+        if not self._build_on_a():
+            small, pos_small, large, pos_large = large, pos_large, small, pos_small
+        sizes: dict[Any, int] = {}
+        values_of = small.schema.row_values
+        for row in small.scan():
+            key = index_key(values_of(row)[pos_small])
+            sizes[key] = sizes.get(key, 0) + 1
+
+        values_of = large.schema.row_values
+        total = 0
+        hit: set[Any] = set()
+        for row in large.scan():
+            key = index_key(values_of(row)[pos_large])
+            n = sizes.get(key)
+            if n:
+                total += n
+                hit.add(key)
+        if self.how == "left":
+            if small is self._a:
+                total += sum(n for key, n in sizes.items() if key not in hit)
+            else:
+                #A - більша таблиця: кожен її рядок без пари дає один рядок
+                total += sum(1 for row in large.scan() if index_key(values_of(row)[pos_large]) not in sizes)
+        return total
+
+    def get_rows(self) -> list[Row]:
+        return list(self)
+
+    def to_table(self, engine: str = "rows") -> Table:
+        #матеріалізація у звичайну таблицю; для left join лише якщо немає рядків з None,
+        #бо типи полів не мають порожнього значення
+        table = Table(name=self.name, schema=self.schema, engine=engine)
+        rows = self.get_rows()
+        if self.how == "left" and any(v is None for r in rows for v in r.values()):
+            raise TypeError("left join result has rows without a match (None values), it cannot become a table")
+        table.extend_trusted(rows)
+        table.is_dirty = True
+        return table
+
+    def __repr__(self) -> str:
+        return f"JoinView(name={self.name!r}, how={self.how!r})"
+
+
+def hash_join(
+    table_a: Table,
+    table_b: Table,
+    on_a: str,
+    on_b: str,
+    how: str = "inner",
+    result_name: str | None = None,
+) -> JoinView:
+    #з'єднання рівності A.on_a = B.on_b за O(|A| + |B| + результат)
+    #на відміну від cartesian_product + фільтр не будує всі |A| * |B| пар
+    #повертає потокове JoinView; to_table() - матеріалізація
+    return JoinView(table_a, table_b, on_a, on_b, how=how, name=result_name)
@@ -0,0 +1,283 @@
+# core/query.py
+from __future__ import annotations
+
+import operator
+import re
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from .index import SORTED_TYPES
+from .row import Row
+from .schema import Field, Schema
+from .table import Table
+
+if TYPE_CHECKING:
+    from .database import Database
+
+
+#оператори порівняння в умовах where
+COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_ORDERED_OPS = ("<", "<=", ">", ">=")
+
+
+class Condition:
+    #одна умова "поле оператор значення"
+    #значення парситься типом поля, тому "1+2i" порівнюється з комплексним як (1, 2)
+
+    def __init__(self, schema: Schema, field_name: str, op: str, raw_value: Any) -> None:
+        if op == "<>":
+            op = "!="
+        if op not in COMPARISONS:
+            raise ValueError(f"unknown comparison {op!r}")
+        field = _schema_field(schema, field_name)
+        if op in _ORDERED_OPS and field.type_name not in SORTED_TYPES:
+            raise TypeError(f"field {field_name!r} has type {field.type_name}, which has no ordering")
+        self.field_name = field_name
+        self.op = op
+        self.value = field.validate_value(raw_value)
+        self.position = schema.field_index[field_name]
+        self._compare = COMPARISONS[op]
+
+    def test(self, values: tuple) -> bool:
+        return self._compare(values[self.position], self.value)
+
+    def __repr__(self) -> str:
+        return f"{self.field_name} {self.op} {self.value!r}"
+
+
+def _schema_field(schema: Schema, field_name: str) -> Field:
+    for f in schema.fields:
+        if f.name == field_name:
+            return f
+    raise KeyError(f"unknown field {field_name!r}")
+
+
+#оператори плану: кожен - ітератор кортежів значень у порядку полів своєї схеми,
+#рядки (Row) збираються лише на виході запиту
+
+
+class Scan:
+    #читає рядки таблиці; positions - лише ці рядки (з індексу), у порядку таблиці
+
+    def __init__(self, table: Table, positions: list[int] | None = None, access: str = "full scan") -> None:
+        self.table = table
+        self.schema = table.schema
+        self.positions = positions
+        self.access = access
+
+    def __iter__(self) -> Iterator[tuple]:
+        values_of = self.schema.row_values
+        if self.positions is None:
+            #видалені рядки пропускаються
+            for row in self.table.scan():
+                yield values_of(row)
+        else:
+            rows = self.table.rows
+            for i in self.positions:
+                yield values_of(rows[i])
+
+    def describe(self) -> str:
+        return f"{self.access} {self.table.name}"
+
+
+class Filter:
+    #пропускає лише кортежі, для яких виконуються всі умови
+
+    def __init__(self, source: Any, conditions: list[Condition]) -> None:
+        self.source = source
+        self.schema = source.schema
+        self.conditions = conditions
+
+    def __iter__(self) -> Iterator[tuple]:
+        conditions = self.conditions
+        if len(conditions) == 1:
+            test = conditions[0].test
+            return (vals for vals in self.source if test(vals))
+        return (vals for vals in self.source if all(c.test(vals) for c in conditions))
+
+    def describe(self) -> str:
+        return f"filter {' and '.join(map(repr, self.conditions))}"
+
+
+class Project:
+    #залишає лише вибрані поля (у заданому порядку)
+
+    def __init__(self, source: Any, field_names: list[str]) -> None:
+        self.source = source
+        src = source.schema
+        self.schema = Schema([_schema_field(src, name) for name in field_names])
+        self._positions = [src.field_index[name] for name in field_names]
+
+    def __iter__(self) -> Iterator[tuple]:
+        positions = self._positions
+        return (tuple([vals[p] for p in positions]) for vals in self.source)
+
+    def describe(self) -> str:
+        return f"project {', '.join(self.schema.field_names())}"
+
+
+class Limit:
+
+    def __init__(self, source: Any, count: int) -> None:
+        if count < 0:
+            raise ValueError("limit must be non-negative")
+        self.source = source
+        self.schema = source.schema
+        self.count = count
+
+    def __iter__(self) -> Iterator[tuple]:
+        return islice(self.source, self.count)
+
+    def describe(self) -> str:
+        return f"limit {self.count}"
+
+
+def _range_bounds(conditions: list[Condition]) -> tuple[Any, Any, tuple[bool, bool]]:
+    #найвужчі межі з умов <, <=, >, >=, = по одному полю
+    lo = hi = None
+    lo_inc = hi_inc = True
+    for c in conditions:
+        if c.op in (">", ">=", "="):
+            inc = c.op != ">"
+            if lo is None or c.value > lo or (c.value == lo and not inc):
+                lo, lo_inc = c.value, inc
+        if c.op in ("<", "<=", "="):
+            inc = c.op != "<"
+            if hi is None or c.value < hi or (c.value == hi and not inc):
+                hi, hi_inc = c.value, inc
+    return lo, hi, (lo_inc, hi_inc)
+
+
+class Query:
+    #запит до таблиці: scan -> filter -> project -> limit
+    #Query(t).where("id", ">=", 10).where("z", "=", "1+2i").select("id", "z").limit(5)
+    #умови поєднуються через "and"; якщо по полю умови є індекс, scan читає лише
+    #знайдені ним рядки (рівність - будь-який індекс, діапазон - sorted),
+    #порядок результату завжди як у таблиці
+
+    def __init__(self, table: Table) -> None:
+        self.table = table
+        self.conditions: list[Condition] = []
+        self.field_names: list[str] | None = None
+        self.limit_count: int | None = None
+
+    def where(self, field_name: str, op: str, value: Any) -> "Query":
+        self.conditions.append(Condition(self.table.schema, field_name, op, value))
+        return self
+
+    def select(self, *field_names: str) -> "Query":
+        for name in field_names:
+            _schema_field(self.table.schema, name)
+        self.field_names = list(field_names) or None
+        return self
+
+    def limit(self, count: int) -> "Query":
+        self.limit_count = count
+        return self
+
+    def _access(self) -> Scan:
+        #вибір способу читання рядків: індекс по одній з умов або повний перебір
+        table = self.table
+        index_for = getattr(table, "index_for", None)
+        if index_for is None:
+            #напр. CartesianView - індексів немає
+            return Scan(table)
+        for c in self.conditions:
+            if c.op == "=":
+                idx = index_for(c.field_name)
+                if idx is not None:
+                    return Scan(table, sorted(idx.find(c.value)), f"{idx.kind} index on {c.field_name}")
+        for c in self.conditions:
+            if c.op in _ORDERED_OPS:
+                idx = index_for(c.field_name, kind="sorted")
+                if idx is not None:
+                    same = [x for x in self.conditions if x.field_name == c.field_name and x.op != "!="]
+                    lo, hi, inclusive = _range_bounds(same)
+                    positions = sorted(idx.range(lo, hi, inclusive))
+                    return Scan(table, positions, f"sorted index range on {c.field_name}")
+        return Scan(table)
+
+    def plan(self) -> Any:
+        #дерево операторів; умови, використані індексом, все одно перевіряються фільтром
+        node: Any = self._access()
+        if self.conditions:
+            node = Filter(node, self.conditions)
+        if self.field_names is not None:
+            node = Project(node, self.field_names)
+        if self.limit_count is not None:
+            node = Limit(node, self.limit_count)
+        return node
+
+    def explain(self) -> list[str]:
+        #кроки плану від читання до результату
+        steps = []
+        node = self.plan()
+        while node is not None:
+            steps.append(node.describe())
+            node = getattr(node, "source", None)
+        return steps[::-1]
+
+    def __iter__(self) -> Iterator[Row]:
+        plan = self.plan()
+        build = plan.schema.row_builder()
+        return (build(vals) for vals in plan)
+
+    def rows(self) -> list[Row]:
+        return list(self)
+
+
+#розбір тексту запиту
+_SELECT_RE = re.compile(
+    r"^\s*select\s+(?P<fields>.+?)\s+from\s+(?P<table>\w+)"
+    r"(?:\s+where\s+(?P<where>.+?))?(?:\s+limit\s+(?P<limit>\d+))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_COND_RE = re.compile(
+    r"\s*(?P<field>\w+)\s*(?P<op><=|>=|!=|<>|=|<|>)\s*(?P<value>'[^']*'|\"[^\"]*\"|\S+)\s*"
+)
+_AND_RE = re.compile(r"and\s+", re.IGNORECASE)
+
+
+def _parse_where(text: str) -> list[tuple[str, str, str]]:
+    conditions = []
+    pos = 0
+    while True:
+        m = _COND_RE.match(text, pos)
+        if m is None:
+            raise ValueError(f"cannot parse condition at {text[pos:]!r}")
+        value = m.group("value")
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+            value = value[1:-1]
+        conditions.append((m.group("field"), m.group("op"), value))
+        pos = m.end()
+        if pos == len(text):
+            return conditions
+        m = _AND_RE.match(text, pos)
+        if m is None:
+            raise ValueError(f"expected 'and' at {text[pos:]!r}")
+        pos = m.end()
+
+
+def parse_query(text: str, db: "Database") -> Query:
+    #select * | поле, ... from таблиця [where умова [and умова ...]] [limit n]
+    #значення можна брати в лапки: name = 'a b'
+    m = _SELECT_RE.match(text)
+    if m is None:
+        raise ValueError("expected: select <fields> from <table> [where ...] [limit n]")
+    query = Query(db.get_table(m.group("table")))
+    if m.group("where"):
+        for field_name, op, value in _parse_where(m.group("where")):
+            query.where(field_name, op, value)
+    fields = m.group("fields").strip()
+    if fields != "*":
+        query.select(*[f.strip() for f in fields.split(",")])
+    if m.group("limit") is not None:
+        query.limit(int(m.group("limit")))
+    return query
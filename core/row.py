@@ -1,41 +1,81 @@
 # core/row.py
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Iterable
+
+
+#спільні індекси ім'я поля -> позиція
+#усі рядки з однаковим набором полів (тобто однієї схеми) ділять один словник
+_index_cache: Dict[tuple, Dict[str, int]] = {}
+
+
+def field_index(names: Iterable[str]) -> Dict[str, int]:
+    #повертає спільний (не копіювати і не змінювати!) індекс для цього порядку полів
+    key = tuple(names)
+    index = _index_cache.get(key)
+    if index is None:
+        index = {name: pos for pos, name in enumerate(key)}
+        _index_cache[key] = index
+    return index
 
 
 class Row:
     #один рядок таблиці
-    #зберігає значення як словник поле -> значення вже після валідації
+    #зберігає значення кортежем у порядку полів + спільний індекс ім'я -> позиція,
+    #тому на рядок не припадає власного словника
 
 
+    __slots__ = ("_index", "_values")
+
     def __init__(self, values: Dict[str, Any]) -> None:
         #тут припускаємо, що значення вже провалідовані схемою
-        self._values: Dict[str, Any] = dict(values)
+        self._index: Dict[str, int] = field_index(values)
+        self._values: tuple = tuple(values.values())
+
+    @classmethod
+    def from_values(cls, index: Dict[str, int], values: tuple) -> "Row":
+        #довірене створення без копіювання: values уже провалідовані і стоять
+        #у порядку index (зазвичай Schema.field_index)
+        row = cls.__new__(cls)
+        row._index = index
+        row._values = values
+        return row
 
     def get(self, field_name: str) -> Any:
         #повертає значення поля по імені
-        return self._values[field_name]
+        return self._values[self._index[field_name]]
 
     def set(self, field_name: str, value: Any) -> None:
-        #змінює значення поля
-        self._values[field_name] = value
+        #змінює значення поля (кортеж незмінний, тому збираємо новий)
+        pos = self._index.get(field_name)
+        if pos is None:
+            self._index = field_index((*self._index, field_name))
+            self._values = self._values + (value,)
+        else:
+            self._values = self._values[:pos] + (value,) + self._values[pos + 1:]
+
+    def values(self) -> tuple:
+        #значення позиційно, у порядку полів, без проміжного словника
+        return self._values
+
+    def field_names(self) -> list[str]:
+        return list(self._index)
 
     def as_dict(self) -> Dict[str, Any]:
         #повертає копію словника значень
-        return dict(self._values)
+        return dict(zip(self._index, self._values))
 
     def items(self):
         #ітерується по парах (ім'я поля, значення)
-        return self._values.items()
+        return zip(self._index, self._values)
 
     def __getitem__(self, key: str) -> Any:
         #дозволяє row["field"] синтаксис
-        return self._values[key]
+        return self._values[self._index[key]]
 
     def __setitem__(self, key: str, value: Any) -> None:
         #дозволяє row["field"] = value
-        self._values[key] = value
+        self.set(key, value)
 
     def __repr__(self) -> str:
-        return f"Row({self._values!r})"
+        return f"Row({self.as_dict()!r})"
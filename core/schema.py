@@ -1,9 +1,13 @@
 # core/schema.py
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable
+
+from time import perf_counter
 
 from .types_base import Type, global_type_registry
+from .row import Row, field_index
+from .stats import global_stats
 
 
 class Field:
@@ -48,6 +52,10 @@ class Schema:
             raise ValueError("duplicate field names in schema")
         self.fields = fields
         self._name_to_field = {f.name: f for f in fields}
+        #спільний для всіх рядків цієї схеми індекс ім'я -> позиція
+        self.field_index = field_index(names)
+        self._row_builder: Callable[[tuple], Row] | None = None
+        self._decoders: dict[bool, Callable[[dict[str, Any]], tuple]] = {}
 
     def field_names(self) -> list[str]:
         #повертає список назв полів
@@ -56,14 +64,75 @@ class Schema:
     def validate_row(self, row_data: dict[str, Any]) -> dict[str, Any]:
         #перевіряє та нормалізує значення рядка згідно схеми
         #повертає новий словник зі скоригованими значеннями
+        return dict(zip(self.field_index, self.validate_values(row_data)))
 
-        result = {}
+    def validate_values(self, row_data: dict[str, Any]) -> tuple:
+        #те саме що validate_row, але повертає кортеж значень у порядку полів
+        if global_stats.enabled:
+            return self._validate_values_timed(row_data)
+        result = []
         for field in self.fields:
             if field.name not in row_data:
                 raise ValueError(f"missing field {field.name!r} in row data")
             value = row_data[field.name]
-            result[field.name] = field.validate_value(value)
-        return result
+            result.append(field.validate_value(value))
+        return tuple(result)
+
+    def _validate_values_timed(self, row_data: dict[str, Any]) -> tuple:
+        #validate_values зі збором часу окремо по кожному типу (validate.<тип>)
+        add = global_stats.add
+        result = []
+        row_start = perf_counter()
+        for field in self.fields:
+            if field.name not in row_data:
+                raise ValueError(f"missing field {field.name!r} in row data")
+            start = perf_counter()
+            result.append(field.validate_value(row_data[field.name]))
+            add(f"validate.{field.type_name}", perf_counter() - start)
+        add("schema.validate_row", perf_counter() - row_start)
+        return tuple(result)
+
+    def make_row(self, row_data: dict[str, Any]) -> Row:
+        #валідує дані і створює рядок, що ділить індекс полів зі схемою
+        return Row.from_values(self.field_index, self.validate_values(row_data))
+
+    def row_values(self, row: Row) -> tuple:
+        #значення рядка кортежем у порядку полів схеми
+        #для рядків цієї схеми це просто їхній кортеж, без копіювання
+        if row._index is self.field_index:
+            return row.values()
+        return tuple(row.get(name) for name in self.field_index)
+
+    def row_builder(self) -> Callable[[tuple], Row]:
+        #повертає скомпільовану функцію values -> Row без валідації
+        #values - кортеж значень у порядку полів схеми, вже провалідованих їхніми типами
+        if self._row_builder is None:
+            index = self.field_index
+            from_values = Row.from_values
+
+            def build(values: tuple) -> Row:
+                return from_values(index, values)
+
+            self._row_builder = build
+        return self._row_builder
+
+    def compile_decoder(self, verify: bool = False) -> Callable[[dict[str, Any]], tuple]:
+        #повертає функцію, що перетворює рядок з нашого jsonl (результат serialize_row)
+        #одразу в кортеж внутрішніх значень; будується один раз на схему і режим
+        #verify=False - довірений режим для власних файлів, без повторної валідації
+        #verify=True - повний parse + validate для файлів, яким не довіряємо
+        decode = self._decoders.get(verify)
+        if decode is None:
+            parts = [(f.name, f.type_obj.decoder(trusted=not verify)) for f in self.fields]
+
+            def decode(raw: dict[str, Any]) -> tuple:
+                try:
+                    return tuple([dec(raw[name]) for name, dec in parts])
+                except (KeyError, TypeError) as exc:
+                    raise ValueError(f"cannot decode row {raw!r}: {exc}") from exc
+
+            self._decoders[verify] = decode
+        return decode
 
     def serialize_row(self, row_data: dict[str, Any]) -> dict[str, Any]:
         #перетворює значення рядка для збереження в json
@@ -72,6 +141,10 @@ class Schema:
             result[field.name] = field.serialize_value(row_data[field.name])
         return result
 
+    def serialize_values(self, values: tuple) -> dict[str, Any]:
+        #те саме що serialize_row, але з кортежу значень у порядку полів
+        return {f.name: f.serialize_value(v) for f, v in zip(self.fields, values)}
+
     def as_dict(self) -> dict[str, Any]:
         #повертає словник для збереження схеми
         return {"fields": [f.as_dict() for f in self.fields]}
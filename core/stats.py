@@ -0,0 +1,106 @@
+# core/stats.py
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Iterator
+
+
+class Stats:
+    #лічильники викликів і сумарний час операцій: ім'я -> [викликів, секунд]
+    #за замовчуванням вимкнено; вимкнений інструментований код робить лише
+    #одну перевірку прапорця enabled і нічого не міряє
+    #час сумарний і включний: save_all містить і час вкладених save_table
+
+    __slots__ = ("enabled", "_data")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._data: dict[str, list[float]] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        self._data = {}
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        entry = self._data.get(name)
+        if entry is None:
+            self._data[name] = [calls, seconds]
+        else:
+            entry[0] += calls
+            entry[1] += seconds
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        #with global_stats.timer("щось"): ... - міряє блок, якщо збір увімкнено
+        if not self.enabled:
+            yield
+            return
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        #копія даних: ім'я -> {"calls", "seconds", "avg_ms"}, за спаданням часу
+        result = {}
+        for name, (calls, seconds) in sorted(self._data.items(), key=lambda kv: -kv[1][1]):
+            result[name] = {
+                "calls": int(calls),
+                "seconds": round(seconds, 6),
+                "avg_ms": round(seconds / calls * 1000, 4) if calls else 0.0,
+            }
+        return result
+
+    def to_json(self) -> str:
+        return json.dumps({"enabled": self.enabled, "operations": self.snapshot()}, indent=2)
+
+    def dump(self, path: Any) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def __repr__(self) -> str:
+        return f"Stats(enabled={self.enabled}, operations={len(self._data)})"
+
+
+#глобальна статистика, яку пишуть усі інструментовані операції
+global_stats = Stats()
+
+
+def timed(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    #декоратор: рахує виклики і час функції під іменем name, якщо збір увімкнено
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not global_stats.enabled:
+                return fn(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                global_stats.add(name, perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def profile_call(fn: Callable[..., Any], *args: Any, sort: str = "cumulative", limit: int = 20, **kwargs: Any) -> tuple[Any, str]:
+    #виконує fn під cProfile; повертає (результат, текстовий звіт pstats з limit рядків)
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(fn, *args, **kwargs)
+    finally:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+        report = out.getvalue()
+    return result, report
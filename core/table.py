@@ -1,61 +1,626 @@
 # core/table.py
 from __future__ import annotations
 
-from typing import Any, List
+import sys
+from array import array
+from collections.abc import MutableSequence, Sequence
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List
 
-from .schema import Schema
+from .schema import Field, Schema
 from .row import Row
+from .columnar import ColumnarRows
+from .complex_columns import COMPLEX_TYPES, ComplexColumn
+from .index import INDEX_KINDS, SORTED_TYPES, HashIndex, SortedIndex
+from .memory import DEFAULT_SAMPLE, ROW_SIZE, tuple_size, value_sizes
+from .tombstones import Tombstones
+
+
+#доступні рушії зберігання рядків у пам'яті
+ENGINES = ("rows", "columnar")
+
+
+class InsertReport:
+    #результат пакетної вставки Table.insert_many
+
+    def __init__(self) -> None:
+        self.inserted: int = 0
+        #відхилені рядки: (індекс у пакеті, причина)
+        self.rejected: list[tuple[int, str]] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.rejected
+
+    def __repr__(self) -> str:
+        return f"InsertReport(inserted={self.inserted}, rejected={len(self.rejected)})"
+
+
+def _parse_column(type_obj: Any, raws: list[Any], positions: list[int], reasons: dict[int, str]) -> list[Any]:
+    #значення однієї колонки пакету: спершу пакетний parse_many, а якщо в колонці є
+    #невалідне значення - поштучно, щоб записати причину для кожного такого рядка
+    #(positions[k] - номер у пакеті k-го значення; перша причина рядка не перезаписується)
+    errors = (ValueError, TypeError, OverflowError) #OverflowError - напр. від типів ззовні
+    try:
+        values = type_obj.parse_many(raws)
+        if all(map(type_obj.validate, values)):
+            return values
+    except errors:
+        pass
+    values = [None] * len(raws)
+    for k, raw in enumerate(raws):
+        try:
+            values[k] = type_obj.parse_and_validate(raw)
+        except errors as exc:
+            reasons.setdefault(positions[k], str(exc))
+    return values
+
+
+class RowsView(Sequence):
+    #невидалені рядки таблиці як послідовність лише для читання, без копіювання
+    #перебір охоплює рядки, що були в таблиці на його початку: дописані під час
+    #перебору не потрапляють, а компактизація не ламає вже розпочатий перебір
+    #view[i] - i-й невидалений рядок за O(1): з видаленими рядками - через масив позицій
+    #невидалених рядків, який будується один раз після змін (Table.position)
+
+    __slots__ = ("_table", "_include_deleted")
+
+    def __init__(self, table: "Table", include_deleted: bool = False) -> None:
+        self._table = table
+        self._include_deleted = include_deleted
+
+    def _plain(self) -> bool:
+        #чи збігаються позиції у view з позиціями у сховищі
+        return self._include_deleted or not self._table._dead.count
+
+    def __len__(self) -> int:
+        if self._include_deleted:
+            return len(self._table.rows)
+        return self._table.row_count()
+
+    def __iter__(self) -> Iterator[Row]:
+        rows = self._table.rows
+        stop = len(rows)
+        if self._plain():
+            return islice(rows, stop)
+        dead = self._table._dead
+        return (row for i, row in zip(range(stop), rows) if i not in dead)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return list(islice(self, *index.indices(len(self))))
+        if self._plain():
+            return self._table.rows[index]
+        return self._table.rows[self._table.position(index)]
+
+    def __repr__(self) -> str:
+        return f"RowsView(table={self._table.name!r}, rows={len(self)})"
 
 
 class Table:
     #таблиця бази даних, що має схему та список рядків
+    #видалення логічні: рядок лишається у сховищі з позначкою в бітовій мапі,
+    #тож позиції (індекси рядків) не змінюються до компактизації
+    #два простори номерів рядків:
+    #- позиція - місце рядка у сховищі, разом з видаленими: її приймають update, delete,
+    #  row_at, is_deleted і видає live_items
+    #- номер у scan()/get_rows() - серед невидалених рядків; position(i) перетворює його на позицію
 
+    #частка видалених рядків, після якої Database.save_all компактизує таблицю
+    compact_threshold: float = 0.25
 
-    def __init__(self, name: str, schema: Schema) -> None:
+    def __init__(self, name: str, schema: Schema, engine: str = "rows") -> None:
+        #engine="rows" - список об'єктів Row
+        #engine="columnar" - по одній типізованій колонці на поле (менше пам'яті)
+        if engine not in ENGINES:
+            raise ValueError(f"unknown table engine {engine!r}, expected one of {ENGINES}")
         self.name = name
         self.schema = schema
-        self.rows: List[Row] = []
+        self.engine = engine
+        self._rows: List[Row] = self._empty_rows()
         self.is_dirty: bool = False #прапорець змін
         self.loaded: bool = True #позначає що таблиця існує в пам’яті
+        #для лінивих таблиць: функція, що дочитує рядки, і дешева кількість рядків
+        self._loader: Callable[["Table"], None] | None = None
+        self._known_count: int | None = None
+        #викликається після того, як лінива таблиця дочитала рядки (напр. кеш таблиць бази)
+        self.on_load: Callable[["Table"], None] | None = None
+        #скільки перших рядків уже лежить у файлі (None - таблицю ще не зберігали)
+        self.persisted_rows: int | None = None
+        #були update або компактизація, тому дописати нові рядки в кінець файлу недостатньо
+        self.needs_rewrite: bool = False
+        #позиції логічно видалених рядків
+        self._dead = Tombstones()
+        #позиції невидалених рядків для position(): ((видалених, фізичних рядків), масив)
+        self._live_cache: tuple[tuple[int, int], array] | None = None
+        #індекси по полях: ім'я поля -> індекс
+        self.indexes: dict[str, HashIndex | SortedIndex] = {}
+
+    def _empty_rows(self) -> List[Row]:
+        return ColumnarRows(self.schema) if self.engine == "columnar" else []
+
+    @property
+    def rows(self) -> List[Row]:
+        #рядки таблиці; для лінивої таблиці перше звернення дочитує їх з диску
+        if not self.loaded:
+            self._load_rows()
+        return self._rows
+
+    @rows.setter
+    def rows(self, value: List[Row]) -> None:
+        self._swap_rows(value)
+        self._dead = Tombstones()
+        self._reset_indexes()
+
+    def set_loader(self, loader: Callable[["Table"], None], row_count: int | None = None) -> None:
+        #робить таблицю лінивою: рядки будуть прочитані loader(table) при першому зверненні
+        #row_count - відома наперед кількість рядків (напр. зі службового файлу)
+        self._swap_rows(self._empty_rows())
+        self._loader = loader
+        self._known_count = row_count
+        self.loaded = False
+        self._dead = Tombstones()
+        self._reset_indexes()
+
+    def _load_rows(self) -> None:
+        loader = self._loader
+        #позначаємо завантаженою заздалегідь, бо loader сам додає рядки у table.rows
+        self.loaded = True
+        self._loader = None
+        try:
+            loader(self)
+        except BaseException:
+            self._rows = self._empty_rows()
+            self._dead = Tombstones()
+            self._loader = loader
+            self.loaded = False
+            raise
+        self._known_count = None
+        if self.on_load is not None:
+            self.on_load(self)
+
+    def _mutable_rows(self) -> List[Row]:
+        #рядки для зміни; рядки лише для читання (напр. відображені з бінарного файлу)
+        #при першій зміні копіюються у звичайне сховище рушія
+        rows = self.rows
+        if not isinstance(rows, MutableSequence):
+            copy = self._empty_rows()
+            copy.extend(rows)
+            self._swap_rows(copy)
+            rows = copy
+        return rows
+
+    def _swap_rows(self, rows: List[Row]) -> None:
+        #замінює сховище рядків; старе, що тримає ресурси (відображений файл),
+        #закривається, щойно таблиця його відпускає
+        old = self._rows
+        self._rows = rows
+        self._live_cache = None
+        close = getattr(old, "close", None)
+        if old is not rows and close is not None:
+            close()
 
     def insert(self, data: dict[str, Any]) -> Row:
         #додає новий рядок після перевірки
-        normalized = self.schema.validate_row(data)
-        row = Row(normalized)
-        self.rows.append(row)
+        row = self.schema.make_row(data)
+        rows = self._mutable_rows()
+        rows.append(row)
+        self._index_appended(len(rows) - 1)
         self.is_dirty = True
         return row
 
+    def insert_many(self, items: Iterable[dict[str, Any]], skip_invalid: bool = False) -> InsertReport:
+        #пакетна вставка з перевіркою
+        #skip_invalid=False - все або нічого: якщо хоч один рядок невалідний, нічого не вставляється
+        #skip_invalid=True - невалідні рядки пропускаються, решта вставляється
+        #у звіті - кількість вставлених рядків і причини відхилення по індексах пакету
+        #значення парсяться по колонках пакетним parse_many типу поля (для комплексних -
+        #parse_complex_strings), а не по одному в кожному рядку
+        report = InsertReport()
+        fields = self.schema.fields
+        build = self.schema.row_builder()
+        batch = items if isinstance(items, list) else list(items)
+
+        reasons: dict[int, str] = {}
+        complete: list[int] = [] #рядки пакету, у яких є всі поля
+        names = [f.name for f in fields]
+        required = set(names)
+        for i, data in enumerate(batch):
+            if required <= data.keys():
+                complete.append(i)
+            else:
+                missing = next(name for name in names if name not in data)
+                reasons[i] = f"missing field {missing!r} in row data"
+        columns = [
+            _parse_column(f.type_obj, [batch[i][f.name] for i in complete], complete, reasons)
+            for f in fields
+        ]
+
+        valid: list[tuple[int, Row]] = []
+        for k, i in enumerate(complete):
+            if i not in reasons:
+                valid.append((i, build(tuple([col[k] for col in columns]))))
+        report.rejected.extend(sorted(reasons.items()))
+
+        if report.rejected and not skip_invalid:
+            return report
+
+        rows = self._mutable_rows()
+        start = len(rows)
+        for i, row in valid:
+            try:
+                rows.append(row)
+            except ValueError as exc:
+                #значення пройшло тип, але не вміщується у сховище рушія (напр. int64)
+                report.rejected.append((i, str(exc)))
+                if not skip_invalid:
+                    while len(rows) > start:
+                        rows.pop()
+                    report.inserted = 0
+                    return report
+                continue
+            report.inserted += 1
+
+        report.rejected.sort()
+        if report.inserted:
+            self._index_appended(start)
+            self.is_dirty = True
+        return report
+
+    def extend_trusted(self, rows: Iterable[Row]) -> int:
+        #масове додавання вже провалідованих рядків (напр. похідних від інших таблиць)
+        #схема не перевіряється, тому викликати лише з рядками, що відповідають self.schema
+        target = self._mutable_rows()
+        before = len(target)
+        target.extend(rows)
+        added = len(target) - before
+        if added:
+            self._index_appended(before)
+            self.is_dirty = True
+        return added
+
     def update(self, index: int, new_data: dict[str, Any]) -> None:
         #змінює рядок за індексом
-        if not (0 <= index < len(self.rows)):
-            raise IndexError("row index out of range")
-        normalized = self.schema.validate_row(new_data)
-        self.rows[index] = Row(normalized)
+        self._check_live(index)
+        row = self.schema.make_row(new_data)
+        rows = self._mutable_rows()
+        old_values = self.schema.row_values(rows[index])
+        rows[index] = row
+        for idx in self._built_indexes():
+            idx.remove(old_values, index)
+            idx.add(self.schema.row_values(row), index)
         self.is_dirty = True
+        self.needs_rewrite = True
 
     def delete(self, index: int) -> None:
-        #видаляє рядок
+        #логічне видалення рядка за O(1): позначка в бітовій мапі, без зсуву інших рядків
+        self._check_live(index)
+        self._mark_deleted(index, self.rows[index])
+        self.is_dirty = True
+
+    def delete_where(self, predicate: Callable[[Row], bool]) -> int:
+        #видаляє всі живі рядки, для яких predicate(row) істинний; повертає їх кількість
+        #якщо після цього видалених більше за compact_threshold, таблиця одразу
+        #компактизується (позиції рядків змінюються), а не лише при збереженні
+        victims = [(i, row) for i, row in self.live_items() if predicate(row)]
+        if not victims:
+            return 0
+        if len(victims) > len(self.rows) // 16:
+            #масове видалення: дешевше перебудувати індекси при наступному пошуку
+            self._reset_indexes()
+        for i, row in victims:
+            self._mark_deleted(i, row)
+        self.is_dirty = True
+        if self.needs_compaction():
+            self.compact()
+        return len(victims)
+
+    def _check_live(self, index: int) -> None:
         if not (0 <= index < len(self.rows)):
             raise IndexError("row index out of range")
-        self.rows.pop(index)
+        if index in self._dead:
+            raise IndexError(f"row {index} was deleted")
+
+    def _mark_deleted(self, index: int, row: Row) -> None:
+        self._dead.mark(index)
+        built = self._built_indexes()
+        if built:
+            values = self.schema.row_values(row)
+            for idx in built:
+                idx.remove(values, index)
+
+    def is_deleted(self, index: int) -> bool:
+        return index in self._dead
+
+    def row_at(self, position: int) -> Row:
+        #рядок за позицією у сховищі (як для update/delete); видалений - IndexError
+        self._check_live(position)
+        return self.rows[position]
+
+    def position(self, index: int) -> int:
+        #позиція у сховищі index-го невидаленого рядка (scan()[index], get_rows()[index]),
+        #напр. table.delete(table.position(1)) видаляє другий видимий рядок
+        rows = self.rows
+        if not self._dead.count:
+            if index < 0:
+                index += len(rows)
+            if not (0 <= index < len(rows)):
+                raise IndexError("row index out of range")
+            return index
+        key = (self._dead.count, len(rows))
+        cache = self._live_cache
+        if cache is None or cache[0] != key:
+            dead = self._dead
+            cache = self._live_cache = (key, array("q", (i for i in range(len(rows)) if i not in dead)))
+        return cache[1][index]
+
+    def deleted_positions(self) -> list[int]:
+        #позиції видалених рядків (для збереження на диск)
+        return list(self._dead)
+
+    def restore_deleted(self, positions: Iterable[int]) -> None:
+        #відновлює позначки видалення, прочитані з диску разом з рядками
+        self._dead = Tombstones.from_positions(positions)
+        self._live_cache = None
+        self._reset_indexes()
+
+    def dead_count(self) -> int:
+        return self._dead.count
+
+    def dead_ratio(self) -> float:
+        #частка видалених рядків серед усіх фізичних
+        total = len(self._rows) if self.loaded else 0
+        return self._dead.count / total if total else 0.0
+
+    def needs_compaction(self) -> bool:
+        return self._dead.count > 0 and self.dead_ratio() > self.compact_threshold
+
+    def compact(self) -> int:
+        #фізично прибирає видалені рядки, повертає скільки прибрано
+        #позиції рядків після цього змінюються, індекси перебудовуються при наступному пошуку,
+        #файл таблиці при наступному збереженні переписується повністю
+        removed = self._dead.count
+        if not removed:
+            if self.loaded and isinstance(self._rows, ColumnarRows):
+                #рядки на місці, але буфери рядкових колонок ще тримають байти старих значень
+                self._rows.compact()
+            return 0
+        live = self._empty_rows()
+        live.extend(self.scan())
+        self._swap_rows(live)
+        self._dead = Tombstones()
+        self._reset_indexes()
+        self.is_dirty = True
+        self.needs_rewrite = True
+        return removed
+
+    def live_items(self) -> Iterator[tuple[int, Row]]:
+        #пари (позиція, рядок) лише для невидалених рядків, без копіювання
+        rows = self.rows
+        dead = self._dead
+        if not dead.count:
+            return enumerate(rows)
+        return ((i, row) for i, row in enumerate(rows) if i not in dead)
+
+    def scan(self, include_deleted: bool = False) -> "RowsView":
+        #перегляд рядків лише для читання, без копіювання (на відміну від get_rows)
+        #include_deleted=True - усі фізичні рядки, як вони лежать у файлі
+        return RowsView(self, include_deleted)
+
+    def create_index(self, field_name: str, kind: str = "hash") -> HashIndex | SortedIndex:
+        #створює індекс по полю (за замовчуванням індексів немає):
+        #kind="hash" - пошук рівності за O(1), для полів будь-якого типу
+        #kind="sorted" - ще й діапазони, min/max і перебір у порядку значень
+        #(лише для типів з порядком: integer, real, char, string)
+        #для завантаженої таблиці індекс будується одразу, для лінивої - при першому пошуку
+        if field_name not in self.schema.field_index:
+            raise KeyError(f"unknown field {field_name!r}")
+        if kind not in INDEX_KINDS:
+            raise ValueError(f"unknown index kind {kind!r}, expected one of {tuple(INDEX_KINDS)}")
+        if field_name in self.indexes:
+            raise ValueError(f"index on field {field_name!r} already exists")
+        if kind == "sorted":
+            type_name = self._field(field_name).type_name
+            if type_name not in SORTED_TYPES:
+                raise TypeError(f"field {field_name!r} has type {type_name}, which has no ordering")
+        idx = INDEX_KINDS[kind](field_name, self.schema.field_index[field_name])
+        self.indexes[field_name] = idx
+        if self.loaded:
+            self._build_index(idx)
+        #перелік індексів зберігається разом з таблицею
         self.is_dirty = True
+        return idx
+
+    def drop_index(self, field_name: str) -> None:
+        if field_name not in self.indexes:
+            raise KeyError(f"no index on field {field_name!r}")
+        del self.indexes[field_name]
+        self.is_dirty = True
+
+    def index_for(self, field_name: str, kind: str | None = None) -> HashIndex | SortedIndex | None:
+        #побудований індекс по полю для операторів (запити, з'єднання) або None
+        #kind="sorted" - лише впорядкований індекс
+        idx = self.indexes.get(field_name)
+        if idx is None or (kind is not None and idx.kind != kind):
+            return None
+        if not idx.built:
+            self._build_index(idx)
+        return idx
+
+    def lookup(self, field_name: str, value: Any) -> list[Row]:
+        #рядки, у яких поле дорівнює value
+        #value спершу парситься типом поля, тож "1+2i" знайде (1, 2) у complexInteger;
+        #без індексу по полю - повний перебір
+        value = self._field(field_name).validate_value(value)
+        idx = self.index_for(field_name)
+        if idx is None:
+            return [r for r in self.scan() if r.get(field_name) == value]
+        rows = self.rows
+        return [rows[i] for i in idx.find(value)]
+
+    def range(
+        self,
+        field_name: str,
+        lo: Any = None,
+        hi: Any = None,
+        inclusive: bool | tuple[bool, bool] = True,
+    ) -> list[Row]:
+        #рядки з lo <= поле <= hi у порядку значень поля (None - без межі)
+        #inclusive=False виключає обидві межі, (True, False) - лише верхню
+        #межі парсяться типом поля; без sorted-індексу - перебір і сортування
+        field = self._field(field_name)
+        lo = None if lo is None else field.validate_value(lo)
+        hi = None if hi is None else field.validate_value(hi)
+        idx = self.index_for(field_name, kind="sorted")
+        if idx is not None:
+            rows = self.rows
+            return [rows[i] for i in idx.range(lo, hi, inclusive)]
+        if isinstance(inclusive, bool):
+            inclusive = (inclusive, inclusive)
+        pos = self.schema.field_index[field_name]
+        values_of = self.schema.row_values
+        found = []
+        for i, row in self.live_items():
+            v = values_of(row)[pos]
+            if lo is not None and (v < lo or (v == lo and not inclusive[0])):
+                continue
+            if hi is not None and (v > hi or (v == hi and not inclusive[1])):
+                continue
+            found.append((v, i, row))
+        found.sort(key=lambda item: item[:2])
+        return [row for _, _, row in found]
+
+    def min_value(self, field_name: str) -> Any:
+        #найменше значення поля (None для порожньої таблиці)
+        idx = self.index_for(field_name, kind="sorted")
+        if idx is not None:
+            return idx.min()
+        return min(self.column(field_name), default=None)
+
+    def max_value(self, field_name: str) -> Any:
+        idx = self.index_for(field_name, kind="sorted")
+        if idx is not None:
+            return idx.max()
+        return max(self.column(field_name), default=None)
+
+    def ordered(self, field_name: str, reverse: bool = False) -> Iterator[Row]:
+        #перебір рядків у порядку значень поля; потрібен sorted-індекс
+        idx = self.index_for(field_name, kind="sorted")
+        if idx is None:
+            raise KeyError(f"no sorted index on field {field_name!r}")
+        rows = self.rows
+        return (rows[i] for i in idx.ordered_positions(reverse))
+
+    def _field(self, field_name: str) -> Field:
+        for f in self.schema.fields:
+            if f.name == field_name:
+                return f
+        raise KeyError(f"unknown field {field_name!r}")
+
+    def _build_index(self, idx: HashIndex | SortedIndex) -> None:
+        values_of = self.schema.row_values
+        idx.build((i, values_of(r)) for i, r in self.live_items())
+
+    def _built_indexes(self) -> list[HashIndex | SortedIndex]:
+        #лише побудовані індекси треба підтримувати при змінах
+        return [idx for idx in self.indexes.values() if idx.built]
+
+    def _reset_indexes(self) -> None:
+        for idx in self.indexes.values():
+            idx.reset()
+
+    def _index_appended(self, start: int) -> None:
+        #додає в індекси рядки, дописані в кінець з позиції start
+        indexes = self._built_indexes()
+        if not indexes:
+            return
+        rows = self._rows
+        values_of = self.schema.row_values
+        for i in range(start, len(rows)):
+            values = values_of(rows[i])
+            for idx in indexes:
+                idx.add(values, i)
 
     def get_rows(self) -> list[Row]:
-        #повертає список усіх рядків
-        return list(self.rows)
+        #повертає копію списку усіх (невидалених) рядків
+        #для перебору без копіювання - scan()
+        return list(self.scan())
+
+    def known_row_count(self) -> int | None:
+        #кількість рядків без читання файлу; None - лінива таблиця без службового файлу
+        if not self.loaded and self._known_count is None:
+            return None
+        return self.row_count()
 
     def row_count(self) -> int:
-        #кількість рядків
-        return len(self.rows)
+        #кількість рядків (для лінивої таблиці - без читання рядків, якщо вона відома)
+        if not self.loaded and self._known_count is not None:
+            return self._known_count
+        return len(self.rows) - self._dead.count
+
+    def column(self, field_name: str) -> Any:
+        #значення одного поля по всіх рядках
+        #для колонкового рушія integer/real повертається сам масив без копіювання
+        #(якщо в таблиці немає видалених рядків)
+        if field_name not in self.schema.field_names():
+            raise KeyError(f"unknown field {field_name!r}")
+        if isinstance(self.rows, ColumnarRows) and not self._dead.count:
+            return self.rows.column(field_name)
+        return [r.get(field_name) for r in self.scan()]
+
+    def complex_column(self, field_name: str, use_numpy: bool | None = None) -> ComplexColumn:
+        #комплексна колонка з векторними операціями (add, multiply, abs, conj, sum, mean)
+        #use_numpy=None - numpy, якщо встановлений, інакше чистий python
+        type_name = self._field(field_name).type_name
+        if type_name not in COMPLEX_TYPES:
+            raise TypeError(f"field {field_name!r} has type {type_name}, expected complex")
+        integer = type_name == "complexInteger"
+        if isinstance(self.rows, ColumnarRows) and not self._dead.count:
+            #колонковий рушій уже тримає частини в суцільних масивах
+            re, im = self.rows.pair_arrays(field_name)
+            return ComplexColumn(re, im, integer, use_numpy)
+        return ComplexColumn.from_pairs(self.column(field_name), integer, use_numpy)
+
+    def memory_usage(self, sample: int | None = DEFAULT_SAMPLE) -> dict[str, Any]:
+        #оцінка оперативної пам'яті таблиці в байтах:
+        #columns - значення кожного поля (для рушія rows - глибоко: пари комплексних,
+        #рядки, числа як об'єкти), overhead - список рядків, об'єкти Row, кортежі значень
+        #і бітова мапа видалених, indexes - побудовані індекси, total - усе разом
+        #sample - скільки рядків рахувати поштучно (решта екстраполюється), None - усі
+        #незавантажена лінива таблиця і рядки з mmap (бінарний формат) купу не займають
+        names = self.schema.field_names()
+        usage: dict[str, Any] = {"columns": dict.fromkeys(names, 0), "overhead": 0, "indexes": 0, "total": 0}
+        if not self.loaded:
+            return usage
+        rows = self._rows
+        if isinstance(rows, ColumnarRows):
+            usage["columns"] = rows.memory_usage(sample)
+            usage["overhead"] = sys.getsizeof(rows)
+        elif isinstance(rows, list):
+            count = len(rows)
+            sizes, _ = value_sizes(rows, self.schema.row_values, len(names), sample)
+            usage["columns"] = {name: round(size * count) for name, size in zip(names, sizes)}
+            usage["overhead"] = sys.getsizeof(rows) + count * (ROW_SIZE + tuple_size(len(names)))
+        usage["overhead"] += sys.getsizeof(self._dead._bits)
+        if self._live_cache is not None:
+            usage["overhead"] += sys.getsizeof(self._live_cache[1])
+        usage["indexes"] = sum(idx.memory_usage() for idx in self.indexes.values())
+        usage["total"] = usage["overhead"] + usage["indexes"] + sum(usage["columns"].values())
+        return usage
 
     def as_serializable(self) -> list[dict[str, Any]]:
         #повертає серіалізований список рядків для json
-        return [self.schema.serialize_row(r.as_dict()) for r in self.rows]
+        schema = self.schema
+        return [schema.serialize_values(schema.row_values(r)) for r in self.scan()]
 
     def mark_saved(self) -> None:
-        #скидає прапорець змін після збереження
+        #скидає прапорець змін після збереження і зсуває водяний знак збережених рядків
         self.is_dirty = False
+        self.needs_rewrite = False
+        self.persisted_rows = len(self.rows)
 
     def __repr__(self) -> str:
-        return f"Table(name={self.name!r}, rows={len(self.rows)})"
+        #repr не повинен дочитувати ліниву таблицю
+        rows = self.known_row_count()
+        rows = "?" if rows is None else rows
+        return f"Table(name={self.name!r}, rows={rows})"
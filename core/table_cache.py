@@ -0,0 +1,145 @@
+# core/table_cache.py
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable
+
+from .memory import DEFAULT_SAMPLE
+from .table import Table
+
+
+class TableCache:
+    #кеш таблиць бази в пам'яті з витісненням LRU: у пам'яті лишається не більше
+    #max_bytes байтів (за оцінкою Table.memory_usage) і/або max_tables таблиць
+    #витісняється таблиця, до якої найдовше не зверталися: змінену спершу зберігають,
+    #потім unload(table) звільняє її рядки, і таблиця стає лінивою - наступне
+    #звернення дочитає її з файлів
+    #у пам'яті рахуються лише завантажені таблиці; ліниві місця не займають, а коли
+    #вони справді дочитуються (Table.on_load), ліміт перевіряється знову
+
+    def __init__(
+        self,
+        tables: dict[str, Table],
+        unload: Callable[[Table], None],
+        max_bytes: int | None = None,
+        max_tables: int | None = None,
+        sample: int | None = DEFAULT_SAMPLE,
+    ) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        if max_tables is not None and max_tables <= 0:
+            raise ValueError(f"max_tables must be positive, got {max_tables}")
+        self.tables = tables #таблиці бази: ім'я -> Table
+        self.unload = unload #зберігає змінену таблицю і звільняє її рядки
+        self.max_bytes = max_bytes
+        self.max_tables = max_tables
+        self.sample = sample
+        #імена в порядку звернень: перше - найдавніше
+        self._order: OrderedDict[str, None] = OrderedDict()
+        #оцінка пам'яті таблиці: ім'я -> (кількість рядків, байти); перераховується,
+        #коли змінилась кількість рядків
+        self._sizes: dict[str, tuple[int, int]] = {}
+        self.hits = 0
+        self.misses = 0 #звернення до незавантаженої таблиці (її доведеться читати з диску)
+        self.evictions = 0
+        self.flushes = 0 #скільки витіснених таблиць довелось спершу зберегти
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes is not None or self.max_tables is not None
+
+    def touch(self, name: str) -> None:
+        #звернення до таблиці name: влучання, якщо вона вже в пам'яті, інакше промах
+        #рядки тут не читаються - лише коли до них справді звернуться
+        table = self.tables[name]
+        if table.loaded:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.watch(table)
+        self._order[name] = None
+        self._order.move_to_end(name)
+        if self.enabled:
+            self.enforce(keep=name)
+
+    def watch(self, table: Table) -> None:
+        #перевіряти ліміт, коли лінива таблиця дочитає рядки
+        if self.enabled and not table.loaded:
+            table.on_load = self._loaded
+
+    def _loaded(self, table: Table) -> None:
+        table.on_load = None
+        if self.tables.get(table.name) is not table:
+            return
+        self._order[table.name] = None
+        self._order.move_to_end(table.name)
+        self.enforce(keep=table.name)
+
+    def forget(self, name: str) -> None:
+        self._order.pop(name, None)
+        self._sizes.pop(name, None)
+
+    def table_bytes(self, table: Table) -> int:
+        count = table.row_count()
+        cached = self._sizes.get(table.name)
+        if cached is not None and cached[0] == count:
+            return cached[1]
+        size = table.memory_usage(self.sample)["total"]
+        self._sizes[table.name] = (count, size)
+        return size
+
+    def resident(self) -> list[str]:
+        #імена завантажених таблиць від найдавнішої до останньої; таблиці, до яких
+        #ще не зверталися через кеш (створені чи завантажені одразу), - найдавніші
+        loaded = [n for n, t in self.tables.items() if t.loaded]
+        untouched = [n for n in loaded if n not in self._order]
+        touched = set(loaded)
+        return untouched + [n for n in self._order if n in touched]
+
+    def enforce(self, keep: str | None = None) -> list[str]:
+        #витісняє найдавніші таблиці, поки не вміститься в ліміти; keep не витісняється
+        #(остання таблиця може й сама не вміщатися в max_bytes - тоді лишається лише вона)
+        #повертає імена витіснених
+        names = self.resident()
+        sizes = {n: self.table_bytes(self.tables[n]) for n in names} if self.max_bytes is not None else {}
+        total = sum(sizes.values())
+        evicted = []
+        for name in names:
+            over_tables = self.max_tables is not None and len(names) - len(evicted) > self.max_tables
+            over_bytes = self.max_bytes is not None and total > self.max_bytes
+            if not (over_tables or over_bytes):
+                break
+            if name == keep:
+                continue
+            table = self.tables[name]
+            if table.is_dirty or table.persisted_rows is None:
+                self.flushes += 1
+            self.unload(table)
+            self.watch(table)
+            self.evictions += 1
+            total -= sizes.get(name, 0)
+            self._sizes.pop(name, None)
+            evicted.append(name)
+        return evicted
+
+    def stats(self) -> dict[str, Any]:
+        #лічильники кешу і скільки таблиць та байтів зараз у пам'яті
+        names = self.resident()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "flushes": self.flushes,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "resident_tables": len(names),
+            "resident_bytes": sum(self.table_bytes(self.tables[n]) for n in names),
+            "max_bytes": self.max_bytes,
+            "max_tables": self.max_tables,
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = self.flushes = 0
+
+    def __repr__(self) -> str:
+        return f"TableCache(max_bytes={self.max_bytes}, max_tables={self.max_tables}, hits={self.hits}, misses={self.misses})"
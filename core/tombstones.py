@@ -0,0 +1,57 @@
+# core/tombstones.py
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+
+class Tombstones:
+    #бітова мапа видалених рядків: біт i = рядок на позиції i видалений
+    #рядок фізично лишається у сховищі до компактизації, тому позиції інших рядків не зсуваються
+
+    __slots__ = ("_bits", "count")
+
+    def __init__(self) -> None:
+        self._bits = bytearray()
+        self.count = 0
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[int]) -> "Tombstones":
+        dead = cls()
+        for pos in positions:
+            dead.mark(pos)
+        return dead
+
+    def mark(self, pos: int) -> bool:
+        #позначає рядок видаленим; False - якщо він уже був видалений
+        byte, bit = pos >> 3, 1 << (pos & 7)
+        bits = self._bits
+        if byte >= len(bits):
+            bits.extend(bytes(byte + 1 - len(bits)))
+        if bits[byte] & bit:
+            return False
+        bits[byte] |= bit
+        self.count += 1
+        return True
+
+    def __contains__(self, pos: int) -> bool:
+        byte = pos >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << (pos & 7)))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[int]:
+        #позиції видалених рядків за зростанням
+        for byte, value in enumerate(self._bits):
+            if value:
+                base = byte << 3
+                for bit in range(8):
+                    if value & (1 << bit):
+                        yield base + bit
+
+    def clear(self) -> None:
+        self._bits = bytearray()
+        self.count = 0
+
+    def __repr__(self) -> str:
+        return f"Tombstones(count={self.count})"
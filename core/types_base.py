@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable, Iterable
 
 
 class Type(ABC):
@@ -43,6 +43,19 @@ class Type(ABC):
             raise ValueError(f"value {value!r} is not valid for type {self.name}")
         return value
 
+    def parse_many(self, raws: Iterable[Any]) -> list[Any]:
+#пакетний parse: значення в тому ж порядку (Table.insert_many парсить ним колонки)
+#типи можуть перевизначити його швидшим; кидає ValueError, як і parse
+
+        return [self.parse(raw) for raw in raws]
+
+    def decoder(self, trusted: bool = False) -> Callable[[Any], Any]:
+#повертає функцію, що перетворює значення з нашого ж json (результат serialize)
+#у внутрішнє представлення; trusted=True дозволяє пропустити повторну валідацію
+#за замовчуванням - повний parse + validate
+
+        return self.parse_and_validate
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name={self.name!r})"
 
@@ -1,56 +1,101 @@
 # core/types_complex.py
 from __future__ import annotations
 
-from typing import Any, Tuple
+from typing import Any, Callable, Iterable, Tuple
 
 from .types_base import Type, global_type_registry
 
 
 def _parse_complex_string(raw: str) -> Tuple[float, float]:
     #допоміжна функція для парсингу рядка формату "a+bi" або "a-bi"
-    #a і b можуть бути з крапкою, пробіли допускаються
+    #a і b можуть бути з крапкою або комою, пробіли допускаються
+    #усі перетворення рядка - вбудовані методи str, без посимвольного циклу в python
 
-    s = raw.strip().lower().replace(" ", "")
+    s = raw.strip().lower().replace(" ", "").replace(",", ".")
     if not s:
         raise ValueError("empty complex string")
 
-    # якщо немає символу 'i', пробуємо інтерпретувати як дійсну частину, уявна = 0
-    if "i" not in s:
-        try:
-            re = float(s.replace(",", "."))
-            return re, 0.0
-        except Exception as exc:
-            raise ValueError(f"cannot parse {raw!r} as complex") from exc
-
-    # прибираємо 'i' у кінці, очікуємо щось типу "a+ b" або "a-b"
-    if not s.endswith("i"):
+    has_i = "i" in s
+    if has_i and s[-1] != "i":
         raise ValueError(f"invalid complex format {raw!r}, expected ...i at the end")
-    core = s[:-1]
 
-    # шукаємо останній плюс або мінус не на першій позиції
-    split_pos = -1
-    for i in range(len(core) - 1, 0, -1):
-        if core[i] in "+-":
-            split_pos = i
-            break
+    try:
+        # якщо немає символу 'i' - це лише дійсна частина, уявна = 0
+        if not has_i:
+            return float(s), 0.0
+
+        core = s[:-1]
+
+        # останній плюс або мінус не на першій позиції ділить частини
+        split_pos = max(core.rfind("+"), core.rfind("-"))
+        if split_pos <= 0:
+            # щось типу "3i"
+            return 0.0, float(core)
+
+        im_str = core[split_pos:]
+        if len(im_str) == 1:
+            # "a+i" / "a-i"
+            return float(core[:split_pos]), (1.0 if im_str == "+" else -1.0)
+        return float(core[:split_pos]), float(im_str)
+    except ValueError as exc:
+        raise ValueError(f"cannot parse {raw!r} as complex") from exc
+
+
+#скільки перших рядків пакету перевіряти на повтори і скільки різних рядків пам'ятати
+_MEMO_PROBE = 256
+_MEMO_LIMIT = 4096
+
 
-    if split_pos == -1:
-        # щось типу "3i"
+def parse_complex_strings(raws: Iterable[Any]) -> list[Tuple[float, float]]:
+    #пакетний парсинг рядків з комплексними числами
+    #якщо на початку пакету рядки повторюються (колонка з малою кількістю різних
+    #значень), однакові рядки розбираються один раз (пам'ятаємо до _MEMO_LIMIT різних);
+    #на різних значеннях кеш лише сповільнює, тож тоді - простий прохід
+    #кидає ValueError з номером першого елемента, який не вдалося розібрати
+    parse = _parse_complex_string
+    items = [raw if isinstance(raw, str) else str(raw) for raw in raws]
+    probe = items[:_MEMO_PROBE]
+    if len(set(probe)) == len(probe):
         try:
-            im = float(core.replace(",", "."))
-            return 0.0, im
-        except Exception as exc:
-            raise ValueError(f"cannot parse {raw!r} as complex") from exc
+            return list(map(parse, items))
+        except ValueError:
+            pass #нижче поштучно - щоб знайти номер невдалого елемента
+    cache: dict[str, Tuple[float, float]] = {}
+    result: list[Tuple[float, float]] = []
+    append = result.append
+    for i, raw in enumerate(items):
+        value = cache.get(raw)
+        if value is None:
+            try:
+                value = parse(raw)
+            except ValueError as exc:
+                raise ValueError(f"item {i}: {exc}") from exc
+            if len(cache) < _MEMO_LIMIT:
+                cache[raw] = value
+        append(value)
+    return result
+
+
+def _to_float(x: Any) -> float:
+    #число з кортежу/списку/словника в float без обходу через str
+    tp = type(x)
+    if tp is float:
+        return x
+    if tp is int:
+        try:
+            return float(x)
+        except OverflowError:
+            pass
+    #рядки, bool, дуже великі int і т.п. - як раніше
+    return float(str(x).replace(",", "."))
 
-    re_str = core[:split_pos]
-    im_str = core[split_pos:]
 
-    try:
-        re = float(re_str.replace(",", ".")) if re_str else 0.0
-        im = float(im_str.replace(",", ".")) if im_str not in ("+", "-") else float(im_str + "1")
-        return re, im
-    except Exception as exc:
-        raise ValueError(f"cannot parse {raw!r} as complex") from exc
+def _decode_integer_pair(raw: dict[str, Any]) -> Tuple[int, int]:
+    return raw["real"], raw["imag"]
+
+
+def _decode_real_pair(raw: dict[str, Any]) -> Tuple[float, float]:
+    return float(raw["real"]), float(raw["imag"])
 
 
 class ComplexIntegerType(Type):
@@ -79,8 +124,12 @@ class ComplexIntegerType(Type):
             re, im = raw["real"], raw["imag"]
         else:
             # пробуємо парсити рядок
-            re_f, im_f = _parse_complex_string(str(raw))
-            re, im = int(round(re_f)), int(round(im_f))
+            re, im = _parse_complex_string(str(raw))
+            #"1e400i" розбирається в inf, яке не округлюється до цілого
+            try:
+                re, im = int(round(re)), int(round(im))
+            except OverflowError as exc:
+                raise ValueError(f"cannot parse {raw!r} as complexInteger: value is too large") from exc
 
         try:
             re_i = int(re)
@@ -90,6 +139,17 @@ class ComplexIntegerType(Type):
 
         return re_i, im_i
 
+    def parse_many(self, raws: Iterable[Any]) -> list[tuple[int, int]]:
+        #пакетний parse; рядки розбираються через parse_complex_strings
+        items = list(raws)
+        if all(isinstance(r, str) for r in items):
+            try:
+                return [(int(round(re)), int(round(im))) for re, im in parse_complex_strings(items)]
+            except OverflowError:
+                #inf не округлюється до цілого - поштучний parse дасть ValueError
+                pass
+        return [self.parse(r) for r in items]
+
     def validate(self, value: Any) -> bool:
         # перевіряємо що це кортеж з двох цілих
         if not (isinstance(value, tuple) and len(value) == 2):
@@ -104,6 +164,12 @@ class ComplexIntegerType(Type):
         re, im = value
         return {"real": int(re), "imag": int(im)}
 
+    def decoder(self, trusted: bool = False) -> Callable[[Any], tuple[int, int]]:
+        # serialize пише {"real": a, "imag": b} з цілими, тож просто збираємо кортеж
+        if trusted:
+            return _decode_integer_pair
+        return self.parse_and_validate
+
 
 class ComplexRealType(Type):
     #тип для комплексних чисел з дійсними частинами (a, b), де a, b ∈ R
@@ -128,13 +194,20 @@ class ComplexRealType(Type):
             re, im = _parse_complex_string(str(raw))
 
         try:
-            re_f = float(str(re).replace(",", "."))
-            im_f = float(str(im).replace(",", "."))
+            re_f = _to_float(re)
+            im_f = _to_float(im)
         except Exception as exc:
             raise ValueError(f"cannot parse {raw!r} as complexReal") from exc
 
         return re_f, im_f
 
+    def parse_many(self, raws: Iterable[Any]) -> list[tuple[float, float]]:
+        #пакетний parse; рядки розбираються через parse_complex_strings
+        items = list(raws)
+        if all(isinstance(r, str) for r in items):
+            return parse_complex_strings(items)
+        return [self.parse(r) for r in items]
+
     def validate(self, value: Any) -> bool:
         #перевіряємо що це кортеж з двох чисел (int або float)
         if not (isinstance(value, tuple) and len(value) == 2):
@@ -149,6 +222,12 @@ class ComplexRealType(Type):
         re, im = value
         return {"real": float(re), "imag": float(im)}
 
+    def decoder(self, trusted: bool = False) -> Callable[[Any], tuple[float, float]]:
+        # без str(...).replace(...) - у json числа вже з крапкою
+        if trusted:
+            return _decode_real_pair
+        return self.parse_and_validate
+
 
 def register_complex_types() -> None:
 
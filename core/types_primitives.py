@@ -1,11 +1,16 @@
 # core/types_primitives.py
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Callable
 
 from .types_base import Type, global_type_registry
 
 
+def _identity(value: Any) -> Any:
+    # довірений декодер: значення з json уже має потрібний тип
+    return value
+
+
 class IntegerType(Type):
     """
     тип для цілих чисел
@@ -38,6 +43,12 @@ class IntegerType(Type):
             raise ValueError(f"value {value!r} is not valid integer")
         return int(value)
 
+    def decoder(self, trusted: bool = False) -> Callable[[Any], int]:
+        # json.loads уже повертає int для значень, збережених через serialize
+        if trusted:
+            return _identity
+        return self.parse_and_validate
+
 
 class RealType(Type):
     """
@@ -68,6 +79,12 @@ class RealType(Type):
             raise ValueError(f"value {value!r} is not valid real")
         return float(value)
 
+    def decoder(self, trusted: bool = False) -> Callable[[Any], float]:
+        # float() лишаємо, бо json може повернути int для цілого значення
+        if trusted:
+            return float
+        return self.parse_and_validate
+
 
 class CharType(Type):
     """
@@ -96,6 +113,11 @@ class CharType(Type):
             raise ValueError(f"value {value!r} is not valid char")
         return value
 
+    def decoder(self, trusted: bool = False) -> Callable[[Any], str]:
+        if trusted:
+            return _identity
+        return self.parse_and_validate
+
 
 class StringType(Type):
     """
@@ -121,6 +143,11 @@ class StringType(Type):
             raise ValueError(f"value {value!r} is not valid string")
         return value
 
+    def decoder(self, trusted: bool = False) -> Callable[[Any], str]:
+        if trusted:
+            return _identity
+        return self.parse_and_validate
+
 
 def register_builtin_types() -> None:
     """
@@ -2,12 +2,32 @@
 from __future__ import annotations
 
 import sys
+import time
+import warnings
 from pathlib import Path
 
 from core.schema import Field, Schema
 from core.table import Table
 from core.database import Database
-from core.ops_cartesian import cartesian_product
+from core.aggregates import aggregate, group_by
+from core.memory import estimate_product_bytes
+from core.ops_join import hash_join
+from core.query import parse_query
+from core.stats import global_stats, profile_call
+from utils.cli_helpers import ask_yes_no, format_bytes, print_table
+
+
+#з якої кількості рядків декартів добуток пропонується писати одразу на диск
+SPILL_ROWS = 1_000_000
+
+#скільки пам'яті можуть займати таблиці бази в консолі (перевищення - попередження)
+MEMORY_BUDGET = 1024 * 1024 * 1024
+
+#скільки пам'яті можуть займати прочитані таблиці: давно не потрібні витісняються на диск
+TABLE_CACHE_BYTES = MEMORY_BUDGET
+
+#чи виконувати пункти меню під cProfile (python main.py --profile або пункт 9)
+profile_actions = False
 
 
 def _input_nonempty(prompt: str) -> str:
@@ -59,9 +79,23 @@ def add_row_cli(db: Database) -> None:
 
 def show_tables_cli(db: Database) -> None:
     print("таблиці бази даних:")
+    usage = db.memory_usage()
     for tname in db.list_tables():
-        t = db.get_table(tname)
-        print(f" - {t.name} ({t.row_count()} рядків)")
+        #не через get_table: перегляд не повинен дочитувати ліниві таблиці
+        t = db.tables[tname]
+        if not t.loaded:
+            #лінива таблиця ще не прочитана - і пам'яті не займає; без .meta.json
+            #кількість рядків невідома, а читати заради неї всю таблицю не варто
+            count = t.known_row_count()
+            print(f" - {t.name} ({'?' if count is None else count} рядків, не завантажена)")
+            continue
+        u = usage["tables"][tname]
+        print(f" - {t.name} ({t.row_count()} рядків, ~{format_bytes(u['total'])})")
+        if u["total"]:
+            columns = ", ".join(f"{name} {format_bytes(size)}" for name, size in u["columns"].items())
+            print(f"     поля: {columns}; службове: {format_bytes(u['overhead'])}, індекси: {format_bytes(u['indexes'])}")
+    budget = f" з {format_bytes(db.memory_budget)}" if db.memory_budget is not None else ""
+    print(f"разом у пам'яті: ~{format_bytes(usage['total'])}{budget}")
 
 
 def cartesian_cli(db: Database) -> None:
@@ -73,16 +107,189 @@ def cartesian_cli(db: Database) -> None:
         return
     tA = db.get_table(a)
     tB = db.get_table(b)
-    result = cartesian_product(tA, tB)
-    db.tables[result.name] = result
+    result_name = f"{tA.name}_x_{tB.name}"
+    replace = result_name in db.tables
+    if replace and not ask_yes_no(f"таблиця '{result_name}' вже існує, перерахувати і замінити її?"):
+        return
+    total = tA.row_count() * tB.row_count()
+    #скільки займав би результат, якби його матеріалізувати в пам'яті
+    #(та сама оцінка, що й у db.cartesian_product: послідовний добуток ділить значення з A і B)
+    projected = estimate_product_bytes(tA, tB, engine=tA.engine, shared_values=True)
+    over_budget = db.exceeds_budget(projected)
+    if over_budget:
+        print(f"у пам'яті результат займав би ~{format_bytes(projected)}, це більше за бюджет бази")
+    if (total >= SPILL_ROWS or over_budget) and db.storage_format == "jsonl":
+        if ask_yes_no(f"результат матиме {total} рядків, записати його одразу на диск блоками?"):
+            _cartesian_to_disk_cli(db, a, b, replace)
+            return
+    #результат матеріалізується: це звичайна таблиця бази, яку можна змінювати і зберігати
+    try:
+        with warnings.catch_warnings():
+            #про перевищення бюджету вже сказано вище
+            warnings.simplefilter("ignore", RuntimeWarning)
+            result = db.cartesian_product(a, b, replace=replace)
+    except (ValueError, MemoryError) as e:
+        print("помилка:", e)
+        return
     print(f"результат '{result.name}' створено, рядків: {result.row_count()}")
 
 
+def _cartesian_to_disk_cli(db: Database, a: str, b: str, replace: bool = False) -> None:
+    last = [0.0]
+
+    def progress(done: int, total: int, speed: float) -> None:
+        #не частіше ніж раз на секунду
+        now = time.monotonic()
+        if now - last[0] >= 1 or done == total:
+            last[0] = now
+            print(f"\r  записано {done}/{total} рядків ({speed:,.0f} рядків/с)", end="", flush=True)
+
+    try:
+        table = db.cartesian_to_disk(a, b, progress=progress, replace=replace)
+    except (ValueError, KeyError) as e:
+        print("\nпомилка:", e)
+        return
+    print(f"\nрезультат '{table.name}' записано на диск, рядків: {table.row_count()}")
+
+
+def join_cli(db: Database) -> None:
+    print("з'єднання двох таблиць по рівності полів (A.поле = B.поле)")
+    a = _input_nonempty("ім'я таблиці A: ")
+    b = _input_nonempty("ім'я таблиці B: ")
+    if a not in db.tables or b not in db.tables:
+        print("одна або обидві таблиці не знайдені")
+        return
+    on_a = _input_nonempty(f"поле з {a}: ")
+    on_b = _input_nonempty(f"поле з {b}: ")
+    how = input("тип (inner/left, Enter - inner): ").strip().lower() or "inner"
+    try:
+        result = hash_join(db.get_table(a), db.get_table(b), on_a, on_b, how=how)
+        if how == "left":
+            #рядки без пари мають порожні поля B, такий результат лише показуємо
+            rows = result.get_rows()
+            print_table([r.as_dict() for r in rows])
+            print(f"рядків: {len(rows)}")
+            return
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", RuntimeWarning)
+            table = db.join(a, b, on_a, on_b)
+    except (ValueError, KeyError, TypeError) as e:
+        print("помилка з'єднання:", e)
+        return
+    except MemoryError as e:
+        print("з'єднання скасовано:", e)
+        return
+    for w in caught:
+        print("попередження:", w.message)
+    print(f"результат '{table.name}' створено, рядків: {table.row_count()}")
+
+
+def query_cli(db: Database) -> None:
+    print("запит: select <поля через кому | *> from <таблиця> [where умова and ...] [limit n]")
+    print("умови: поле = значення (також !=, <, <=, >, >=), рядки - в лапках")
+    text = _input_nonempty("> ")
+    try:
+        query = parse_query(text, db)
+        print("план:", " -> ".join(query.explain()))
+        rows = query.rows()
+    except (ValueError, KeyError, TypeError) as e:
+        print("помилка запиту:", e)
+        return
+    print_table([r.as_dict() for r in rows])
+    print(f"рядків: {len(rows)}")
+
+
+def aggregate_cli(db: Database) -> None:
+    print("агрегати: count, sum(поле), avg(поле), min(поле), max(поле) через кому")
+    tname = _input_nonempty("ім'я таблиці: ")
+    if tname not in db.tables:
+        print("таблицю не знайдено")
+        return
+    text = _input_nonempty("агрегати: ")
+    key = input("групувати за полем (Enter - без групування): ").strip()
+    start = time.perf_counter()
+    try:
+        table = db.get_table(tname)
+        if key:
+            rows = group_by(table, key, [text])
+        else:
+            rows = [aggregate(table, [text])]
+    except (ValueError, KeyError, TypeError, OverflowError) as e:
+        print("помилка:", e)
+        return
+    print_table(rows)
+    print(f"груп: {len(rows)}, час: {time.perf_counter() - start:.2f} с")
+
+
+def save_cli(db: Database) -> None:
+    db.save_all()
+    print("усі таблиці збережено")
+
+
+def stats_cli(db: Database) -> None:
+    global profile_actions
+    data = global_stats.snapshot()
+    if not global_stats.enabled:
+        print("збір статистики вимкнено")
+    rows = [
+        {"операція": name, "викликів": s["calls"], "секунд": f"{s['seconds']:.3f}", "сер. мс": f"{s['avg_ms']:.3f}"}
+        for name, s in data.items()
+    ]
+    print_table(rows)
+    cache = db.cache_stats()
+    ratio = f"{cache['hit_ratio']:.0%}" if cache["hit_ratio"] is not None else "-"
+    print(
+        f"кеш таблиць: влучань {cache['hits']}, промахів {cache['misses']} ({ratio} влучань), "
+        f"витіснено {cache['evictions']} (з них збережено {cache['flushes']}), "
+        f"у пам'яті {cache['resident_tables']} табл. / {cache['resident_bytes'] / 1024 / 1024:.1f} МіБ"
+    )
+    print(f"профілювання пунктів меню: {'увімкнено' if profile_actions else 'вимкнено'}")
+    action = input("j - зберегти в json, r - скинути, s - увімк/вимк збір, p - увімк/вимк профілювання, Enter - назад: ")
+    action = action.strip().lower()
+    if action == "j":
+        path = input("файл (Enter - stats.json): ").strip() or "stats.json"
+        global_stats.dump(path)
+        print(f"статистику записано в {path}")
+    elif action == "r":
+        global_stats.reset()
+        db.cache.reset_stats()
+        print("статистику скинуто")
+    elif action == "s":
+        if global_stats.enabled:
+            global_stats.disable()
+        else:
+            global_stats.enable()
+        print(f"збір статистики: {'увімкнено' if global_stats.enabled else 'вимкнено'}")
+    elif action == "p":
+        profile_actions = not profile_actions
+        print(f"профілювання: {'увімкнено' if profile_actions else 'вимкнено'}")
+
+
+ACTIONS = {
+    "1": create_table_cli,
+    "2": show_tables_cli,
+    "3": add_row_cli,
+    "4": cartesian_cli,
+    "5": save_cli,
+    "6": query_cli,
+    "7": join_cli,
+    "8": aggregate_cli,
+    "9": stats_cli,
+}
+
+
 def main():
+    global profile_actions
+    profile_actions = "--profile" in sys.argv[1:]
+    #збір статистики за замовчуванням вимкнений: --stats або пункт 9, "s"
+    if "--stats" in sys.argv[1:]:
+        global_stats.enable()
+
     base_dir = Path("db_data")
     db_name = "default_db"
-    db = Database(db_name, base_dir)
-    db.load_all()
+    db = Database(db_name, base_dir, memory_budget=MEMORY_BUDGET, cache_bytes=TABLE_CACHE_BYTES)
+    #рядки таблиць читаються лише коли вони справді потрібні
+    db.load_all(lazy=True)
 
     menu = """
 1. створити таблицю
@@ -90,22 +297,22 @@ def main():
 3. додати рядок
 4. декартів добуток двох таблиць
 5. зберегти базу
+6. запит (select ... where ...)
+7. з'єднання двох таблиць (join)
+8. агрегати (count/sum/avg/min/max, group by)
+9. статистика операцій
 0. вихід
 > """
 
     while True:
         choice = input(menu).strip()
-        if choice == "1":
-            create_table_cli(db)
-        elif choice == "2":
-            show_tables_cli(db)
-        elif choice == "3":
-            add_row_cli(db)
-        elif choice == "4":
-            cartesian_cli(db)
-        elif choice == "5":
-            db.save_all()
-            print("усі таблиці збережено")
+        action = ACTIONS.get(choice)
+        if action is not None:
+            if profile_actions and action is not stats_cli:
+                _, report = profile_call(action, db)
+                print(report)
+            else:
+                action(db)
         elif choice == "0":
             db.save_all()
             print("вихід...")
@@ -1,3 +1,4 @@
 # storage/__init__.py
 from __future__ import annotations
-from .file_storage import save_table, load_table
+from .file_storage import save_table, load_table, load_tables_parallel, save_rows_stream, unload_table
+from .binary_storage import save_table_binary, load_table_binary, convert_table, unload_table_binary
@@ -0,0 +1,251 @@
+# storage/binary_storage.py
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from core.table import Table
+from core.schema import Schema
+from core.row import Row
+from core.stats import timed
+from .file_storage import (
+    _read_indexes,
+    _read_tombstones,
+    _tables_dir,
+    _write_indexes,
+    _write_tombstones,
+    load_table,
+    save_table,
+)
+
+
+#формат файлу <name>.rows.bin:
+#- MAGIC (4 байти) + довжина заголовку (uint32 little-endian)
+#- заголовок json: схема, кількість рядків, формат запису
+#- записи фіксованої ширини (struct), по одному на рядок
+#- купа (heap) з utf-8 байтами рядкових значень
+MAGIC = b"LTB1"
+_PREFIX = struct.Struct("<4sI")
+
+#поля фіксованої ширини: тип -> коди struct
+_FIXED_CODES = {
+    "integer": "q",
+    "real": "d",
+    "char": "I", #код символу
+    "complexInteger": "qq",
+    "complexReal": "dd",
+}
+#string і невідомі типи пишуться як (зміщення в купі, довжина)
+_HEAP_CODES = "QI"
+
+
+def _field_codes(type_name: str) -> str:
+    return _FIXED_CODES.get(type_name, _HEAP_CODES)
+
+
+def _record_format(schema: Schema) -> str:
+    return "<" + "".join(_field_codes(f.type_name) for f in schema.fields)
+
+
+def _rows_path(base_path: Path, name: str) -> Path:
+    return _tables_dir(base_path) / f"{name}.rows.bin"
+
+
+def _encode_row(schema: Schema, values: tuple, heap: bytearray) -> list[Any]:
+    #перетворює значення рядка на плоский список для struct.pack
+    flat: list[Any] = []
+    for field, value in zip(schema.fields, values):
+        t = field.type_name
+        if t in ("integer", "real"):
+            flat.append(value)
+        elif t == "char":
+            flat.append(ord(value))
+        elif t in ("complexInteger", "complexReal"):
+            flat.extend(value)
+        else:
+            if t == "string":
+                data = value.encode("utf-8")
+            else:
+                #невідомий тип: зберігаємо його json-представлення в купі
+                data = json.dumps(field.serialize_value(value), ensure_ascii=False).encode("utf-8")
+            flat.append(len(heap))
+            flat.append(len(data))
+            heap += data
+    return flat
+
+
+@timed("storage.save_table_binary")
+def save_table_binary(table: Table, base_path: Path) -> None:
+    #зберігає таблицю у бінарний файл <name>.rows.bin
+    #пише у тимчасовий файл і підміняє; якщо рядки цієї таблиці відображені з того
+    #самого файлу, відображення спершу закривається (windows не дає підмінити
+    #відкритий файл), і таблиця відобразить новий файл при наступному зверненні
+    schema = table.schema
+    record = struct.Struct(_record_format(schema))
+    heap = bytearray()
+    records = bytearray()
+    count = 0
+    for row in table.scan(include_deleted=True):
+        try:
+            records += record.pack(*_encode_row(schema, schema.row_values(row), heap))
+        except struct.error as exc:
+            raise ValueError(f"row {row!r} does not fit into binary format: {exc}") from exc
+        count += 1
+
+    #зміщення секцій не пишемо: записи йдуть одразу після заголовку, купа - після записів
+    header = {
+        "schema": schema.as_dict(),
+        "row_count": count,
+        "record_format": record.format,
+        "record_size": record.size,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+
+    path = _rows_path(base_path, table.name)
+    tmp_path = path.with_suffix(".bin.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(records)
+        f.write(heap)
+    _write_tombstones(_tables_dir(base_path), table)
+    _write_indexes(_tables_dir(base_path), table)
+    if table.loaded and isinstance(table.rows, MappedRows) and table.rows.path == path:
+        unload_table_binary(table, base_path)
+    os.replace(tmp_path, path)
+
+
+def _read_header(mm: Any, name: str) -> tuple[int, dict[str, Any]]:
+    #повертає (довжина заголовку, заголовок)
+    magic, header_len = _PREFIX.unpack_from(mm, 0)
+    if magic != MAGIC:
+        raise ValueError(f"file for table {name!r} is not a binary table file")
+    header = json.loads(bytes(mm[_PREFIX.size:_PREFIX.size + header_len]).decode("utf-8"))
+    return header_len, header
+
+
+class MappedRows(Sequence):
+    #рядки бінарної таблиці, відображені в пам'ять через mmap
+    #рядок декодується лише при зверненні, доступ до i-го рядка - O(1)
+    #лише для читання: Table копіює рядки при першій зміні
+
+    def __init__(self, path: Path, name: str) -> None:
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_len, header = _read_header(self._mm, name)
+        self.schema = Schema.from_dict(header["schema"])
+        self._count: int = header["row_count"]
+        self._record = struct.Struct(header["record_format"])
+        self._records_offset = _PREFIX.size + header_len
+        self._heap_offset = self._records_offset + self._count * self._record.size
+        self._convert = self._compile(self.schema)
+        self._build = self.schema.row_builder()
+
+    def _compile(self, schema: Schema) -> Callable[[tuple], tuple]:
+        #будує функцію: плоский кортеж зі struct -> кортеж значень полів
+        mm = self._mm
+        heap = self._heap_offset
+        steps: list[Callable[[tuple], Any]] = []
+
+        def read_heap(offset: int, length: int) -> str:
+            return mm[heap + offset:heap + offset + length].decode("utf-8")
+
+        pos = 0
+        for field in schema.fields:
+            t = field.type_name
+            j = pos
+            if t in ("integer", "real"):
+                steps.append(lambda flat, j=j: flat[j])
+            elif t == "char":
+                steps.append(lambda flat, j=j: chr(flat[j]))
+            elif t in ("complexInteger", "complexReal"):
+                steps.append(lambda flat, j=j: (flat[j], flat[j + 1]))
+            elif t == "string":
+                steps.append(lambda flat, j=j: read_heap(flat[j], flat[j + 1]))
+            else:
+                decode = field.type_obj.decoder(trusted=True)
+                steps.append(lambda flat, j=j, decode=decode: decode(json.loads(read_heap(flat[j], flat[j + 1]))))
+            pos += len(_field_codes(t))
+
+        def convert(flat: tuple) -> tuple:
+            return tuple([step(flat) for step in steps])
+
+        return convert
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not (0 <= index < self._count):
+            raise IndexError("row index out of range")
+        offset = self._records_offset + index * self._record.size
+        return self._build(self._convert(self._record.unpack_from(self._mm, offset)))
+
+    def __iter__(self) -> Iterator[Row]:
+        start = self._records_offset
+        end = start + self._count * self._record.size
+        build = self._build
+        convert = self._convert
+        #memoryview, а не зріз mmap, щоб не копіювати всі записи в пам'ять
+        for flat in self._record.iter_unpack(memoryview(self._mm)[start:end]):
+            yield build(convert(flat))
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        except BufferError:
+            #ще живий незавершений перебір - mmap закриється разом з ним
+            pass
+        self._file.close()
+
+
+@timed("storage.load_table_binary")
+def load_table_binary(name: str, base_path: Path, engine: str = "rows") -> Table:
+    #відкриває бінарну таблицю: читається лише заголовок, рядки - через mmap
+    path = _rows_path(base_path, name)
+    if not path.exists():
+        raise FileNotFoundError(f"binary file for table {name!r} not found")
+    rows = MappedRows(path, name)
+    table = Table(name=name, schema=rows.schema, engine=engine)
+    _attach_rows(table, rows, base_path)
+    _read_indexes(_tables_dir(base_path), table)
+    table.is_dirty = False
+    return table
+
+
+def _attach_rows(table: Table, rows: MappedRows, base_path: Path) -> None:
+    table.rows = rows
+    _read_tombstones(_tables_dir(base_path), table)
+    table.persisted_rows = len(rows)
+
+
+def unload_table_binary(table: Table, base_path: Path) -> None:
+    #як unload_table: відображення файлу закривається, при наступному зверненні
+    #файл відображається знову
+    path = _rows_path(base_path, table.name)
+    table.set_loader(lambda t: _attach_rows(t, MappedRows(path, t.name), base_path), row_count=table.row_count())
+
+
+def convert_table(name: str, base_path: Path, to_format: str) -> None:
+    #перетворює файли таблиці між форматами "jsonl" і "binary"
+    #файли старого формату лишаються на місці
+    if to_format == "binary":
+        save_table_binary(load_table(name, base_path), base_path)
+    elif to_format == "jsonl":
+        table = load_table_binary(name, base_path)
+        try:
+            save_table(table, base_path, full=True)
+        finally:
+            table.rows.close()
+    else:
+        raise ValueError(f"unknown storage format {to_format!r}")
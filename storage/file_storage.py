@@ -2,12 +2,17 @@
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from time import perf_counter
+from typing import Any, Iterable
 
 from core.table import Table
 from core.schema import Schema
 from core.row import Row
+from core.stats import global_stats, timed
 
 
 def _tables_dir(base_path: Path) -> Path:
@@ -17,59 +22,384 @@ def _tables_dir(base_path: Path) -> Path:
     return tables_path
 
 
-def save_table(table: Table, base_path: Path) -> None:
+def _write_rows(f: Any, table: Table, start: int, stop: int) -> None:
+    #пише рядки [start, stop) у форматі jsonl
+    #пишуться всі фізичні рядки, включно з логічно видаленими, щоб позиції у файлі
+    #збігались з позиціями в пам'яті; видалені позначаються окремим файлом
+    schema = table.schema
+    rows = table.scan(include_deleted=True)
+    #повний запис - послідовним перебором, бо не всі послідовності мають дешевий rows[i]
+    chosen = islice(rows, stop) if start == 0 else (rows[i] for i in range(start, stop))
+    if global_stats.enabled:
+        _write_rows_timed(f, schema, chosen)
+        return
+    for row in chosen:
+        serialized = schema.serialize_values(schema.row_values(row))
+        f.write(json.dumps(serialized, ensure_ascii=False))
+        f.write("\n")
+
+
+def _write_rows_timed(f: Any, schema: Schema, rows: Iterable[Row]) -> None:
+    #той самий запис з розкладом часу: серіалізація значень, json, запис у файл
+    serialize = encode = write = 0.0
+    count = 0
+    for row in rows:
+        t0 = perf_counter()
+        serialized = schema.serialize_values(schema.row_values(row))
+        t1 = perf_counter()
+        line = json.dumps(serialized, ensure_ascii=False)
+        t2 = perf_counter()
+        f.write(line)
+        f.write("\n")
+        t3 = perf_counter()
+        serialize += t1 - t0
+        encode += t2 - t1
+        write += t3 - t2
+        count += 1
+    global_stats.add("save.serialize_values", serialize, count)
+    global_stats.add("save.json_encode", encode, count)
+    global_stats.add("save.file_write", write, count)
+
+
+def _write_meta(tables_path: Path, name: str, row_count: int, dead: int = 0) -> None:
+    #службовий файл <name>.meta.json з водяним знаком збережених рядків
+    #і кількістю видалених серед них (щоб знати кількість живих рядків без читання)
+    meta_path = tables_path / f"{name}.meta.json"
+    meta = {"rows": row_count}
+    if dead:
+        meta["dead"] = dead
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def _write_tombstones(tables_path: Path, table: Table) -> None:
+    #позиції логічно видалених рядків у <name>.tombstones.json
+    #завдяки цьому видалення не вимагає перезапису файлу рядків
+    path = tables_path / f"{table.name}.tombstones.json"
+    dead = table.deleted_positions() if isinstance(table, Table) else []
+    if not dead:
+        path.unlink(missing_ok=True)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"dead": dead}, f)
+
+
+def _read_tombstones(tables_path: Path, table: Table) -> None:
+    path = tables_path / f"{table.name}.tombstones.json"
+    if not path.exists():
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        table.restore_deleted(json.load(f)["dead"])
+
+
+def _write_indexes(tables_path: Path, table: Table) -> None:
+    #перелік індексів таблиці в <name>.indexes.json (самі індекси будуються при завантаженні)
+    indexes_path = tables_path / f"{table.name}.indexes.json"
+    #CartesianView та інші представлення індексів не мають
+    indexes = table.indexes if isinstance(table, Table) else {}
+    if not indexes and not indexes_path.exists():
+        return
+    data = {"indexes": [{"field": idx.field_name, "kind": idx.kind} for idx in indexes.values()]}
+    with open(indexes_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _read_indexes(tables_path: Path, table: Table) -> None:
+    #відновлює індекси таблиці з <name>.indexes.json, якщо файл є
+    indexes_path = tables_path / f"{table.name}.indexes.json"
+    if not indexes_path.exists():
+        return
+    with open(indexes_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for entry in data.get("indexes", []):
+        table.create_index(entry["field"], kind=entry.get("kind", "hash"))
+
+
+@timed("storage.save_table")
+def save_table(table: Table, base_path: Path, full: bool = False) -> None:
     #зберігає одну таблицю:
     #- схему в <name>.schema.json
     #- рядки в <name>.rows.jsonl
+    #- кількість збережених рядків в <name>.meta.json
+    #- перелік індексів в <name>.indexes.json (якщо є)
+    #- позиції видалених рядків в <name>.tombstones.json (якщо є)
+    #якщо після попереднього збереження були лише вставки, нові рядки дописуються
+    #в кінець файлу, видалення лише оновлюють tombstones.json;
+    #повний перезапис - після update, компактизації або при full=True
 
     tables_path = _tables_dir(base_path)
     schema_path = tables_path / f"{table.name}.schema.json"
     rows_path = tables_path / f"{table.name}.rows.jsonl"
 
-    #зберігаємо схему
-    schema_dict = table.schema.as_dict()
-    with open(schema_path, "w", encoding="utf-8") as f:
-        json.dump(schema_dict, f, indent=2, ensure_ascii=False)
+    total = len(table.rows)
+    persisted = table.persisted_rows
+    can_append = (
+        not full
+        and persisted is not None
+        and not table.needs_rewrite
+        and persisted <= total
+        and schema_path.exists()
+        and rows_path.exists()
+    )
 
-    #зберігаємо рядки у форматі jsonl
-    with open(rows_path, "w", encoding="utf-8") as f:
-        for row in table.rows:
-            serialized = table.schema.serialize_row(row.as_dict())
-            f.write(json.dumps(serialized, ensure_ascii=False))
-            f.write("\n")
+    if can_append:
+        #дописуємо лише нові рядки
+        with open(rows_path, "a", encoding="utf-8") as f:
+            _write_rows(f, table, persisted, total)
+    else:
+        #зберігаємо схему
+        schema_dict = table.schema.as_dict()
+        with open(schema_path, "w", encoding="utf-8") as f:
+            json.dump(schema_dict, f, indent=2, ensure_ascii=False)
 
+        #зберігаємо рядки у форматі jsonl
+        with open(rows_path, "w", encoding="utf-8") as f:
+            _write_rows(f, table, 0, total)
 
-def load_table(name: str, base_path: Path) -> Table:
+    _write_tombstones(tables_path, table)
+    _write_meta(tables_path, table.name, total, _dead_count(table))
+    _write_indexes(tables_path, table)
 
-    #завантажує таблицю з диску за ім'ям
-    #очікує:
-    #- <name>.schema.json
-    #- <name>.rows.jsonl (може бути відсутній або порожній)
+
+def _dead_count(table: Any) -> int:
+    #CartesianView та інші представлення видалених рядків не мають
+    return table.dead_count() if isinstance(table, Table) else 0
+
+
+def save_rows_stream(name: str, schema: Schema, blocks: Iterable[str], base_path: Path) -> int:
+    #пише таблицю, рядки якої надходять потоком вже готовими шматками тексту jsonl
+    #(напр. блоки декартового добутку), не тримаючи всю таблицю в пам'яті
+    #рядки спершу йдуть у тимчасовий файл, тож перерваний запис не псує старі файли
+    #повертає кількість записаних рядків
     tables_path = _tables_dir(base_path)
-    schema_path = tables_path / f"{name}.schema.json"
     rows_path = tables_path / f"{name}.rows.jsonl"
+    tmp_path = rows_path.with_suffix(".jsonl.tmp")
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for text in blocks:
+                f.write(text)
+                count += text.count("\n")
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    #позначки видалення і перелік індексів могли лишитись від попередньої таблиці
+    #з таким ім'ям (її поля можуть бути зовсім іншими)
+    (tables_path / f"{name}.tombstones.json").unlink(missing_ok=True)
+    (tables_path / f"{name}.indexes.json").unlink(missing_ok=True)
+    with open(tables_path / f"{name}.schema.json", "w", encoding="utf-8") as f:
+        json.dump(schema.as_dict(), f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, rows_path)
+    _write_meta(tables_path, name, count)
+    return count
 
-    if not schema_path.exists():
-        raise FileNotFoundError(f"schema file for table {name!r} not found")
 
-    #читаємо схему
-    with open(schema_path, "r", encoding="utf-8") as f:
-        schema_data = json.load(f)
-    schema = Schema.from_dict(schema_data)
+def _read_meta(tables_path: Path, name: str) -> dict[str, Any] | None:
+    #читає службовий файл <name>.meta.json, якщо він є
+    meta_path = tables_path / f"{name}.meta.json"
+    if not meta_path.exists():
+        return None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
-    table = Table(name=name, schema=schema)
 
-    #читаємо рядки, якщо файл існує
+@timed("storage.read_rows")
+def _read_rows(table: Table, tables_path: Path, verify: bool = False) -> None:
+    #читає рядки <name>.rows.jsonl у таблицю, якщо файл існує
+    #файл записаний нами через serialize_row, тому декодуємо скомпільованим
+    #декодером схеми; verify=True вмикає повну валідацію кожного значення
+    rows_path = tables_path / f"{table.name}.rows.jsonl"
+    schema = table.schema
     if rows_path.exists():
+        rows = table.rows
+        decode = schema.compile_decoder(verify=verify)
+        build = schema.row_builder()
+        loads = json.loads
         with open(rows_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                raw_row: dict[str, Any] = json.loads(line)
-                # пропускаємо через валідацію, щоб відновити потрібні типи
-                normalized = schema.validate_row(raw_row)
-                table.rows.append(Row(normalized))
+            if global_stats.enabled:
+                _read_lines_timed(f, rows, decode, build)
+            else:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    rows.append(build(decode(loads(line))))
+    _read_tombstones(tables_path, table)
+
+    table.persisted_rows = len(table.rows)
+    #файли старого формату не мають службового файлу - створюємо, щоб наступного
+    #разу кількість рядків була відома без читання
+    if rows_path.exists() and _read_meta(tables_path, table.name) is None:
+        _write_meta(tables_path, table.name, table.persisted_rows, table.dead_count())
+
+
+def _read_lines_timed(f: Any, rows: Any, decode: Any, build: Any) -> None:
+    #той самий цикл читання з розкладом часу: json, декодування значень, побудова Row
+    loads = json.loads
+    parse = convert = construct = 0.0
+    count = 0
+    for line in f:
+        line = line.strip()
+        if not line:
+            continue
+        t0 = perf_counter()
+        raw = loads(line)
+        t1 = perf_counter()
+        values = decode(raw)
+        t2 = perf_counter()
+        rows.append(build(values))
+        t3 = perf_counter()
+        parse += t1 - t0
+        convert += t2 - t1
+        construct += t3 - t2
+        count += 1
+    global_stats.add("load.json_decode", parse, count)
+    global_stats.add("load.decode_values", convert, count)
+    global_stats.add("load.build_rows", construct, count)
+
+
+def _read_schema(tables_path: Path, name: str) -> dict[str, Any]:
+    #читає json-опис схеми таблиці
+    schema_path = tables_path / f"{name}.schema.json"
+    if not schema_path.exists():
+        raise FileNotFoundError(f"schema file for table {name!r} not found")
+    with open(schema_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@timed("storage.load_table")
+def load_table(
+    name: str,
+    base_path: Path,
+    engine: str = "rows",
+    lazy: bool = False,
+    verify: bool = False,
+) -> Table:
+
+    #завантажує таблицю з диску за ім'ям
+    #очікує:
+    #- <name>.schema.json
+    #- <name>.rows.jsonl (може бути відсутній або порожній)
+    #lazy=True читає лише схему, а рядки - при першому зверненні до них
+    #verify=True повністю валідує кожне значення (для файлів, яким не довіряємо)
+    tables_path = _tables_dir(base_path)
+    schema = Schema.from_dict(_read_schema(tables_path, name))
+
+    table = Table(name=name, schema=schema, engine=engine)
+
+    if lazy:
+        meta = _read_meta(tables_path, name)
+        known = meta["rows"] - meta.get("dead", 0) if meta else None
+        table.set_loader(lambda t: _read_rows(t, tables_path, verify), row_count=known)
+    else:
+        _read_rows(table, tables_path, verify)
+    _read_indexes(tables_path, table)
 
     table.is_dirty = False
     return table
+
+
+def unload_table(table: Table, base_path: Path, verify: bool = False) -> None:
+    #звільняє рядки збереженої таблиці з пам'яті: таблиця стає лінивою і при наступному
+    #зверненні дочитає їх з <name>.rows.jsonl (визначення індексів лишаються)
+    #незбережені зміни губляться, тож змінену таблицю треба спершу зберегти
+    tables_path = _tables_dir(base_path)
+    table.set_loader(lambda t: _read_rows(t, tables_path, verify), row_count=table.row_count())
+
+
+def _chunk_ranges(rows_path: Path, chunk_bytes: int) -> list[tuple[int, int]]:
+    #ділить файл на діапазони байтів приблизно по chunk_bytes,
+    #межі зсуваються до кінця рядка, щоб жоден json не розрізався
+    size = rows_path.stat().st_size
+    ranges: list[tuple[int, int]] = []
+    start = 0
+    with open(rows_path, "rb") as f:
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                end = size
+            else:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _decode_chunk(
+    rows_path: str,
+    start: int,
+    end: int,
+    schema_data: dict[str, Any],
+    verify: bool,
+) -> list[tuple]:
+    #виконується у процесі-воркері: парсить і декодує рядки з діапазону байтів
+    #повертає кортежі значень, бо їх дешевше передавати між процесами ніж Row
+    decode = Schema.from_dict(schema_data).compile_decoder(verify=verify)
+    with open(rows_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    result = []
+    for line in data.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        result.append(decode(json.loads(line)))
+    return result
+
+
+def load_tables_parallel(
+    names: list[str],
+    base_path: Path,
+    workers: int | None = None,
+    engine: str = "rows",
+    chunk_bytes: int = 8 * 1024 * 1024,
+    verify: bool = False,
+) -> tuple[dict[str, Table], dict[str, Exception]]:
+    #завантажує кілька таблиць пулом процесів
+    #великі файли рядків діляться на шматки по chunk_bytes, які парсяться паралельно
+    #повертає (таблиці у порядку names, помилки по таблицях); помилка однієї таблиці
+    #не зупиняє завантаження інших
+    tables_path = _tables_dir(base_path)
+    tables: dict[str, Table] = {}
+    errors: dict[str, Exception] = {}
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        pending: dict[str, tuple[Table, list[Any]]] = {}
+        for name in names:
+            try:
+                schema_data = _read_schema(tables_path, name)
+                table = Table(name=name, schema=Schema.from_dict(schema_data), engine=engine)
+                rows_path = tables_path / f"{name}.rows.jsonl"
+                futures = []
+                if rows_path.exists():
+                    for start, end in _chunk_ranges(rows_path, chunk_bytes):
+                        fut = pool.submit(
+                            _decode_chunk, str(rows_path), start, end, schema_data, verify
+                        )
+                        futures.append(fut)
+                pending[name] = (table, futures)
+            except Exception as exc:
+                errors[name] = exc
+
+        #збираємо результати в порядку таблиць і шматків файлу
+        for name in names:
+            if name not in pending:
+                continue
+            table, futures = pending[name]
+            try:
+                build = table.schema.row_builder()
+                rows = table.rows
+                for fut in futures:
+                    rows.extend(build(values) for values in fut.result())
+                _read_tombstones(tables_path, table)
+                _read_indexes(tables_path, table)
+            except Exception as exc:
+                errors[name] = exc
+                continue
+            table.is_dirty = False
+            table.persisted_rows = len(rows)
+            tables[name] = table
+
+    return tables, errors
@@ -0,0 +1,128 @@
+# tests/test_aggregates.py
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+from core.aggregates import Aggregate, aggregate, group_by, parse_aggregates
+from core.ops_cartesian import cartesian_product
+
+
+def _table(engine: str = "rows") -> Table:
+    t = Table(
+        "T",
+        Schema([
+            Field("dept", "string"),
+            Field("n", "integer"),
+            Field("x", "real"),
+            Field("zi", "complexInteger"),
+            Field("zr", "complexReal"),
+        ]),
+        engine=engine,
+    )
+    t.insert_many([
+        {"dept": "a", "n": 1, "x": 0.5, "zi": (1, 2), "zr": (0.5, -1.0)},
+        {"dept": "b", "n": 5, "x": 2.5, "zi": (3, -1), "zr": (1.5, 1.0)},
+        {"dept": "a", "n": 3, "x": 1.0, "zi": (-2, 0), "zr": (1.0, 0.0)},
+        {"dept": "c", "n": -4, "x": 4.0, "zi": (0, 5), "zr": (2.0, 2.0)},
+    ])
+    return t
+
+
+def test_parse_aggregates() -> None:
+    aggs = parse_aggregates("count(*), sum(n) , AVG(x)")
+    assert [a.label for a in aggs] == ["count", "sum(n)", "avg(x)"]
+    with pytest.raises(ValueError):
+        parse_aggregates("median(x)")
+    with pytest.raises(ValueError):
+        parse_aggregates("sum")
+    with pytest.raises(ValueError):
+        parse_aggregates("sum(x) + 1")
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+def test_totals(engine: str) -> None:
+    t = _table(engine)
+    result = aggregate(t, ["count, sum(n), avg(n), min(n), max(x), min(dept)", "sum(zi), avg(zr)"])
+    assert result == {
+        "count": 4,
+        "sum(n)": 5,
+        "avg(n)": 1.25,
+        "min(n)": -4,
+        "max(x)": 4.0,
+        "min(dept)": "a",
+        "sum(zi)": (2, 6),
+        "avg(zr)": (1.25, 0.5),
+    }
+
+
+def test_types_and_fields_are_checked() -> None:
+    t = _table()
+    with pytest.raises(TypeError):
+        aggregate(t, ["sum(dept)"])
+    with pytest.raises(TypeError):
+        aggregate(t, ["min(zi)"])
+    with pytest.raises(KeyError):
+        aggregate(t, ["sum(missing)"])
+    with pytest.raises(KeyError):
+        group_by(t, "missing", ["count"])
+
+
+def test_empty_table_and_deleted_rows() -> None:
+    t = _table()
+    t.delete(1)
+    assert aggregate(t, [Aggregate("count"), Aggregate("sum", "n"), Aggregate("max", "n")]) == {
+        "count": 3, "sum(n)": 0, "max(n)": 3,
+    }
+    empty = Table("E", t.schema)
+    assert aggregate(empty, ["count, sum(x), avg(n), min(n), avg(zi)"]) == {
+        "count": 0, "sum(x)": 0, "avg(n)": None, "min(n)": None, "avg(zi)": None,
+    }
+
+
+def test_nan_is_ignored_by_min_max_and_sorted_index_is_used() -> None:
+    t = Table("T", Schema([Field("x", "real")]))
+    t.insert_many([{"x": v} for v in (float("nan"), 3.0, -1.0)])
+    assert aggregate(t, ["min(x), max(x)"]) == {"min(x)": -1.0, "max(x)": 3.0}
+    assert math.isnan(aggregate(t, ["sum(x)"])["sum(x)"])
+    t.create_index("x", kind="sorted")
+    assert aggregate(t, ["min(x), max(x)"]) == {"min(x)": -1.0, "max(x)": 3.0}
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+def test_group_by(engine: str) -> None:
+    t = _table(engine)
+    groups = group_by(t, "dept", ["count, sum(n), avg(x), max(n), sum(zi), avg(zr)"])
+    assert groups == [
+        {"dept": "a", "count": 2, "sum(n)": 4, "avg(x)": 0.75, "max(n)": 3, "sum(zi)": (-1, 2), "avg(zr)": (0.75, -0.5)},
+        {"dept": "b", "count": 1, "sum(n)": 5, "avg(x)": 2.5, "max(n)": 5, "sum(zi)": (3, -1), "avg(zr)": (1.5, 1.0)},
+        {"dept": "c", "count": 1, "sum(n)": -4, "avg(x)": 4.0, "max(n)": -4, "sum(zi)": (0, 5), "avg(zr)": (2.0, 2.0)},
+    ]
+    #групування за комплексним полем і по представленню добутку
+    assert [g["count"] for g in group_by(t, "zi", ["count"])] == [1, 1, 1, 1]
+    view = cartesian_product(t, t, lazy=True)
+    by_dept = {g["A_dept"]: g["count"] for g in group_by(view, "A_dept", ["count"])}
+    assert by_dept == {"a": 8, "b": 4, "c": 4}
+    assert aggregate(view, ["sum(B_zi)"]) == {"sum(B_zi)": (8, 24)}
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+def test_complex_integer_sum_past_int64(engine: str) -> None:
+    #сума виходить за int64 - точне ціле, як і в group_by
+    big = 2**62
+    t = Table("T", Schema([Field("g", "string"), Field("zi", "complexInteger")]), engine=engine)
+    t.insert_many([{"g": "a", "zi": (big, -big)} for _ in range(4)])
+    totals = aggregate(t, ["sum(zi), avg(zi)"])
+    assert totals["sum(zi)"] == (4 * big, -4 * big)
+    assert totals["avg(zi)"] == (float(big), float(-big))
+    assert group_by(t, "g", ["sum(zi)"])[0]["sum(zi)"] == totals["sum(zi)"]
+
+
+def test_complex_integer_sum_of_values_past_int64() -> None:
+    huge = 2**70
+    t = Table("T", Schema([Field("zi", "complexInteger")]))
+    t.insert_many([{"zi": (huge, 1)}, {"zi": (1, -huge)}])
+    assert aggregate(t, ["sum(zi)"]) == {"sum(zi)": (huge + 1, 1 - huge)}
@@ -0,0 +1,35 @@
+# tests/test_benchmarks.py
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.datagen import make_schema, make_table, raw_rows
+from benchmarks.suite import compare, run_suite
+from core.types_base import global_type_registry
+
+
+def test_generator_covers_all_types_and_is_seeded() -> None:
+    schema = make_schema()
+    assert sorted(f.type_name for f in schema.fields) == sorted(global_type_registry.available_types())
+    assert raw_rows(schema, 50, seed=7) == raw_rows(schema, 50, seed=7)
+    assert raw_rows(schema, 50, seed=7) != raw_rows(schema, 50, seed=8)
+    #усі згенеровані форми проходять валідацію, і серед комплексних є рядкові
+    assert make_table("T", 500, seed=3).row_count() == 500
+    forms = {type(r["f_complexReal"]) for r in raw_rows(schema, 200)}
+    assert forms == {str, tuple, list, dict}
+
+
+def test_suite_result_and_compare() -> None:
+    data = run_suite("small", ["validate"], repeat=1, alloc=False, isolate=False)
+    result = data["results"]["validate"]
+    assert data["meta"]["tier"] == "small" and result["rows"] == 10_000
+    assert result["seconds"] > 0 and result["rows_per_s"] > 0
+
+    slower = {"meta": data["meta"], "results": {"validate": dict(result, seconds=result["seconds"] * 2)}}
+    assert compare(data, data) == []
+    assert compare(data, slower, threshold=0.5)[0].startswith("validate: seconds")
+    assert compare(data, slower, threshold=1.5) == []
+    with pytest.raises(ValueError):
+        compare(data, {"meta": {"tier": "large"}, "results": {}})
+    with pytest.raises(KeyError):
+        run_suite("small", ["nope"])
@@ -0,0 +1,105 @@
+# tests/test_binary_storage.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from core.schema import Field, Schema
+from core.database import Database
+from storage.binary_storage import MappedRows, convert_table, load_table_binary, save_table_binary
+from storage.file_storage import load_table
+
+
+def _make_db(tmp_path: Path, storage_format: str = "jsonl") -> Database:
+    db = Database("bin_db", base_dir=str(tmp_path), storage_format=storage_format)
+    t = db.create_table(
+        "mix",
+        Schema(
+            [
+                Field("id", "integer"),
+                Field("score", "real"),
+                Field("flag", "char"),
+                Field("name", "string"),
+                Field("zi", "complexInteger"),
+                Field("zr", "complexReal"),
+            ]
+        ),
+    )
+    for i in range(50):
+        t.insert({"id": i, "score": i / 2, "flag": "ї", "name": f"рядок {i}" * (i % 3), "zi": f"{i}-1i", "zr": "1,5+2i"})
+    return db
+
+
+def test_binary_round_trip_with_random_access(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    original = [r.as_dict() for r in db.get_table("mix").get_rows()]
+    save_table_binary(db.get_table("mix"), db.base_path)
+
+    loaded = load_table_binary("mix", db.base_path)
+
+    assert isinstance(loaded.rows, MappedRows)
+    assert loaded.row_count() == 50
+    assert loaded.rows[37].as_dict() == original[37]
+    assert [r.as_dict() for r in loaded.get_rows()] == original
+
+
+def test_binary_table_becomes_mutable_on_write(tmp_path: Path) -> None:
+    db = _make_db(tmp_path, storage_format="binary")
+    db.save_all()
+
+    db2 = Database("bin_db", base_dir=str(tmp_path))
+    db2.load_all()
+    assert db2.storage_format == "binary"
+    t = db2.get_table("mix")
+    t.delete(0)
+    t.insert({"id": 100, "score": 1, "flag": "a", "name": "", "zi": "0", "zr": "0"})
+    db2.save_all()
+
+    db3 = Database("bin_db", base_dir=str(tmp_path))
+    db3.load_all()
+    ids = [r["id"] for r in db3.get_table("mix").get_rows()]
+    assert ids == list(range(1, 50)) + [100]
+
+
+def test_convert_between_formats(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    db.save_all()
+    original = [r.as_dict() for r in db.get_table("mix").get_rows()]
+
+    convert_table("mix", db.base_path, "binary")
+    (db.base_path / "tables" / "mix.rows.jsonl").unlink()
+    convert_table("mix", db.base_path, "jsonl")
+
+    assert [r.as_dict() for r in load_table("mix", db.base_path).get_rows()] == original
+    with pytest.raises(ValueError):
+        convert_table("mix", db.base_path, "xml")
+
+
+def test_integer_out_of_range_is_value_error(tmp_path: Path) -> None:
+    db = Database("bin_db", base_dir=str(tmp_path))
+    t = db.create_table("big", Schema([Field("id", "integer")]))
+    t.insert({"id": 2 ** 70})
+    with pytest.raises(ValueError):
+        save_table_binary(t, db.base_path)
+
+
+def test_mapping_is_closed_when_rows_are_dropped(tmp_path: Path) -> None:
+    db = _make_db(tmp_path, storage_format="binary")
+    db.save_all()
+    db2 = Database("bin_db", base_dir=str(tmp_path))
+    db2.load_all()
+    t = db2.get_table("mix")
+    mapped = t.rows
+
+    #повний перезапис чистої таблиці: відображення закривається до підміни файлу
+    db2.save_all(full=True)
+    assert mapped._mm.closed
+    assert t.rows[49]["id"] == 49
+
+    #перша зміна копіює рядки і відпускає відображення
+    mapped = t.rows
+    t.insert({"id": 100, "score": 1, "flag": "a", "name": "", "zi": "0", "zr": "0"})
+    assert mapped._mm.closed
+    db2.save_all()
+    assert load_table_binary("mix", db2.base_path).row_count() == 51
@@ -1,9 +1,15 @@
 # tests/test_cartesian.py
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
+import pytest
+
+from core.database import Database
 from core.schema import Field, Schema
 from core.table import Table
-from core.ops_cartesian import cartesian_product
+from core.ops_cartesian import cartesian_product, product_blocks
 
 
 def _make_table_a() -> Table:
@@ -73,3 +79,105 @@ def test_cartesian_values_are_combined_correctly() -> None:
     actual = set((r["A_id"], r["A_name"], r["B_score"]) for r in rows)
 
     assert actual == expected
+
+
+def test_lazy_cartesian_counts_without_materializing() -> None:
+    a = _make_table_a()
+    b = _make_table_b()
+
+    view = cartesian_product(a, b, lazy=True)
+
+    assert view.name == "A_x_B"
+    assert view.row_count() == 6
+    assert view.schema.field_names() == ["A_id", "A_name", "B_score", "B_flag"]
+
+
+def test_lazy_cartesian_matches_eager_order() -> None:
+    a = _make_table_a()
+    b = _make_table_b()
+
+    eager = [r.as_dict() for r in cartesian_product(a, b).get_rows()]
+    view = cartesian_product(a, b, lazy=True)
+
+    assert [r.as_dict() for r in view] == eager
+    #довільний доступ до i-го рядка без перебору
+    assert view.rows[4].as_dict() == eager[4]
+    assert view.rows[-1].as_dict() == eager[-1]
+
+    table = view.to_table()
+    assert table.row_count() == 6
+    assert [r.as_dict() for r in table.get_rows()] == eager
+
+
+def test_database_product_stays_in_sync_with_its_file(tmp_path: Path) -> None:
+    #результат у базі - матеріалізована таблиця: зміни в B після збереження
+    #не змінюють її рядки ні в пам'яті, ні на диску
+    db = Database("db", str(tmp_path))
+    db.tables["A"] = _make_table_a()
+    db.tables["B"] = _make_table_b()
+    product = db.cartesian_product("A", "B")
+    assert isinstance(product, Table)
+    db.save_all()
+    db.get_table("B").insert({"score": 9.5, "flag": "z"})
+    db.save_all()
+
+    reloaded = Database("db", str(tmp_path))
+    reloaded.load_all()
+    assert reloaded.get_table("A_x_B").row_count() == product.row_count() == 6
+    #результат можна змінювати, як звичайну таблицю
+    product.insert({"A_id": 3, "A_name": "Eve", "B_score": 0.0, "B_flag": "q"})
+    assert product.row_count() == 7
+
+    view = db.cartesian_product("A", "B", result_name="view", lazy=True)
+    assert view.row_count() == 8 and "view" not in db.tables
+
+
+def test_database_product_is_recomputed_only_with_replace(tmp_path: Path) -> None:
+    db = Database("db", str(tmp_path))
+    db.tables["A"] = _make_table_a()
+    db.tables["B"] = _make_table_b()
+    old = db.cartesian_product("A", "B")
+    old.create_index("A_id")
+    db.save_all()
+    db.get_table("B").insert({"score": 9.5, "flag": "z"})
+
+    with pytest.raises(ValueError):
+        db.cartesian_product("A", "B")
+    new = db.cartesian_product("A", "B", replace=True)
+    assert db.get_table("A_x_B") is new and new is not old
+    assert new.row_count() == 8
+    db.save_all()
+
+    reloaded = Database("db", str(tmp_path))
+    reloaded.load_all()
+    assert reloaded.get_table("A_x_B").row_count() == 8
+
+
+def _numbered(name: str, n: int) -> Table:
+    t = Table(name, Schema([Field("id", "integer"), Field("z", "complexReal")]))
+    t.insert_many([{"id": i, "z": (i / 2, -i)} for i in range(n)])
+    return t
+
+
+def test_parallel_cartesian_keeps_serial_order() -> None:
+    a = _numbered("A", 23)
+    b = _numbered("B", 7)
+    serial = [r.values() for r in cartesian_product(a, b).rows]
+
+    parallel = cartesian_product(a, b, workers=2, block_size=4)
+    assert [r.values() for r in parallel.rows] == serial
+    assert parallel.schema.field_names() == ["A_id", "A_z", "B_id", "B_z"]
+    assert parallel.is_dirty
+
+
+def test_product_blocks_serialized_and_serial_modes() -> None:
+    a = _numbered("A", 5)
+    b = _numbered("B", 3)
+    blocks = list(product_blocks(a, b, block_size=2))
+    assert [len(block) for block in blocks] == [6, 6, 3]
+
+    text = "".join(product_blocks(a, b, workers=2, block_size=2, serialize=True))
+    lines = [json.loads(line) for line in text.splitlines()]
+    assert len(lines) == 15
+    assert lines[4] == {"A_id": 1, "A_z": {"real": 0.5, "imag": -1.0}, "B_id": 1, "B_z": {"real": 0.5, "imag": -1.0}}
+    assert list(product_blocks(a, _numbered("E", 0), workers=2)) == []
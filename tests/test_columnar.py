@@ -0,0 +1,114 @@
+# tests/test_columnar.py
+from __future__ import annotations
+
+from array import array
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+from core.ops_cartesian import cartesian_product
+
+
+def _make_table(engine: str) -> Table:
+    schema = Schema(
+        [
+            Field("id", "integer"),
+            Field("score", "real"),
+            Field("flag", "char"),
+            Field("name", "string"),
+            Field("zi", "complexInteger"),
+            Field("zr", "complexReal"),
+        ]
+    )
+    t = Table("T", schema, engine=engine)
+    t.insert({"id": 1, "score": 1.5, "flag": "X", "name": "Alice", "zi": "2+3i", "zr": "1,5-2i"})
+    t.insert({"id": 2, "score": 2.5, "flag": "Y", "name": "Боб", "zi": (4, -5), "zr": "3i"})
+    t.insert({"id": 3, "score": 3.5, "flag": "Z", "name": "", "zi": "7", "zr": (0.5, 0.25)})
+    return t
+
+
+def test_columnar_matches_row_engine() -> None:
+    rows = _make_table("rows")
+    cols = _make_table("columnar")
+
+    assert cols.row_count() == 3
+    assert [r.as_dict() for r in cols.get_rows()] == [r.as_dict() for r in rows.get_rows()]
+
+
+def test_columnar_update_and_delete() -> None:
+    t = _make_table("columnar")
+
+    t.update(1, {"id": 20, "score": 0, "flag": "Q", "name": "Bob2", "zi": "1-1i", "zr": "2"})
+    t.delete(0)
+
+    assert t.row_count() == 2
+    first = t.get_rows()[0]
+    assert first["id"] == 20
+    assert first["name"] == "Bob2"
+    assert first["zi"] == (1, -1)
+    assert first["zr"] == (2.0, 0.0)
+    assert t.get_rows()[1]["name"] == ""
+
+
+def test_columnar_numeric_column_is_array() -> None:
+    t = _make_table("columnar")
+
+    ids = t.column("id")
+    assert isinstance(ids, array)
+    assert sum(ids) == 6
+    assert t.column("zi") == [(2, 3), (4, -5), (7, 0)]
+
+
+def test_columnar_overflow_leaves_table_consistent() -> None:
+    t = _make_table("columnar")
+
+    with pytest.raises(ValueError):
+        t.insert({"id": 2 ** 70, "score": 1, "flag": "A", "name": "x", "zi": "1", "zr": "1"})
+    assert t.row_count() == 3
+    assert len(t.column("name")) == 3
+
+
+def test_columnar_failed_update_changes_nothing() -> None:
+    t = Table("T", Schema([Field("a", "integer"), Field("b", "integer")]), engine="columnar")
+    t.insert({"a": 1, "b": 2})
+    t.create_index("a")
+
+    with pytest.raises(ValueError):
+        t.update(0, {"a": 5, "b": 2 ** 70})
+    assert t.get_rows()[0].as_dict() == {"a": 1, "b": 2}
+    assert len(t.lookup("a", 1)) == 1
+    assert t.lookup("a", 5) == []
+
+
+def test_columnar_update_failing_on_string_changes_nothing() -> None:
+    t = Table("T", Schema([Field("a", "integer"), Field("s", "string")]), engine="columnar")
+    t.insert({"a": 1, "s": "x"})
+    t.create_index("a")
+
+    with pytest.raises(UnicodeEncodeError):
+        t.update(0, {"a": 5, "s": "\ud800"})
+    assert t.get_rows()[0].as_dict() == {"a": 1, "s": "x"}
+    assert len(t.lookup("a", 1)) == 1
+
+
+def test_columnar_compact_reclaims_string_bytes() -> None:
+    t = _make_table("columnar")
+    for i in range(50):
+        t.update(0, {"id": 1, "score": 1, "flag": "X", "name": "довге значення " * 4 + str(i), "zi": "1", "zr": "1"})
+    before = t.memory_usage()["columns"]["name"]
+
+    assert t.compact() == 0
+    assert t.memory_usage()["columns"]["name"] < before
+    assert [r["name"] for r in t.get_rows()] == ["довге значення " * 4 + "49", "Боб", ""]
+
+
+def test_columnar_cartesian_product() -> None:
+    a = _make_table("columnar")
+    b = _make_table("rows")
+
+    result = cartesian_product(a, b)
+
+    assert result.engine == "columnar"
+    assert result.row_count() == 9
+    assert result.get_rows()[4]["A_name"] == "Боб"
@@ -0,0 +1,78 @@
+# tests/test_complex_columns.py
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+from core.complex_columns import HAS_NUMPY, ComplexColumn
+
+
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed")),
+]
+
+
+def _make_table(engine: str) -> Table:
+    schema = Schema([Field("zi", "complexInteger"), Field("zr", "complexReal"), Field("id", "integer")])
+    t = Table("T", schema, engine=engine)
+    t.insert({"zi": "1+2i", "zr": "1,5-2i", "id": 1})
+    t.insert({"zi": "3-4i", "zr": "0.5i", "id": 2})
+    t.insert({"zi": "-2", "zr": "3", "id": 3})
+    return t
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_complex_integer_ops(engine: str, use_numpy: bool) -> None:
+    zi = _make_table(engine).complex_column("zi", use_numpy=use_numpy)
+
+    assert zi.to_list() == [(1, 2), (3, -4), (-2, 0)]
+    assert zi.add(zi).to_list() == [(2, 4), (6, -8), (-4, 0)]
+    assert zi.multiply((0, 1)).to_list() == [(-2, 1), (4, 3), (0, -2)]
+    assert zi.multiply(zi.conj()).to_list() == [(5, 0), (25, 0), (4, 0)]
+    assert list(zi.abs()) == pytest.approx([math.sqrt(5), 5.0, 2.0])
+    assert zi.sum() == (2, -2)
+    assert isinstance(zi.sum()[0], int)
+    assert zi.mean() == pytest.approx((2 / 3, -2 / 3))
+    with pytest.raises(TypeError):
+        zi.add((0.5, 0))
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_complex_real_ops(engine: str, use_numpy: bool) -> None:
+    zr = _make_table(engine).complex_column("zr", use_numpy=use_numpy)
+
+    assert zr.to_list() == [(1.5, -2.0), (0.0, 0.5), (3.0, 0.0)]
+    assert zr.add(1).to_list() == [(2.5, -2.0), (1.0, 0.5), (4.0, 0.0)]
+    assert zr.multiply(2j).to_list() == [(4.0, 3.0), (-1.0, 0.0), (0.0, 6.0)]
+    assert zr.conj().to_list() == [(1.5, 2.0), (0.0, -0.5), (3.0, -0.0)]
+    assert list(zr.abs()) == pytest.approx([2.5, 0.5, 3.0])
+    assert zr.sum() == pytest.approx((4.5, -1.5))
+    assert zr.mean() == pytest.approx((1.5, -0.5))
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+def test_complex_integer_sum_past_int64(use_numpy: bool) -> None:
+    #сума виходить за int64: обидва режими дають точне ціле, а не переповнення
+    big = 2**62
+    col = ComplexColumn([big] * 4 + [1], [-big] * 4 + [0], integer=True, use_numpy=use_numpy)
+    assert col.sum() == (4 * big + 1, -4 * big)
+    assert col.mean() == pytest.approx(((4 * big + 1) / 5, -4 * big / 5))
+    small = ComplexColumn([1, 2, -3], [5, 0, 7], integer=True, use_numpy=use_numpy)
+    assert small.sum() == (0, 12)
+
+
+def test_complex_column_rejects_other_types() -> None:
+    t = _make_table("rows")
+    with pytest.raises(TypeError):
+        t.complex_column("id")
+    with pytest.raises(TypeError):
+        t.complex_column("zi", use_numpy=False).add(t.complex_column("zr", use_numpy=False))
+    if not HAS_NUMPY:
+        with pytest.raises(ImportError):
+            t.complex_column("zi", use_numpy=True)
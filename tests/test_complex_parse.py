@@ -0,0 +1,122 @@
+# tests/test_complex_parse.py
+from __future__ import annotations
+
+import math
+import random
+from typing import Any
+
+import pytest
+
+from core.types_complex import ComplexIntegerType, ComplexRealType, parse_complex_strings, _parse_complex_string
+
+
+def _legacy_parse_complex_string(raw: str) -> tuple[float, float]:
+    #копія попередньої реалізації парсера - еталон для порівняння
+    s = raw.strip().lower().replace(" ", "")
+    if not s:
+        raise ValueError("empty complex string")
+    if "i" not in s:
+        try:
+            return float(s.replace(",", ".")), 0.0
+        except Exception as exc:
+            raise ValueError(raw) from exc
+    if not s.endswith("i"):
+        raise ValueError(raw)
+    core = s[:-1]
+    split_pos = -1
+    for i in range(len(core) - 1, 0, -1):
+        if core[i] in "+-":
+            split_pos = i
+            break
+    if split_pos == -1:
+        try:
+            return 0.0, float(core.replace(",", "."))
+        except Exception as exc:
+            raise ValueError(raw) from exc
+    re_str = core[:split_pos]
+    im_str = core[split_pos:]
+    try:
+        re = float(re_str.replace(",", ".")) if re_str else 0.0
+        im = float(im_str.replace(",", ".")) if im_str not in ("+", "-") else float(im_str + "1")
+        return re, im
+    except Exception as exc:
+        raise ValueError(raw) from exc
+
+
+def _legacy_real_parse(raw: Any) -> tuple[float, float]:
+    #попередній ComplexRealType.parse для кортежів/списків/словників
+    if isinstance(raw, tuple) and len(raw) == 2:
+        re, im = raw
+    elif isinstance(raw, list) and len(raw) == 2:
+        re, im = raw[0], raw[1]
+    elif isinstance(raw, dict) and "real" in raw and "imag" in raw:
+        re, im = raw["real"], raw["imag"]
+    else:
+        re, im = _legacy_parse_complex_string(str(raw))
+    try:
+        return float(str(re).replace(",", ".")), float(str(im).replace(",", "."))
+    except Exception as exc:
+        raise ValueError(raw) from exc
+
+
+#формати з README і типові варіації
+CORPUS = [
+    "2+3i", "4-5i", "3i", "7", "-7", "+7", "-3i", "+3i", "2+i", "2-i", "i", "-i", "+i",
+    "1,5+2,5i", "1.5-2.5i", "3,5i", ",5", ".5i", "5.", "5.+1.i", "0", "-0", "2-0i",
+    " 2 + 3i ", "\t4-5I\n", "2 +3 i", "2 3i", "1 000", "3 i", "- 3i", "+-3i", "2+-3i",
+    "1e5", "1e5+2i", "2+1e-5i", "1E3i", "inf", "-inf", "nan", "infi", "nani", "1_000+2i",
+    "", "   ", "abc", "i*i", "2+3", "2+3j", "1,2,3", "2++3i", "2+3ii", "++", "-", ".",
+    "12345678901234567890+98765432109876543210i", "1" * 400, "٣+٤i", "2+3İ",
+]
+
+
+def _outcome(fn: Any, raw: Any) -> Any:
+    try:
+        return ("ok", fn(raw))
+    except ValueError:
+        return ("error", None)
+
+
+def _same(a: Any, b: Any) -> bool:
+    if a[0] != b[0]:
+        return False
+    if a[0] == "error":
+        return True
+    return all(x == y or (math.isnan(x) and math.isnan(y)) for x, y in zip(a[1], b[1]))
+
+
+@pytest.mark.parametrize("raw", CORPUS)
+def test_corpus_matches_legacy_parser(raw: str) -> None:
+    assert _same(_outcome(_parse_complex_string, raw), _outcome(_legacy_parse_complex_string, raw))
+
+
+def test_random_strings_match_legacy_parser() -> None:
+    rnd = random.Random(8)
+    alphabet = "0123456789+-.,iI e"
+    for _ in range(20000):
+        raw = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 8)))
+        assert _same(_outcome(_parse_complex_string, raw), _outcome(_legacy_parse_complex_string, raw)), raw
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [(1, 2), [1.5, -2.25], {"real": 3, "imag": "4,5"}, (True, 1), (10 ** 400, 1), ("1,5", 2), (-0.0, float("inf"))],
+)
+def test_numeric_fast_paths_match_legacy(raw: Any) -> None:
+    assert _same(_outcome(ComplexRealType().parse, raw), _outcome(_legacy_real_parse, raw))
+
+
+def test_batch_parse() -> None:
+    assert parse_complex_strings(["2+3i", "4-5i", "3i", "7", "1,5"]) == [
+        (2.0, 3.0), (4.0, -5.0), (0.0, 3.0), (7.0, 0.0), (1.5, 0.0),
+    ]
+    assert ComplexIntegerType().parse_many(["2+3i", "4,6-5i", (1, 2)]) == [(2, 3), (5, -5), (1, 2)]
+    assert ComplexRealType().parse_many(["3i", [1, 2]]) == [(0.0, 3.0), (1.0, 2.0)]
+    with pytest.raises(ValueError, match="item 1"):
+        parse_complex_strings(["1", "abc"])
+    #різні значення (без кешу) і повтори (з кешем) дають те саме, номер помилки - теж
+    distinct = [f"{i}+{i}i" for i in range(600)]
+    assert parse_complex_strings(distinct)[599] == (599.0, 599.0)
+    assert parse_complex_strings(["7i"] * 600) == [(0.0, 7.0)] * 600
+    with pytest.raises(ValueError, match="item 500"):
+        parse_complex_strings(distinct[:500] + ["abc"])
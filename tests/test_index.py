@@ -0,0 +1,206 @@
+# tests/test_index.py
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+from core.database import Database
+from core.ops_cartesian import cartesian_product
+from storage.binary_storage import load_table_binary, save_table_binary
+from storage.file_storage import load_table, save_table
+
+
+def _schema() -> Schema:
+    return Schema([Field("id", "integer"), Field("z", "complexInteger"), Field("name", "string")])
+
+
+def _scan(table: Table, field: str, value) -> list:
+    return [r.as_dict() for r in table.scan() if r.get(field) == value]
+
+
+def _live(table: Table) -> list[int]:
+    #позиції невидалених рядків
+    return [i for i, _ in table.live_items()]
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+def test_lookup_parses_value_by_field_type(engine: str) -> None:
+    t = Table("T", _schema(), engine=engine)
+    t.insert({"id": 1, "z": "1+2i", "name": "a"})
+    t.insert({"id": 2, "z": "3", "name": "b"})
+    t.insert({"id": 3, "z": "1+2i", "name": "c"})
+    t.create_index("z")
+    t.create_index("id")
+
+    assert [r.get("id") for r in t.lookup("z", "1 + 2i")] == [1, 3]
+    assert [r.get("id") for r in t.lookup("z", (3, 0))] == [2]
+    assert [r.get("name") for r in t.lookup("id", "2")] == ["b"]
+    assert t.lookup("id", 42) == []
+    #без індексу - той самий результат перебором
+    assert [r.get("id") for r in t.lookup("name", "c")] == [3]
+
+    with pytest.raises(ValueError):
+        t.lookup("id", "abc")
+    with pytest.raises(KeyError):
+        t.create_index("missing")
+    with pytest.raises(ValueError):
+        t.create_index("id")
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+def test_index_follows_mutations(engine: str) -> None:
+    rnd = random.Random(13)
+    t = Table("T", _schema(), engine=engine)
+    t.create_index("id")
+    t.create_index("z")
+
+    def data() -> dict:
+        return {"id": rnd.randint(0, 5), "z": (rnd.randint(0, 2), rnd.randint(0, 2)), "name": "x"}
+
+    for step in range(300):
+        op = rnd.random()
+        if op < 0.4 or t.row_count() == 0:
+            t.insert(data())
+        elif op < 0.5:
+            t.insert_many([data(), {"id": "bad", "z": "0", "name": ""}], skip_invalid=step % 2 == 0)
+        elif op < 0.7:
+            t.update(rnd.choice(_live(t)), data())
+        elif op < 0.97:
+            t.delete(rnd.choice(_live(t)))
+        else:
+            t.compact()
+
+        probe = data()
+        assert [r.as_dict() for r in t.lookup("id", probe["id"])] == _scan(t, "id", probe["id"])
+        assert [r.as_dict() for r in t.lookup("z", probe["z"])] == _scan(t, "z", probe["z"])
+
+
+@pytest.mark.parametrize("storage_format", ["jsonl", "binary"])
+def test_index_definitions_persist(tmp_path: Path, storage_format: str) -> None:
+    db = Database("db", base_dir=str(tmp_path), storage_format=storage_format)
+    t = db.create_table("T", _schema())
+    t.insert({"id": 1, "z": "2i", "name": "a"})
+    t.insert({"id": 2, "z": "2i", "name": "b"})
+    db.save_all()
+    #створення індексу на вже збереженій таблиці теж потрапляє на диск
+    t.create_index("z")
+    db.save_all()
+    assert (db.base_path / "tables" / "T.indexes.json").exists()
+
+    db2 = Database("db", base_dir=str(tmp_path))
+    db2.load_all(lazy=True)
+    t2 = db2.get_table("T")
+    assert list(t2.indexes) == ["z"]
+    assert [r.get("name") for r in t2.lookup("z", "0+2i")] == ["a", "b"]
+    assert not t2.is_dirty
+
+    t2.drop_index("z")
+    db2.save_all()
+    db3 = Database("db", base_dir=str(tmp_path))
+    db3.load_all()
+    assert db3.get_table("T").indexes == {}
+
+
+def _ordered_table(engine: str = "rows") -> Table:
+    t = Table("R", Schema([Field("id", "integer"), Field("x", "real"), Field("c", "char")]), engine=engine)
+    for i, (x, c) in enumerate([(2.5, "b"), (-1.0, "a"), (2.5, "z"), (7.0, "c"), (0.0, "b")]):
+        t.insert({"id": i, "x": x, "c": c})
+    return t
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_range_min_max(indexed: bool) -> None:
+    t = _ordered_table()
+    if indexed:
+        t.create_index("x", kind="sorted")
+        t.create_index("c", kind="sorted")
+
+    ids = lambda rows: [r.get("id") for r in rows]
+    assert ids(t.range("x", 0, "2,5")) == [4, 0, 2]
+    assert ids(t.range("x", 0, 2.5, inclusive=False)) == []
+    assert ids(t.range("x", 0, 2.5, inclusive=(False, True))) == [0, 2]
+    assert ids(t.range("x", lo=2.5)) == [0, 2, 3]
+    assert ids(t.range("x", hi=0, inclusive=(True, False))) == [1]
+    assert ids(t.range("c", "b", "c")) == [0, 4, 3]
+    assert (t.min_value("x"), t.max_value("x")) == (-1.0, 7.0)
+    assert (t.min_value("c"), t.max_value("c")) == ("a", "z")
+
+
+def test_sorted_index_ordered_iteration_and_kinds() -> None:
+    t = _ordered_table()
+    with pytest.raises(KeyError):
+        t.ordered("x")
+    t.create_index("x", kind="sorted")
+    assert [r.get("id") for r in t.ordered("x")] == [1, 4, 0, 2, 3]
+    assert [r.get("id") for r in t.ordered("x", reverse=True)][0] == 3
+    assert [r.get("id") for r in t.lookup("x", "2.5")] == [0, 2]
+
+    with pytest.raises(TypeError):
+        Table("T", _schema()).create_index("z", kind="sorted")
+    with pytest.raises(ValueError):
+        t.create_index("id", kind="btree")
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+def test_sorted_index_follows_mutations(engine: str) -> None:
+    rnd = random.Random(14)
+    t = Table("R", Schema([Field("id", "integer"), Field("x", "real"), Field("c", "char")]), engine=engine)
+    t.create_index("x", kind="sorted")
+    t.create_index("id", kind="sorted")
+
+    def data() -> dict:
+        return {"id": rnd.randint(0, 20), "x": rnd.choice([rnd.uniform(-5, 5), 1.0, "nan"]), "c": "q"}
+
+    def scan_range(lo: int, hi: int) -> list:
+        #repr, бо nan != nan
+        found = [(r.get("id"), i, repr(r)) for i, r in t.live_items() if lo <= r.get("id") <= hi]
+        return [d for _, _, d in sorted(found, key=lambda item: item[:2])]
+
+    for step in range(300):
+        op = rnd.random()
+        if op < 0.5 or t.row_count() == 0:
+            t.insert(data())
+        elif op < 0.7:
+            t.update(rnd.choice(_live(t)), data())
+        else:
+            t.delete(rnd.choice(_live(t)))
+
+        lo = rnd.randint(0, 20)
+        hi = lo + rnd.randint(0, 8)
+        assert [repr(r) for r in t.range("id", lo, hi)] == scan_range(lo, hi)
+        finite = [r.get("x") for r in t.scan() if r.get("x") == r.get("x")]
+        assert t.min_value("x") == (min(finite) if finite else None)
+        assert t.max_value("x") == (max(finite) if finite else None)
+        assert len(list(t.ordered("x"))) == t.row_count()
+
+
+def test_sorted_index_kind_persists(tmp_path: Path) -> None:
+    db = Database("db", base_dir=str(tmp_path))
+    t = db.create_table("R", Schema([Field("id", "integer")]))
+    t.insert_many([{"id": i} for i in (5, 3, 9)])
+    t.create_index("id", kind="sorted")
+    db.save_all()
+
+    db2 = Database("db", base_dir=str(tmp_path))
+    db2.load_all()
+    t2 = db2.get_table("R")
+    assert t2.indexes["id"].kind == "sorted"
+    assert [r.get("id") for r in t2.ordered("id")] == [3, 5, 9]
+
+
+def test_save_lazy_product_of_indexed_tables(tmp_path: Path) -> None:
+    #представлення добутку індексів не має - збереження не повинно їх читати
+    a = Table("A", _schema())
+    a.insert_many([{"id": i, "z": (i, 0), "name": f"a{i}"} for i in range(3)])
+    a.create_index("id")
+    view = cartesian_product(a, a, lazy=True)
+
+    save_table(view, tmp_path)
+    save_table_binary(view, tmp_path)
+
+    assert load_table("A_x_A", tmp_path).row_count() == 9
+    assert load_table_binary("A_x_A", tmp_path).indexes == {}
@@ -0,0 +1,89 @@
+# tests/test_insert_many.py
+from __future__ import annotations
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+
+
+def _make_table(engine: str = "rows") -> Table:
+    schema = Schema([Field("id", "integer"), Field("z", "complexReal")])
+    return Table("T", schema, engine=engine)
+
+
+BATCH = [
+    {"id": 1, "z": "1+2i"},
+    {"id": "bad", "z": "0"},
+    {"id": 3},
+    {"id": 4, "z": (1, 1)},
+]
+
+
+def test_insert_many_all_or_nothing() -> None:
+    t = _make_table()
+
+    report = t.insert_many(BATCH)
+
+    assert not report.ok
+    assert report.inserted == 0
+    assert [i for i, _ in report.rejected] == [1, 2]
+    assert "missing field 'z'" in report.rejected[1][1]
+    assert t.row_count() == 0
+    assert not t.is_dirty
+
+
+def test_insert_many_skip_invalid() -> None:
+    t = _make_table()
+
+    report = t.insert_many(iter(BATCH), skip_invalid=True)
+
+    assert report.inserted == 2
+    assert [r["id"] for r in t.get_rows()] == [1, 4]
+    assert t.get_rows()[1]["z"] == (1.0, 1.0)
+    assert t.is_dirty
+
+
+@pytest.mark.parametrize("skip_invalid, expected", [(False, []), (True, [1])])
+def test_insert_many_storage_errors(skip_invalid: bool, expected: list[int]) -> None:
+    t = _make_table("columnar")
+
+    report = t.insert_many([{"id": 1, "z": "0"}, {"id": 2 ** 70, "z": "0"}], skip_invalid=skip_invalid)
+
+    assert report.rejected[0][0] == 1
+    assert [r["id"] for r in t.get_rows()] == expected
+
+
+def test_insert_many_rejects_values_too_large_for_the_type() -> None:
+    t = Table("T", Schema([Field("id", "integer"), Field("z", "complexInteger")]))
+
+    report = t.insert_many([{"id": 1, "z": "1e400i"}, {"id": 2, "z": "2+3i"}], skip_invalid=True)
+
+    assert report.inserted == 1
+    assert [i for i, _ in report.rejected] == [0]
+    assert "too large" in report.rejected[0][1]
+    with pytest.raises(ValueError):
+        t.insert({"id": 3, "z": "1e400"})
+    with pytest.raises(ValueError):
+        t.schema.fields[1].type_obj.parse_many(["1", "1e400i"])
+
+
+def test_insert_many_parses_columns_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    from core.types_complex import ComplexRealType
+
+    calls = []
+    original = ComplexRealType.parse_many
+
+    def spy(self, raws):
+        calls.append(len(raws))
+        return original(self, raws)
+
+    monkeypatch.setattr(ComplexRealType, "parse_many", spy)
+    t = _make_table()
+    report = t.insert_many([{"id": i, "z": f"{i}+1i"} for i in range(100)] + BATCH, skip_invalid=True)
+
+    #одна пакетна розбірка колонки z на весь пакет (рядок без z до неї не потрапляє)
+    assert calls == [103]
+    assert report.inserted == 102
+    assert [i for i, _ in report.rejected] == [101, 102]
+    assert t.get_rows()[5]["z"] == (5.0, 1.0)
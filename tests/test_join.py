@@ -0,0 +1,93 @@
+# tests/test_join.py
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+from core.database import Database
+from core.ops_cartesian import cartesian_product
+from core.ops_join import hash_join
+
+
+def _tables(n_a: int, n_b: int, seed: int = 16) -> tuple[Table, Table]:
+    rnd = random.Random(seed)
+    a = Table("A", Schema([Field("id", "integer"), Field("z", "complexInteger")]))
+    b = Table("B", Schema([Field("a_id", "real"), Field("name", "string")]))
+    a.insert_many([{"id": rnd.randint(0, 9), "z": (i, 0)} for i in range(n_a)])
+    b.insert_many([{"a_id": rnd.randint(0, 12), "name": f"b{i}"} for i in range(n_b)])
+    return a, b
+
+
+def _expected(a: Table, b: Table) -> list[tuple]:
+    #через декартів добуток і фільтр - повільно, але очевидно правильно
+    product = cartesian_product(a, b)
+    return sorted(r.values() for r in product.rows if r.get("A_id") == r.get("B_a_id"))
+
+
+@pytest.mark.parametrize("sizes", [(30, 8), (8, 30), (0, 5), (5, 0)])
+def test_inner_join_matches_filtered_product(sizes) -> None:
+    a, b = _tables(*sizes)
+    view = hash_join(a, b, "id", "a_id")
+    rows = view.get_rows()
+    assert sorted(r.values() for r in rows) == _expected(a, b)
+    assert view.row_count() == len(rows)
+    assert view.schema.field_names() == ["A_id", "A_z", "B_a_id", "B_name"]
+
+
+@pytest.mark.parametrize("sizes", [(30, 8), (8, 30)])
+def test_left_join_keeps_unmatched_rows(sizes) -> None:
+    a, b = _tables(*sizes)
+    view = hash_join(a, b, "id", "a_id", how="left")
+    rows = view.get_rows()
+    keys_b = {r.get("a_id") for r in b.rows}
+    unmatched = [r for r in rows if r.get("B_name") is None]
+
+    assert sorted(r.values() for r in rows if r.get("B_name") is not None) == _expected(a, b)
+    assert sorted(r.get("A_z") for r in unmatched) == sorted(r.get("z") for r in a.rows if r.get("id") not in keys_b)
+    assert view.row_count() == len(rows)
+    if unmatched:
+        with pytest.raises(TypeError):
+            view.to_table()
+
+
+def test_join_streams_and_materializes() -> None:
+    a, b = _tables(50, 5)
+    it = iter(hash_join(a, b, "id", "a_id"))
+    first = next(it)
+    assert first.get("A_id") == first.get("B_a_id")
+
+    t = hash_join(a, b, "id", "a_id", result_name="J").to_table(engine="columnar")
+    assert t.name == "J" and t.is_dirty
+    assert t.row_count() == hash_join(a, b, "id", "a_id").row_count()
+
+
+def test_join_checks_fields() -> None:
+    a, b = _tables(3, 3)
+    with pytest.raises(KeyError):
+        hash_join(a, b, "nope", "a_id")
+    with pytest.raises(TypeError):
+        hash_join(a, b, "z", "name")
+    with pytest.raises(ValueError):
+        hash_join(a, b, "id", "a_id", how="outer")
+
+
+def test_database_join_registers_result(tmp_path: Path) -> None:
+    db = Database("join_db", base_dir=str(tmp_path))
+    a, b = _tables(30, 8)
+    db.tables["A"], db.tables["B"] = a, b
+    t = db.join("A", "B", "id", "a_id")
+    assert db.get_table("A_join_B") is t
+    assert sorted(r.values() for r in t.rows) == _expected(a, b)
+    with pytest.raises(ValueError):
+        db.join("A", "B", "id", "a_id")
+
+    #прогноз перевіряється бюджетом до побудови результату
+    strict = Database("join_db", base_dir=str(tmp_path), memory_budget=1, budget_policy="refuse")
+    strict.tables["A"], strict.tables["B"] = a, b
+    with pytest.raises(MemoryError):
+        strict.join("A", "B", "id", "a_id")
+    assert "A_join_B" not in strict.tables
@@ -0,0 +1,93 @@
+# tests/test_memory.py
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+from core.database import Database
+from core.memory import deep_size, estimate_product_bytes
+from core.ops_cartesian import CartesianView
+
+
+def _schema() -> Schema:
+    return Schema([Field("id", "integer"), Field("z", "complexReal"), Field("name", "string")])
+
+
+def _fill(t: Table, n: int) -> Table:
+    t.insert_many([{"id": 1000 + i, "z": (i / 2, -i), "name": f"рядок {i}"} for i in range(n)])
+    return t
+
+
+def test_deep_size_counts_nested_values() -> None:
+    pair = (1.5, -2.5)
+    assert deep_size(pair) == sys.getsizeof(pair) + 2 * sys.getsizeof(1.5)
+    assert deep_size({"a": [1, 2]}) > sys.getsizeof({"a": [1, 2]})
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+def test_table_memory_usage_per_column(engine: str) -> None:
+    t = _fill(Table("T", _schema(), engine=engine), 2000)
+    usage = t.memory_usage()
+    assert set(usage["columns"]) == {"id", "z", "name"}
+    assert all(size > 0 for size in usage["columns"].values())
+    assert usage["total"] == usage["overhead"] + usage["indexes"] + sum(usage["columns"].values())
+    if engine == "columnar":
+        #два масиви double по 8 байтів на значення
+        assert usage["columns"]["z"] >= 2 * 8 * 2000
+    else:
+        #вибірка дає ту саму оцінку, що й повний підрахунок, для однорідних даних
+        exact = t.memory_usage(sample=None)
+        assert abs(usage["total"] - exact["total"]) < exact["total"] * 0.05
+
+    t.create_index("id", kind="sorted")
+    t.index_for("id")
+    assert t.memory_usage()["indexes"] > 0
+    bigger = _fill(Table("T", _schema(), engine=engine), 4000).memory_usage()["total"]
+    assert bigger > usage["total"]
+
+
+def test_lazy_table_and_view_use_no_memory(tmp_path: Path) -> None:
+    db = Database("db", tmp_path)
+    _fill(db.create_table("T", _schema()), 50)
+    db.save_all()
+    lazy = Database("db", tmp_path)
+    lazy.load_all(lazy=True)
+    assert lazy.memory_usage()["total"] == 0
+    assert not lazy.get_table("T").loaded
+    lazy.get_table("T").rows
+    assert lazy.memory_usage()["tables"]["T"]["total"] > 0
+
+    view = lazy.cartesian_product("T", "T", lazy=True)
+    assert isinstance(view, CartesianView) and view.memory_usage()["total"] == 0
+    assert view.row_count() == 2500 and "T_x_T" not in lazy.tables
+
+
+def test_product_estimate_and_budget(tmp_path: Path) -> None:
+    db = Database("db", tmp_path, memory_budget=100_000)
+    a = _fill(db.create_table("A", _schema()), 30)
+    b = _fill(db.create_table("B", _schema()), 40)
+    projected = estimate_product_bytes(a, b)
+    assert projected > 30 * 40 * 100
+    #без спільних об'єктів значень (паралельний добуток) рядок дорожчий
+    assert estimate_product_bytes(a, b, shared_values=False) > estimate_product_bytes(a, b, shared_values=True)
+
+    assert db.exceeds_budget(projected)
+    with pytest.warns(RuntimeWarning, match="memory budget"):
+        result = db.cartesian_product("A", "B")
+    assert result.row_count() == 1200 and "A_x_B" in db.tables
+
+    db.budget_policy = "refuse"
+    with pytest.raises(MemoryError):
+        db.cartesian_product("B", "A")
+    assert "B_x_A" not in db.tables
+    #ліниве представлення пам'яті не займає і бюджетом не обмежується
+    assert db.cartesian_product("B", "A", lazy=True).row_count() == 1200
+
+    db.memory_budget = None
+    assert db.check_memory(10 ** 12, "anything")
+    with pytest.raises(ValueError):
+        Database("db", tmp_path, budget_policy="ignore")
@@ -0,0 +1,109 @@
+# tests/test_query.py
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+from core.database import Database
+from core.query import Query, parse_query
+
+
+def _make_db(tmp_path: Path, engine: str = "rows") -> Database:
+    db = Database("q", base_dir=str(tmp_path), engine=engine)
+    t = db.create_table(
+        "people",
+        Schema([Field("id", "integer"), Field("x", "real"), Field("z", "complexInteger"), Field("name", "string")]),
+    )
+    rnd = random.Random(15)
+    for i in range(200):
+        t.insert({
+            "id": i,
+            "x": rnd.randint(0, 50) / 2,
+            "z": (rnd.randint(0, 3), rnd.randint(0, 3)),
+            "name": rnd.choice(["ann", "bob", "ann lee"]),
+        })
+    return db
+
+
+def _brute(t: Table, pred) -> list[int]:
+    return [r.get("id") for r in t.rows if pred(r)]
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+@pytest.mark.parametrize("indexes", [(), (("id", "sorted"), ("z", "hash"), ("x", "sorted"))])
+def test_query_matches_brute_force(tmp_path: Path, engine: str, indexes) -> None:
+    db = _make_db(tmp_path, engine)
+    t = db.get_table("people")
+    for field_name, kind in indexes:
+        t.create_index(field_name, kind=kind)
+
+    q = Query(t).where("z", "=", "1+2i").where("x", ">", "3,5")
+    assert [r.get("id") for r in q] == _brute(t, lambda r: r.get("z") == (1, 2) and r.get("x") > 3.5)
+
+    q = Query(t).where("id", ">=", 20).where("id", "<", 40).where("id", "!=", 25)
+    assert [r.get("id") for r in q] == [i for i in range(20, 40) if i != 25]
+
+    q = Query(t).where("x", "<=", 2).select("name", "id").limit(3)
+    rows = q.rows()
+    assert [r.field_names() for r in rows] == [["name", "id"]] * len(rows)
+    assert [r.get("id") for r in rows] == _brute(t, lambda r: r.get("x") <= 2)[:3]
+
+    plan = q.explain()
+    if indexes:
+        assert plan[0].startswith("sorted index range on x")
+    else:
+        assert plan[0] == "full scan people"
+    assert plan[1:] == ["filter x <= 2.0", "project name, id", "limit 3"]
+
+
+def test_parse_query(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    t = db.get_table("people")
+
+    rows = parse_query("SELECT id, name FROM people WHERE name = 'ann lee' and id < 50 LIMIT 2", db).rows()
+    assert [r.get("id") for r in rows] == _brute(t, lambda r: r.get("name") == "ann lee" and r.get("id") < 50)[:2]
+    assert rows[0].field_names() == ["id", "name"]
+
+    rows = parse_query("select * from people where z=2+1i", db).rows()
+    assert [r.get("id") for r in rows] == _brute(t, lambda r: r.get("z") == (2, 1))
+    assert len(parse_query("select * from people", db).rows()) == 200
+
+    with pytest.raises(ValueError):
+        parse_query("select from people", db)
+    with pytest.raises(ValueError):
+        parse_query("select * from people where id = 1 or id = 2", db)
+    with pytest.raises(ValueError):
+        parse_query("select * from people where id = abc", db)
+    with pytest.raises(KeyError):
+        parse_query("select * from nope", db)
+    with pytest.raises(KeyError):
+        parse_query("select nope from people", db)
+    with pytest.raises(TypeError):
+        parse_query("select * from people where z > 1", db)
+
+
+def test_query_is_lazy() -> None:
+    t = Table("T", Schema([Field("id", "integer")]))
+    t.insert_many([{"id": i} for i in range(10)])
+    seen = []
+    t.rows = _Spy(t.rows, seen)
+    it = iter(Query(t).where("id", ">", -1).limit(2))
+    assert [r.get("id") for r in it] == [0, 1]
+    assert len(seen) <= 3
+
+
+class _Spy(list):
+    #список, що запам'ятовує, скільки рядків з нього прочитали
+
+    def __init__(self, rows, seen) -> None:
+        super().__init__(rows)
+        self._seen = seen
+
+    def __iter__(self):
+        for row in super().__iter__():
+            self._seen.append(row)
+            yield row
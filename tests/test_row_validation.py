@@ -36,3 +36,33 @@ def test_type_mismatch_fails(simple_schema: Schema) -> None:
     raw = {"id": "not_int", "name": "Test", "score": 1.0}
     with pytest.raises(ValueError):
         simple_schema.validate_row(raw)
+
+
+def test_row_builder_and_extend_trusted(simple_schema: Schema) -> None:
+    from core.table import Table
+
+    build = simple_schema.row_builder()
+    row = build((3, "Carol", 1.5))
+    assert row.as_dict() == {"id": 3, "name": "Carol", "score": 1.5}
+
+    t = Table("T", simple_schema)
+    added = t.extend_trusted([row, build((4, "Dan", 2.0))])
+    assert added == 2
+    assert t.row_count() == 2
+    assert t.is_dirty
+
+
+def test_rows_share_schema_field_index(simple_schema: Schema) -> None:
+    r1 = simple_schema.make_row({"id": 1, "name": "A", "score": 1})
+    r2 = Row({"id": 2, "name": "B", "score": 2.0})
+
+    #обидва рядки ділять один індекс полів зі схемою і не мають власного __dict__
+    assert r1._index is simple_schema.field_index
+    assert r2._index is simple_schema.field_index
+    assert not hasattr(r1, "__dict__")
+    assert r1.values() == (1, "A", 1.0)
+    assert r2.get("name") == "B"
+
+    r2["name"] = "C"
+    assert r2.as_dict() == {"id": 2, "name": "C", "score": 2.0}
+    assert simple_schema.serialize_values(r2.values()) == {"id": 2, "name": "C", "score": 2.0}
@@ -0,0 +1,70 @@
+# tests/test_scan.py
+from __future__ import annotations
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import RowsView, Table
+from core.ops_cartesian import cartesian_product
+
+
+def _table(n: int, engine: str = "rows") -> Table:
+    t = Table("T", Schema([Field("id", "integer"), Field("name", "string")]), engine=engine)
+    t.insert_many([{"id": i, "name": f"r{i}"} for i in range(n)])
+    return t
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+def test_scan_is_a_view_not_a_copy(engine: str) -> None:
+    t = _table(5, engine)
+    view = t.scan()
+    assert isinstance(view, RowsView)
+    assert len(view) == 5
+    assert view[0].as_dict() == {"id": 0, "name": "r0"}
+    assert [r["id"] for r in view[1:3]] == [1, 2]
+    #представлення бачить наступні зміни таблиці
+    t.insert({"id": 5, "name": "r5"})
+    assert len(view) == 6 and view[-1]["id"] == 5
+    assert not hasattr(view, "append")
+
+
+def test_iteration_is_bounded_to_rows_at_start() -> None:
+    t = _table(3)
+    seen = []
+    for row in t.scan():
+        seen.append(row["id"])
+        t.insert({"id": row["id"] + 100, "name": "new"})
+    assert seen == [0, 1, 2]
+    assert t.row_count() == 6
+
+
+def test_scan_skips_deleted_rows() -> None:
+    t = _table(6)
+    t.delete(1)
+    t.delete(4)
+    view = t.scan()
+    assert [r["id"] for r in view] == [0, 2, 3, 5]
+    assert len(view) == 4
+    assert view[1]["id"] == 2 and view[-1]["id"] == 5
+    with pytest.raises(IndexError):
+        view[4]
+    assert [r["id"] for r in t.scan(include_deleted=True)] == list(range(6))
+
+    #компактизація посеред перебору не ламає його
+    it = iter(view)
+    assert next(it)["id"] == 0
+    t.compact()
+    assert [r["id"] for r in it] == [2, 3, 5]
+
+
+def test_cartesian_uses_scan_without_copies(monkeypatch: pytest.MonkeyPatch) -> None:
+    a, b = _table(3), _table(4)
+
+    def no_copy(self: Table) -> list:
+        raise AssertionError("get_rows() copies the table")
+
+    monkeypatch.setattr(Table, "get_rows", no_copy)
+    result = cartesian_product(a, b)
+    assert result.row_count() == 12
+    assert result.scan()[5].as_dict() == {"A_id": 1, "A_name": "r1", "B_id": 1, "B_name": "r1"}
+    assert cartesian_product(a, b, lazy=True).scan()[5]["B_id"] == 1
@@ -0,0 +1,93 @@
+# tests/test_stats.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+from core.database import Database
+from core.ops_cartesian import cartesian_product
+from core.stats import Stats, global_stats, profile_call, timed
+
+
+@pytest.fixture
+def stats() -> Iterator[Stats]:
+    global_stats.reset()
+    global_stats.enable()
+    yield global_stats
+    global_stats.disable()
+    global_stats.reset()
+
+
+def _schema() -> Schema:
+    return Schema([Field("id", "integer"), Field("z", "complexReal"), Field("s", "string")])
+
+
+def test_disabled_collects_nothing() -> None:
+    global_stats.reset()
+    assert not global_stats.enabled
+    _schema().validate_row({"id": "1", "z": "1+2i", "s": "x"})
+    cartesian_product(Table("A", _schema()), Table("B", _schema()))
+    assert global_stats.snapshot() == {}
+
+
+def test_validation_is_broken_down_per_type(stats: Stats) -> None:
+    schema = _schema()
+    for i in range(5):
+        assert schema.validate_row({"id": str(i), "z": "1+2i", "s": "x"})["z"] == (1.0, 2.0)
+    with pytest.raises(ValueError):
+        schema.validate_row({"id": "1"})
+    data = stats.snapshot()
+    assert data["validate.integer"]["calls"] == 6
+    assert data["validate.complexReal"]["calls"] == 5
+    assert data["validate.string"]["calls"] == 5
+    assert data["schema.validate_row"]["calls"] == 5
+
+
+def test_storage_and_cartesian_are_timed(stats: Stats, tmp_path: Path) -> None:
+    db = Database("db", tmp_path)
+    t = db.create_table("T", _schema())
+    t.insert_many([{"id": i, "z": (i, 0), "s": "x"} for i in range(10)])
+    cartesian_product(t, t)
+    db.save_all()
+    loaded = Database("db", tmp_path)
+    loaded.load_all()
+    data = stats.snapshot()
+    assert data["ops.cartesian_product"]["calls"] == 1
+    assert data["db.save_all"]["calls"] == 1 and data["storage.save_table"]["calls"] == 1
+    assert data["db.load_all"]["calls"] == 1 and data["storage.load_table"]["calls"] == 1
+    for name in ("save.serialize_values", "save.json_encode", "save.file_write",
+                 "load.json_decode", "load.decode_values", "load.build_rows"):
+        assert data[name]["calls"] == 10
+    assert data["db.save_all"]["seconds"] >= data["storage.save_table"]["seconds"]
+    assert [r.as_dict() for r in loaded.get_table("T").scan()] == [r.as_dict() for r in t.scan()]
+
+    path = tmp_path / "stats.json"
+    stats.dump(path)
+    dumped = json.loads(path.read_text(encoding="utf-8"))
+    assert dumped["enabled"] is True
+    assert dumped["operations"]["db.save_all"]["calls"] == 1
+
+
+def test_timed_decorator_and_profile(stats: Stats) -> None:
+    @timed("test.work")
+    def work(n: int) -> int:
+        if n < 0:
+            raise ValueError("negative")
+        return sum(range(n))
+
+    assert work(10) == 45
+    with pytest.raises(ValueError):
+        work(-1)
+    assert stats.snapshot()["test.work"]["calls"] == 2
+    with stats.timer("test.block"):
+        work(5)
+    assert stats.snapshot()["test.block"]["calls"] == 1
+
+    result, report = profile_call(work, 100, limit=5)
+    assert result == 4950
+    assert "work" in report and "function calls" in report
@@ -0,0 +1,256 @@
+# tests/test_storage.py
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from core.schema import Field, Schema
+from core.database import Database
+from core.ops_cartesian import cartesian_product
+
+
+def _make_db(tmp_path: Path) -> Database:
+    db = Database("test_db", base_dir=str(tmp_path))
+    t = db.create_table("people", Schema([Field("id", "integer"), Field("z", "complexInteger")]))
+    t.insert({"id": 1, "z": "1+2i"})
+    return db
+
+
+def _rows_file(db: Database, name: str) -> Path:
+    return db.base_path / "tables" / f"{name}.rows.jsonl"
+
+
+def _read_ids(db: Database, name: str) -> list[int]:
+    with open(_rows_file(db, name), encoding="utf-8") as f:
+        return [json.loads(line)["id"] for line in f if line.strip()]
+
+
+def test_save_all_skips_clean_tables(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    db.save_all()
+
+    #чиста таблиця не переписується: видалений файл не з'являється знову
+    _rows_file(db, "people").unlink()
+    db.save_all()
+    assert not _rows_file(db, "people").exists()
+
+
+def test_inserts_are_appended(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    db.save_all()
+
+    #позначка у файлі переживе дописування, але не повний перезапис
+    with open(_rows_file(db, "people"), "a", encoding="utf-8") as f:
+        f.write('{"id": 99, "z": {"real": 0, "imag": 0}}\n')
+
+    db.get_table("people").insert({"id": 2, "z": "3i"})
+    db.save_all()
+
+    assert _read_ids(db, "people") == [1, 99, 2]
+    meta = json.loads((db.base_path / "tables" / "people.meta.json").read_text())
+    assert meta == {"rows": 2}
+
+
+def test_delete_is_recorded_without_rewrite(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    t = db.get_table("people")
+    t.insert_many([{"id": i, "z": f"{i}i"} for i in range(2, 9)])
+    db.save_all()
+
+    #видалення лише позначається, позиції інших рядків не зсуваються
+    t.delete(0)
+    assert t.get_rows()[0]["id"] == 2
+    assert t.is_deleted(0) and t.row_count() == 7
+    with pytest.raises(IndexError):
+        t.update(0, {"id": 0, "z": "0"})
+    t.insert({"id": 9, "z": "1-1i"})
+    db.save_all()
+    #файл рядків лише дописаний, видалений рядок у ньому лишився
+    assert _read_ids(db, "people") == list(range(1, 10))
+    meta = json.loads((db.base_path / "tables" / "people.meta.json").read_text())
+    assert meta == {"rows": 9, "dead": 1}
+
+    db2 = Database("test_db", base_dir=str(tmp_path))
+    db2.load_all(lazy=True)
+    loaded = db2.get_table("people")
+    assert loaded.row_count() == 8
+    assert [r["id"] for r in loaded.get_rows()] == list(range(2, 10))
+    assert loaded.is_deleted(0)
+    assert loaded.persisted_rows == 9
+
+
+def test_compaction_past_threshold(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    t = db.get_table("people")
+    t.insert_many([{"id": i, "z": "0"} for i in range(2, 11)])
+    t.create_index("id")
+    db.save_all()
+
+    assert t.delete_where(lambda r: r["id"] % 5 == 0) == 2
+    assert not t.needs_compaction()
+    db.save_all()
+    assert len(_read_ids(db, "people")) == 10
+
+    #після порогу delete_where одразу прибирає видалені рядки з пам'яті, а save_all - з файлу
+    assert t.delete_where(lambda r: r["id"] < 4) == 3
+    assert t.dead_count() == 0 and t.row_count() == 5
+    db.save_all()
+    assert _read_ids(db, "people") == [4, 6, 7, 8, 9]
+    assert [r["id"] for r in t.lookup("id", 8)] == [8]
+    assert not (db.base_path / "tables" / "people.tombstones.json").exists()
+
+    t.delete(0)
+    db.compact("people")
+    assert _read_ids(db, "people") == [6, 7, 8, 9]
+
+
+def test_lazy_load_reads_rows_on_first_access(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    db.get_table("people").insert({"id": 2, "z": "3i"})
+    db.save_all()
+
+    db2 = Database("test_db", base_dir=str(tmp_path))
+    db2.load_all(lazy=True)
+    t = db2.get_table("people")
+
+    #кількість береться зі службового файлу, рядки ще не прочитані
+    assert not t.loaded
+    assert t.row_count() == 2
+    assert not t.loaded
+
+    #збереження не чіпає непрочитану таблицю
+    db2.save_all()
+    assert not t.loaded
+
+    t.insert({"id": 3, "z": "5"})
+    assert t.loaded
+    assert [r["id"] for r in t.get_rows()] == [1, 2, 3]
+    db2.save_all()
+    assert _read_ids(db2, "people") == [1, 2, 3]
+
+
+def test_lazy_load_without_meta_file(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    db.save_all()
+    (db.base_path / "tables" / "people.meta.json").unlink()
+
+    db2 = Database("test_db", base_dir=str(tmp_path))
+    db2.load_all(lazy=True)
+    #без службового файлу кількість невідома, і дізнатись її без читання таблиці не можна
+    assert db2.get_table("people").known_row_count() is None
+    assert not db2.get_table("people").loaded
+    assert not (db.base_path / "tables" / "people.meta.json").exists()
+    assert db2.get_table("people").row_count() == 1
+    assert db2.get_table("people").known_row_count() == 1
+    #після першого читання службовий файл відновлюється
+    assert (db.base_path / "tables" / "people.meta.json").exists()
+
+
+def test_parallel_load_merges_chunks_and_reports_errors(tmp_path: Path) -> None:
+    from storage.file_storage import load_tables_parallel
+
+    db = _make_db(tmp_path)
+    t = db.get_table("people")
+    for i in range(2, 200):
+        t.insert({"id": i, "z": f"{i}-{i}i"})
+    broken = db.create_table("broken", Schema([Field("id", "integer")]))
+    broken.insert({"id": 1})
+    db.save_all()
+    with open(_rows_file(db, "broken"), "a", encoding="utf-8") as f:
+        f.write('{"id": "not_int"}\n')
+
+    #маленькі шматки, щоб файл точно розбився на кілька частин
+    tables, errors = load_tables_parallel(
+        ["people", "broken"], base_path=db.base_path, workers=2, chunk_bytes=512, verify=True
+    )
+
+    assert list(tables) == ["people"]
+    assert [r["id"] for r in tables["people"].get_rows()] == list(range(1, 200))
+    assert tables["people"].get_rows()[5]["z"] == (6, -6)
+    assert isinstance(errors["broken"], ValueError)
+
+    db2 = Database("test_db", base_dir=str(tmp_path))
+    assert set(db2.load_all(workers=2, verify=True)) == {"broken"}
+    assert db2.list_tables() == ["people"]
+    #перелік таблиць на диску не втрачає таблицю з помилкою
+    db2.save_all(full=True)
+    meta = json.loads((db.base_path / "db_meta.json").read_text())
+    assert meta["tables"] == ["people", "broken"]
+
+
+def test_trusted_and_verified_decoders_agree(tmp_path: Path) -> None:
+    schema = Schema(
+        [
+            Field("id", "integer"),
+            Field("score", "real"),
+            Field("flag", "char"),
+            Field("name", "string"),
+            Field("zi", "complexInteger"),
+            Field("zr", "complexReal"),
+        ]
+    )
+    row = schema.make_row({"id": 1, "score": 2, "flag": "x", "name": "n", "zi": "1-2i", "zr": "3,5i"})
+    raw = json.loads(json.dumps(schema.serialize_values(row.values())))
+
+    trusted = schema.compile_decoder()(raw)
+    assert trusted == schema.compile_decoder(verify=True)(raw) == row.values()
+    assert isinstance(trusted[1], float)
+
+    raw["id"] = "not_int"
+    with pytest.raises(ValueError):
+        schema.compile_decoder(verify=True)(raw)
+    with pytest.raises(ValueError):
+        schema.compile_decoder()({"id": 1})
+
+
+def test_cartesian_to_disk_streams_into_lazy_table(tmp_path: Path) -> None:
+    db = Database("spill", base_dir=str(tmp_path))
+    a = db.create_table("A", Schema([Field("id", "integer")]))
+    b = db.create_table("B", Schema([Field("z", "complexInteger"), Field("s", "string")]))
+    a.insert_many([{"id": i} for i in range(30)])
+    b.insert_many([{"z": (i, -i), "s": f"рядок\\n{i}"} for i in range(7)])
+    reports = []
+
+    #крихітний бюджет - блок з одного рядка A
+    table = db.cartesian_to_disk("A", "B", memory_budget=1, progress=lambda *r: reports.append(r))
+
+    assert table.name == "A_x_B" and not table.loaded
+    assert table.row_count() == 210
+    assert len(reports) == 30
+    assert reports[-1][:2] == (210, 210)
+    assert all(speed >= 0 for _, _, speed in reports)
+
+    with open(db.base_path / "db_meta.json", encoding="utf-8") as f:
+        assert "A_x_B" in json.load(f)["tables"]
+
+    expected = [r.values() for r in cartesian_product(a, b).rows]
+    db2 = Database("spill", base_dir=str(tmp_path))
+    db2.load_all(lazy=True)
+    assert [r.values() for r in db2.get_table("A_x_B").rows] == expected
+
+    with pytest.raises(ValueError):
+        db.cartesian_to_disk("A", "B")
+    b.insert({"z": (7, -7), "s": "ще"})
+    assert db.cartesian_to_disk("A", "B", replace=True).row_count() == 240
+    with pytest.raises(ValueError):
+        db.cartesian_to_disk("A_x_B", "B", result_name="A_x_B", replace=True)
+
+
+def test_cartesian_to_disk_replaces_dropped_table_files(tmp_path: Path) -> None:
+    #стара таблиця A_x_B з іншими полями, індексом і видаленими рядками
+    db = Database("spill", base_dir=str(tmp_path))
+    old = db.create_table("A_x_B", Schema([Field("foo", "integer")]))
+    old.insert_many([{"foo": i} for i in range(3)])
+    old.create_index("foo")
+    old.delete(0)
+    db.create_table("A", Schema([Field("id", "integer")])).insert_many([{"id": i} for i in range(4)])
+    db.create_table("B", Schema([Field("s", "string")])).insert_many([{"s": "x"}, {"s": "y"}])
+    db.save_all()
+    db.drop_table("A_x_B")
+
+    table = db.cartesian_to_disk("A", "B")
+    assert table.row_count() == 8
+    assert table.indexes == {}
+    assert [r.values() for r in table.rows][0] == (0, "x")
@@ -0,0 +1,148 @@
+# tests/test_table_cache.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from core.schema import Field, Schema
+from core.database import Database
+from core.table import Table
+from core.table_cache import TableCache
+
+
+def _schema() -> Schema:
+    return Schema([Field("id", "integer"), Field("z", "complexReal"), Field("name", "string")])
+
+
+def _make_db(tmp_path: Path, storage_format: str = "jsonl", **cache: int) -> Database:
+    #три збережені таблиці по 200 рядків, потім база відкривається заново з кешем
+    db = Database("cache_db", base_dir=str(tmp_path), storage_format=storage_format)
+    for name in ("a", "b", "c"):
+        t = db.create_table(name, _schema())
+        t.insert_many([{"id": i, "z": (i, -i), "name": f"{name} {i}"} for i in range(200)])
+    db.save_all()
+    db = Database("cache_db", base_dir=str(tmp_path), **cache)
+    db.load_all()
+    return db
+
+
+def _use(db: Database, name: str) -> Table:
+    #звернення через get_table і читання рядків (лише тоді таблиця дочитується з диску)
+    table = db.get_table(name)
+    table.rows
+    return table
+
+
+def _resident(db: Database) -> set[str]:
+    return {name for name, t in db.tables.items() if t.loaded}
+
+
+def test_cache_limits_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        TableCache({}, lambda t: None, max_tables=0)
+    with pytest.raises(ValueError):
+        TableCache({}, lambda t: None, max_bytes=-1)
+
+
+@pytest.mark.parametrize("storage_format", ["jsonl", "binary"])
+def test_lru_eviction_by_table_count(tmp_path: Path, storage_format: str) -> None:
+    db = _make_db(tmp_path, storage_format, cache_tables=2)
+    assert _resident(db) == set()
+
+    _use(db, "a")
+    _use(db, "b")
+    _use(db, "a") #b тепер найдавніша
+    _use(db, "c")
+
+    assert _resident(db) == {"a", "c"}
+    stats = db.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 3, 1)
+    assert stats["resident_tables"] == 2
+
+    #витіснена таблиця дочитується з тими самими рядками
+    b = _use(db, "b")
+    assert [r.as_dict() for r in b.scan()][5] == {"id": 5, "z": (5.0, -5.0), "name": "b 5"}
+    assert b.row_count() == 200
+    assert _resident(db) == {"b", "c"}
+
+
+def test_eviction_by_bytes_keeps_budget(tmp_path: Path) -> None:
+    one = _make_db(tmp_path).get_table("a").memory_usage()["total"]
+    db = Database("cache_db", base_dir=str(tmp_path), cache_bytes=int(one * 1.5))
+    db.load_all()
+
+    for name in ("a", "b", "c", "a"):
+        _use(db, name)
+        assert len(_resident(db)) == 1
+    assert db.cache_stats()["evictions"] == 3
+    assert db.cache_stats()["resident_bytes"] <= one * 1.5
+
+
+@pytest.mark.parametrize("storage_format", ["jsonl", "binary"])
+def test_dirty_table_is_flushed_before_eviction(tmp_path: Path, storage_format: str) -> None:
+    db = _make_db(tmp_path, storage_format, cache_tables=1)
+    a = _use(db, "a")
+    a.insert({"id": 999, "z": (0, 0), "name": "новий"})
+    a.delete(0)
+    new = db.create_table("d", _schema())
+    new.insert({"id": 1, "z": (1, 1), "name": "d"})
+
+    _use(db, "b") #витісняє змінену a і ще не збережену d
+
+    assert not a.loaded and not new.loaded
+    assert db.cache_stats()["flushes"] == 2
+    assert a.row_count() == 200
+    assert 999 in [r["id"] for r in db.get_table("a").scan()]
+    assert db.get_table("d").row_count() == 1
+
+    #зміни вже на диску: нова база бачить їх без save_all таблиць
+    db.save_all()
+    fresh = Database("cache_db", base_dir=str(tmp_path))
+    fresh.load_all()
+    ids = [r["id"] for r in fresh.get_table("a").scan()]
+    assert 999 in ids and 0 not in ids
+
+
+def test_unbounded_cache_only_counts(tmp_path: Path) -> None:
+    db = _make_db(tmp_path)
+    db.get_table("a")
+    db.get_table("a")
+    assert _resident(db) == {"a", "b", "c"}
+    stats = db.cache_stats()
+    assert (stats["hits"], stats["evictions"]) == (2, 0)
+
+
+def test_dropped_table_is_forgotten(tmp_path: Path) -> None:
+    db = _make_db(tmp_path, cache_tables=1)
+    _use(db, "a")
+    db.drop_table("a")
+    _use(db, "b")
+    assert db.cache_stats()["evictions"] == 0
+
+
+def test_get_table_does_not_read_rows(tmp_path: Path) -> None:
+    db = _make_db(tmp_path, cache_tables=2)
+    a = db.get_table("a")
+    assert not a.loaded and a.row_count() == 200
+    assert db.cache_stats()["misses"] == 1
+    assert db.memory_usage()["total"] == 0
+
+    #ліміт перевіряється, коли рядки справді дочитуються
+    _use(db, "b")
+    a.rows
+    _use(db, "c")
+    assert _resident(db) == {"a", "c"}
+
+
+def test_evicted_new_table_is_registered(tmp_path: Path) -> None:
+    db = Database("fresh", base_dir=str(tmp_path), cache_tables=1)
+    db.create_table("old", _schema()).insert({"id": 1, "z": (1, 1), "name": "x"})
+    db.create_table("new", _schema())
+    db.get_table("new") #витісняє old - вона записується на диск
+
+    #без save_all: таблиця вже в db_meta.json
+    reopened = Database("fresh", base_dir=str(tmp_path))
+    reopened.load_all()
+    assert reopened.list_tables() == ["old"]
+    assert reopened.get_table("old").get_rows()[0]["name"] == "x"
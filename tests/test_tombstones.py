@@ -0,0 +1,95 @@
+# tests/test_tombstones.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from core.schema import Field, Schema
+from core.table import Table
+from core.database import Database
+from core.tombstones import Tombstones
+from core.ops_cartesian import cartesian_product
+from core.ops_join import hash_join
+from core.query import Query
+
+
+def test_bitmap_marks_and_iterates() -> None:
+    dead = Tombstones.from_positions([17, 3, 0, 3])
+    assert len(dead) == 3
+    assert list(dead) == [0, 3, 17]
+    assert 17 in dead and 16 not in dead and 10_000 not in dead
+    assert not dead.mark(0)
+    dead.clear()
+    assert len(dead) == 0 and list(dead) == []
+
+
+@pytest.mark.parametrize("engine", ["rows", "columnar"])
+def test_operators_skip_deleted_rows(engine: str) -> None:
+    a = Table("A", Schema([Field("id", "integer"), Field("z", "complexReal")]), engine=engine)
+    b = Table("B", Schema([Field("a_id", "integer")]))
+    #видалені рядки мають лишитись у сховищі, без автоматичної компактизації
+    a.compact_threshold = 1.0
+    a.insert_many([{"id": i, "z": (i, 0)} for i in range(6)])
+    b.insert_many([{"a_id": i} for i in (0, 1, 4, 5)])
+    a.delete_where(lambda r: r["id"] % 2 == 1)
+    b.delete(3)
+
+    assert [r["id"] for r in a.get_rows()] == [0, 2, 4]
+    assert list(a.column("id")) == [0, 2, 4]
+    assert a.complex_column("z", use_numpy=False).sum() == (6.0, 0.0)
+    assert (a.min_value("id"), a.max_value("id")) == (0, 4)
+    assert [r["id"] for r in Query(a).where("id", ">", 0).rows()] == [2, 4]
+    assert [r["id"] for r in a.range("id", 1, 5)] == [2, 4]
+
+    product = cartesian_product(a, b)
+    assert product.row_count() == 9
+    lazy = cartesian_product(a, b, lazy=True)
+    assert [r.values() for r in lazy.rows] == [r.values() for r in product.rows]
+    assert lazy.rows[4].values() == product.rows[4].values()
+
+    join = hash_join(a, b, "id", "a_id")
+    assert sorted(r["A_id"] for r in join) == [0, 4]
+    assert join.row_count() == 2
+
+    with pytest.raises(IndexError):
+        a.delete(1)
+    assert a.compact() == 3
+    assert [r["id"] for r in a.rows] == [0, 2, 4]
+
+
+def test_binary_storage_keeps_tombstones(tmp_path: Path) -> None:
+    db = Database("bin", base_dir=str(tmp_path), storage_format="binary")
+    t = db.create_table("T", Schema([Field("id", "integer")]))
+    t.insert_many([{"id": i} for i in range(10)])
+    t.delete(4)
+    db.save_all()
+
+    db2 = Database("bin", base_dir=str(tmp_path))
+    db2.load_all()
+    loaded = db2.get_table("T")
+    assert loaded.row_count() == 9
+    assert 4 not in [r["id"] for r in loaded.get_rows()]
+    assert loaded.is_deleted(4)
+
+
+def test_positions_and_visible_order() -> None:
+    t = Table("T", Schema([Field("id", "integer")]))
+    t.insert_many([{"id": i} for i in range(5)])
+    t.delete(0)
+
+    #scan()/get_rows() нумерують лише невидалені рядки, delete/update - позиції у сховищі
+    assert t.scan()[1]["id"] == 2 and t.get_rows()[1]["id"] == 2
+    assert t.position(1) == 2 and t.position(-1) == 4
+    assert t.row_at(2)["id"] == 2
+    with pytest.raises(IndexError):
+        t.row_at(0)
+    with pytest.raises(IndexError):
+        t.position(4)
+
+    t.delete(t.position(1))
+    assert [r["id"] for r in t.scan()] == [1, 3, 4]
+    #масив позицій перебудовується після змін
+    assert t.scan()[1]["id"] == 3
+    t.insert({"id": 5})
+    assert t.scan()[3]["id"] == 5 and t.position(3) == 5
@@ -34,3 +34,12 @@ def ask_yes_no(prompt: str) -> bool:
         if ans in ("n", "no"):
             return False
         print("введіть 'y' або 'n'")
+
+
+def format_bytes(size: float) -> str:
+    #розмір у байтах у зручних одиницях: 512 Б, 1.5 КіБ, 20.0 МіБ
+    for unit in ("Б", "КіБ", "МіБ"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "Б" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} ГіБ"